@@ -5,65 +5,294 @@
 
 # --- Implementation Starts Here ---
 
-from dataclasses import dataclass, field, asdict, fields
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
-from typing import Optional, Literal, List
-import uuid
+from typing import Optional, Callable, Iterable, Iterator, Union
+from contextlib import contextmanager, nullcontext
+from collections import Counter
+from collections.abc import Container, Sequence
+import bisect
+import copy
+import heapq
+import itertools
+import operator
 import json
-import os
 import logging
+import threading
+import time
+
+# The model, storage, serialization, column and search modules; their public
+# names are re-exported here, where the rest of the app imports them from
+from task_model import (
+    Task, TaskChange, TaskStorage, ExternalChanges, TASK_STATUSES, TASK_PRIORITIES, TASK_TYPES,
+    _TASK_FIELD_NAMES, _get_task_fields, _storage_query,
+)
+from task_columns import CompactTask, TaskColumns
+from task_search import TaskSearchIndex, _tokenize
+from task_serialization import write_tasks_json
+from json_storage import (
+    JsonFileStorage, DEFAULT_JOURNAL_COMPACT_BYTES,
+    save_tasks_to_json, load_tasks_from_json, iter_tasks_from_json,
+    lock_task_store, read_store_version, append_journal_record,
+    rotate_journal, compact_rotated_journal, compact_journal,
+)
+
+__all__ = [
+    # Defined here
+    "TaskManager", "TaskBatch", "TaskSnapshot", "ExternalMerge",
+    # Re-exported from the modules above
+    "Task", "TaskChange", "TaskStorage", "ExternalChanges", "TASK_STATUSES", "TASK_PRIORITIES", "TASK_TYPES",
+    "CompactTask", "TaskColumns", "TaskSearchIndex", "write_tasks_json",
+    "JsonFileStorage", "DEFAULT_JOURNAL_COMPACT_BYTES",
+    "save_tasks_to_json", "load_tasks_from_json", "iter_tasks_from_json",
+    "lock_task_store", "read_store_version", "append_journal_record",
+    "rotate_journal", "compact_rotated_journal", "compact_journal",
+]
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__) # Get a logger for this module
 
 @dataclass
-class Task:
-    """Represents a single task in the Task Manager."""
-    """Represents a single task, encapsulating its properties and metadata.
+class TaskBatch:
+    """Tracks the changes made inside a `TaskManager.batch()` block.
 
     Attributes:
-        id (str): Unique identifier for the task (UUID string). Used internally.
-        display_id (int): Sequential, human-readable identifier for display.
-        title (str): Short description or name of the task.
-        description (str): More detailed description of the task.
-        status (Literal): Current status (e.g., "To Do", "In Progress").
-        priority (Literal): Priority level (e.g., "Low", "Medium", "High").
-        task_type (Literal): Agile classification (e.g., "Epic", "Story", "Task").
-        parent_id (Optional[str]): UUID ID of the parent task, if any.
-        created_at (datetime): Timestamp when the task was created.
-        updated_at (datetime): Timestamp when the task was last updated.
+        touched_ids (set): UUID IDs of the tasks added, updated or deleted in the batch.
+    """
+    touched_ids: set[str] = field(default_factory=set)
+    # State captured when the batch started, used to roll back on an exception
+    _origin_index: dict[str, Task] = field(default_factory=dict, repr=False)
+    _origin_next_display_id: int = field(default=1, repr=False)
+    _originals: dict[str, Task] = field(default_factory=dict, repr=False)
+
+    @property
+    def count(self) -> int:
+        """The number of distinct tasks touched by the batch."""
+        return len(self.touched_ids)
+
+    def _remember_original(self, task: Task) -> None:
+        """Keeps a copy of a task's fields before its first change in the batch."""
+        if task.id not in self._originals:
+            self._originals[task.id] = copy.copy(task)
+
+class TaskSnapshot(Sequence):
+    """A list-stable, ordered view of the tasks at one point in time.
+
+    The tasks are held in tuples of CHUNK_SIZE tasks (the last one may be
+    shorter). TaskManager never changes a chunk a snapshot holds: adding a task
+    replaces the last chunk, deleting one rebuilds them all. Taking a snapshot
+    therefore copies one reference per chunk instead of every task, and
+    consecutive snapshots share their chunks. Iterating a snapshot needs no
+    lock and never sees tasks added or deleted later.
+
+    The snapshot is list-stable, not field-stable: the Task objects are shared
+    with the manager, and an update changes their fields in place, one by one.
+    A reader on another thread can therefore see a task between two of those
+    assignments (e.g. the new status with the old updated_at). Use
+    TaskManager.task_copy() where a consistent set of one task's fields matters.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    display_id: int = 0 # Will be assigned by TaskManager
-    title: str = ""
-    description: str = ""
-    status: Literal["To Do", "In Progress", "Done", "Blocked"] = "To Do"
-    priority: Literal["Low", "Medium", "High", "Critical"] = "Medium"
-    task_type: Literal["Epic", "Story", "Task", "Bug"] = "Task"
-    parent_id: Optional[str] = None # Still stores the UUID
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: Optional[datetime] = None # Allow None initially
-
-    def __post_init__(self):
-        """Ensure updated_at is set to created_at initially if not provided."""
-        if self.updated_at is None:
-            self.updated_at = self.created_at
-
-# --- Other Classes/Functions will follow (TaskManager, JSON handling, etc.) ---
+    __slots__ = ("_chunks", "_length")
+
+    # Tasks per chunk: adding a task copies at most this many references
+    CHUNK_SIZE = 256
+
+    def __init__(self, chunks: tuple[tuple[Task, ...], ...] = ()):
+        """Initializes the snapshot.
+
+        Args:
+            chunks: Tuples of tasks, each holding CHUNK_SIZE tasks except the last.
+        """
+        self._chunks = chunks
+        self._length = (len(chunks) - 1) * self.CHUNK_SIZE + len(chunks[-1]) if chunks else 0
+
+    @classmethod
+    def chunk(cls, tasks: Iterable[Task]) -> list[tuple[Task, ...]]:
+        """Splits tasks into the chunks a snapshot is built from."""
+        iterator = iter(tasks)
+        return list(iter(lambda: tuple(itertools.islice(iterator, cls.CHUNK_SIZE)), ()))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("TaskSnapshot index out of range")
+        return self._chunks[index // self.CHUNK_SIZE][index % self.CHUNK_SIZE]
+
+    def __iter__(self) -> Iterator[Task]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __reversed__(self) -> Iterator[Task]:
+        return itertools.chain.from_iterable(map(reversed, reversed(self._chunks)))
+
+    def __eq__(self, other) -> bool:
+        """Snapshots compare equal to any sequence (e.g. a list) of the same tasks."""
+        if isinstance(other, TaskSnapshot) and other._chunks == self._chunks:
+            return True
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(other) == self._length and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TaskSnapshot({len(self)} tasks)"
+
+@dataclass
+class ExternalMerge:
+    """What `TaskManager.reload_external_changes()` merged into the manager.
+
+    Attributes:
+        added_ids (set): UUID IDs of the tasks another process added.
+        updated_ids (set): UUID IDs of the tasks whose fields were replaced.
+        deleted_ids (set): UUID IDs of the tasks another process deleted.
+        moved_ids (set): UUID IDs of the updated tasks that moved in the hierarchy
+                         (new parent or creation time).
+    """
+    added_ids: set[str] = field(default_factory=set)
+    updated_ids: set[str] = field(default_factory=set)
+    deleted_ids: set[str] = field(default_factory=set)
+    moved_ids: set[str] = field(default_factory=set)
+
+    @property
+    def count(self) -> int:
+        """The number of tasks the merge changed."""
+        return len(self.added_ids) + len(self.updated_ids) + len(self.deleted_ids)
+
+    @property
+    def rows_changed(self) -> bool:
+        """Whether the hierarchy changed (not just fields of tasks already shown)."""
+        return bool(self.added_ids or self.deleted_ids or self.moved_ids)
+
+# --- Task Manager ---
+
+# Sort key of children lists in the hierarchy index
+_created_at = operator.attrgetter("created_at")
+# Sort key of the updated_at index used by query()
+_updated_at = operator.attrgetter("updated_at")
+# Parts of the (task, level) pairs listed by walk_tree()
+_walk_task = operator.itemgetter(0)
+_task_id = operator.attrgetter("id")
+# Sort keys of query(order_by=...) for fields ordered by workflow rather than alphabetically
+_QUERY_RANKS = {
+    "status": {value: rank for rank, value in enumerate(TASK_STATUSES)},
+    "priority": {value: rank for rank, value in enumerate(TASK_PRIORITIES)},
+    "task_type": {value: rank for rank, value in enumerate(TASK_TYPES)},
+}
 
 class TaskManager:
-    """Manages the collection of tasks, including loading and saving."""
+    """Manages the collection of tasks, including loading and saving.
+
+    Safe to share between threads: mutations are serialized behind an internal
+    lock, and readers iterate `tasks` snapshots without holding it. Snapshots
+    fix which tasks are listed, not their fields (see TaskSnapshot and task_copy()).
+    """
+
+    # query() scans the TaskColumns instead of intersecting indexes once the most
+    # selective index still holds more than 1/COLUMNAR_QUERY_FRACTION of the tasks
+    COLUMNAR_QUERY_FRACTION = 16
+    # parent_candidates() reads the task type index this many tasks at a time
+    CANDIDATE_PAGE_SIZE = 64
     
-    def __init__(self, file_path: str = "tasks.json"):
+    def __init__(self, file_path: str = "tasks.json", journal: bool = False,
+                 journal_compact_bytes: int = DEFAULT_JOURNAL_COMPACT_BYTES,
+                 save_delay: Optional[float] = None,
+                 storage: Optional[TaskStorage] = None,
+                 lazy_load: bool = False,
+                 slotted_tasks: bool = False,
+                 columnar: bool = False,
+                 search_index: bool = False):
         """Initializes the TaskManager, loading tasks and setting up display ID counter.
         
         Args:
             file_path (str): The path to the JSON file storing tasks. 
                              Defaults to 'tasks.json'.
+            journal (bool): If True, each mutation appends a single record to the
+                            sidecar journal instead of rewriting the whole file.
+            journal_compact_bytes (int): Journal size that triggers a background
+                                         compaction into the snapshot (journal mode only).
+            save_delay (Optional[float]): If set, mutations only mark the manager dirty and
+                                          a background writer thread saves a snapshot once no
+                                          change happened for this many seconds. Call flush()
+                                          or close() to write pending changes immediately.
+            storage (Optional[TaskStorage]): The persistence backend. Defaults to a
+                                             JsonFileStorage for file_path/journal settings.
+            lazy_load (bool): If True, start empty and stream the stored tasks in through
+                              load_incrementally(). Any mutation finishes loading first.
+            slotted_tasks (bool): If True, keep tasks in memory as CompactTask objects
+                                  (much smaller for large archives).
+            columnar (bool): If True, maintain a TaskColumns store so count_by() and
+                             filter_tasks() run as bulk array operations.
+            search_index (bool): If True, maintain a TaskSearchIndex so search() answers
+                                 from an inverted index instead of scanning every task.
         """
-        self._file_path = file_path
-        self._tasks: list[Task] = load_tasks_from_json(self._file_path)
+        if storage is None:
+            storage = JsonFileStorage(file_path, journal=journal,
+                                      journal_compact_bytes=journal_compact_bytes)
+        self._storage = storage
+        # Mutations hold _lock; writes to disk are serialized by _write_lock
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # Deferred (debounced) persistence state, guarded by _lock
+        self._save_delay = save_delay
+        self._dirty_ids: set[str] = set()
+        self._last_change = 0.0
+        self._flushing = False
+        self._closing = False
+        self._changes_pending = threading.Condition(self._lock)
+        self._writer_thread: Optional[threading.Thread] = None
+        self._batch: Optional[TaskBatch] = None # Set while inside batch()
+        # Optimistic concurrency, guarded by _lock: copies of tasks as they were before
+        # their unsaved local changes, and versions other processes stored meanwhile
+        # (None = deleted) that those changes must be rebased on when they are saved
+        self._base_copies: dict[str, Task] = {}
+        self._concurrent: dict[str, Optional[Task]] = {}
+        self._unreported_merge = ExternalMerge() # Merged while saving, not yet returned
+        # Hash indexes for O(1) lookups; the ordered list view is derived from them
+        self._tasks_by_id: dict[str, Task] = {}
+        self._tasks_by_display_id: dict[int, Task] = {}
+        # Chunks of the tasks in insertion order (see TaskSnapshot), rebuilt lazily
+        # after deletions, and the snapshot last handed out (None once stale)
+        self._task_chunks: Optional[list[tuple[Task, ...]]] = None
+        self._snapshot: Optional[TaskSnapshot] = None
+        self._slotted_tasks = slotted_tasks
+        self._columns: Optional[TaskColumns] = TaskColumns() if columnar else None
+        self._search_index: Optional[TaskSearchIndex] = TaskSearchIndex() if search_index else None
+        # Hierarchy index: children per parent ID (None = roots, including tasks whose
+        # parent is missing) kept sorted by created_at, and the parent each task is linked under
+        self._children: dict[Optional[str], list[Task]] = {}
+        self._linked_parent: dict[str, Optional[str]] = {}
+        self._orphans: dict[str, set[str]] = {} # Missing parent ID -> IDs of its children
+        # Tasks shown as roots because their parent chain loops back to them (corrupt data)
+        self._cycle_roots: set[str] = set()
+        # Ancestor/depth index: ID -> (pre-order number, last pre-order number in its
+        # subtree, depth), built lazily. Tasks linked or moved since it was built are
+        # missing from it and climb to their nearest indexed ancestor instead.
+        self._positions: Optional[dict[str, tuple[int, int, int]]] = None
+        # Cached pre-order walks: (task, level) pairs per root tree, and all of them
+        # concatenated. A structural change only drops the tree it happens in.
+        self._root_walks: dict[str, list[tuple[Task, int]]] = {}
+        self._full_walk: Optional[list[tuple[Task, int]]] = None
+        # Secondary indexes for query(): tasks per value of status/priority/task_type
+        # (insertion-ordered dicts keyed by ID), and every task sorted by updated_at
+        self._value_index: dict[str, dict[str, dict[str, Task]]] = {name: {} for name in TaskColumns.CODED_FIELDS}
+        self._by_updated: list[Task] = []
+        self._by_updated_sorted = True # False after streamed loads append out of order
+        self._pending_load: Optional[Iterator[Task]] = None # Stream being loaded lazily
+        if lazy_load:
+            self._tasks = []
+            self._next_display_id = 1
+            self._pending_load = map(self._adopt, self._storage.iter_load())
+            return
+        loaded_tasks = self._storage.load()
+        if slotted_tasks:
+            loaded_tasks = [self._adopt(task) for task in loaded_tasks]
+        self._tasks = loaded_tasks # Builds the indexes
         # Initialize the next display ID based on existing tasks
         if self._tasks:
             self._next_display_id = max(task.display_id for task in self._tasks if hasattr(task, 'display_id')) + 1
@@ -72,9 +301,684 @@ class TaskManager:
         # print(f"TaskManager initialized. Loaded {len(self._tasks)} tasks. Next display ID: {self._next_display_id}") # Optional debug
 
     @property
-    def tasks(self) -> list[Task]:
-        """Provides read-only access to the list of tasks."""
-        return self._tasks
+    def tasks(self) -> TaskSnapshot:
+        """A snapshot of the tasks in insertion order.
+
+        Cheap to take (it shares its storage with earlier snapshots) and safe to
+        iterate on any thread while other threads add or delete tasks. The list
+        never changes, but the tasks in it are the live objects, whose fields
+        concurrent updates change in place (see TaskSnapshot).
+
+        The published snapshot is returned without taking the lock, so readers
+        never wait for a mutation or a save in progress; the lock is only taken
+        to rebuild a snapshot a mutation made stale.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            return self._tasks
+
+    def _adopt(self, task: Task) -> Task:
+        """Converts a task to the in-memory representation chosen for this manager."""
+        return CompactTask.from_task(task) if self._slotted_tasks else task
+
+    @property
+    def is_loading(self) -> bool:
+        """True while tasks are still being streamed in (lazy_load mode)."""
+        return self._pending_load is not None
+
+    def load_incrementally(self, batch_size: int = 1000) -> Iterator[list[Task]]:
+        """Streams the remaining stored tasks into the manager in batches.
+
+        Args:
+            batch_size: Maximum number of tasks per yielded batch.
+
+        Yields:
+            Each batch of newly loaded tasks, already added to the manager.
+        """
+        while self._pending_load is not None:
+            with self._lock:
+                batch = self._load_next(batch_size)
+            if batch:
+                yield batch
+
+    def _load_next(self, limit: Optional[int]) -> list[Task]:
+        """Adds up to `limit` (None = all) streamed tasks to the indexes (caller holds _lock)."""
+        if self._pending_load is None:
+            return []
+        try:
+            batch = list(itertools.islice(self._pending_load, limit))
+        except (json.JSONDecodeError, FileNotFoundError, TypeError) as e:
+            logger.error(f"Error streaming tasks from storage: {e}")
+            batch, limit = [], None # Keep what was loaded and stop
+        if limit is None or len(batch) < limit:
+            self._pending_load = None # Stream exhausted
+        for task in batch:
+            self._tasks_by_id[task.id] = task
+            self._tasks_by_display_id[task.display_id] = task
+            if self._columns is not None:
+                self._columns.append(task)
+            if self._search_index is not None:
+                self._search_index.add(task)
+            self._next_display_id = max(self._next_display_id, task.display_id + 1)
+            self._link(task)
+            self._index_task(task, bulk=True)
+        self._extend_task_chunks(batch)
+        return batch
+
+    @property
+    def storage(self) -> TaskStorage:
+        """The persistence backend the tasks are loaded from and saved to."""
+        return self._storage
+
+    @property
+    def _tasks(self) -> TaskSnapshot:
+        """Snapshot of the tasks in insertion order (caller holds _lock)."""
+        if self._snapshot is None:
+            if self._task_chunks is None: # Rebuilt from the ID index after deletions
+                self._task_chunks = TaskSnapshot.chunk(self._tasks_by_id.values())
+            self._snapshot = TaskSnapshot(tuple(self._task_chunks))
+        return self._snapshot
+
+    @_tasks.setter
+    def _tasks(self, tasks: list[Task]) -> None:
+        """Replaces all tasks and rebuilds the lookup indexes."""
+        self._tasks_by_id = {task.id: task for task in tasks}
+        self._tasks_by_display_id = {task.display_id: task for task in tasks}
+        self._task_chunks = self._snapshot = None # Duplicate IDs collapse as in the ID index
+        if self._columns is not None:
+            self._columns.rebuild(self._tasks_by_id.values())
+        if self._search_index is not None:
+            self._search_index.rebuild(self._tasks_by_id.values())
+        self._rebuild_hierarchy()
+        self._rebuild_secondary_indexes()
+
+    def _extend_task_chunks(self, tasks: list[Task]) -> None:
+        """Appends new tasks to the ordered view without touching the chunks that
+        snapshots already hold (caller holds _lock)."""
+        if self._task_chunks is None or not tasks:
+            return
+        self._snapshot = None
+        chunks = self._task_chunks
+        if chunks and len(chunks[-1]) < TaskSnapshot.CHUNK_SIZE:
+            # Replace (never extend in place) the partly filled last chunk
+            tasks = list(chunks.pop()) + tasks
+        chunks += TaskSnapshot.chunk(tasks)
+
+    # --- Hierarchy index ---
+    def _rebuild_hierarchy(self) -> None:
+        """Rebuilds the parent/child index from scratch (after replacing all tasks)."""
+        tasks_by_id = self._tasks_by_id
+        self._children = {}
+        self._linked_parent = {}
+        self._orphans = {}
+        self._cycle_roots = set()
+        self._positions = None
+        self._root_walks = {}
+        self._full_walk = None
+        for task in tasks_by_id.values():
+            parent_id = task.parent_id
+            self._linked_parent[task.id] = parent_id
+            if parent_id is not None and parent_id not in tasks_by_id:
+                self._orphans.setdefault(parent_id, set()).add(task.id)
+                parent_id = None
+            self._children.setdefault(parent_id, []).append(task)
+        for children in self._children.values():
+            children.sort(key=_created_at) # Stable: ties keep insertion order
+        # Tasks unreachable from the roots sit on (or under) a parent cycle: cut each
+        # cycle at the first of its tasks seen, which is then shown as a root
+        reachable = {task.id for task, _ in self.walk_tree()}
+        for task in tasks_by_id.values():
+            if task.id in reachable:
+                continue
+            chain: list[str] = []
+            task_id = task.id
+            while task_id not in reachable and task_id not in chain:
+                chain.append(task_id)
+                task_id = tasks_by_id[task_id].parent_id
+            if task_id in chain: # Not blocked by a task reachable from the roots
+                cycle_root = tasks_by_id[task_id]
+                self._remove_child(cycle_root.parent_id, cycle_root)
+                bisect.insort(self._children.setdefault(None, []), cycle_root, key=_created_at)
+                self._cycle_roots.add(cycle_root.id)
+                reachable.update(subtask.id for subtask, _ in self.walk_tree(cycle_root.id))
+        self._root_walks = {} # Walked before the cycles were cut
+        self._full_walk = None
+
+    def _link(self, task: Task) -> None:
+        """Adds a task (already in the ID index) under its parent, adopting waiting orphans."""
+        parent_id = task.parent_id
+        self._linked_parent[task.id] = parent_id
+        if parent_id is not None and parent_id not in self._tasks_by_id:
+            self._orphans.setdefault(parent_id, set()).add(task.id)
+            parent_id = None # Shown as a root until its parent appears
+        bisect.insort(self._children.setdefault(parent_id, []), task, key=_created_at)
+        # Children that were loaded before this task move from the roots under it
+        for child_id in self._orphans.pop(task.id, ()):
+            if self._climbs_to(task.id, child_id):
+                self._cycle_roots.add(child_id) # Its parent descends from it: keep it a root
+                continue
+            child = self._tasks_by_id[child_id]
+            self._remove_child(None, child)
+            bisect.insort(self._children.setdefault(task.id, []), child, key=_created_at)
+            self._root_walks.pop(child_id, None) # No longer a root
+            self._forget_positions(child_id)
+        self._invalidate_walk(task.id)
+
+    def _unlink(self, task: Task) -> None:
+        """Removes a task from under the parent it was linked to."""
+        self._invalidate_walk(task.id)
+        parent_id = self._linked_parent.pop(task.id)
+        waiting = self._orphans.get(parent_id) if parent_id is not None else None
+        if task.id in self._cycle_roots:
+            self._cycle_roots.discard(task.id)
+            parent_id = None
+        elif waiting is not None and task.id in waiting:
+            waiting.discard(task.id)
+            if not waiting:
+                del self._orphans[parent_id]
+            parent_id = None
+        self._remove_child(parent_id, task)
+
+    def _tree_parent(self, task_id: str) -> Optional[str]:
+        """Returns the ID of the task a task is shown under (None for roots)."""
+        if task_id in self._cycle_roots:
+            return None
+        parent_id = self._linked_parent.get(task_id)
+        return parent_id if parent_id in self._tasks_by_id else None
+
+    def _climbs_to(self, task_id: Optional[str], ancestor_id: str) -> bool:
+        """Whether ancestor_id is task_id or above it, by climbing the shown hierarchy."""
+        seen: set[str] = set()
+        while task_id is not None and task_id not in seen:
+            if task_id == ancestor_id:
+                return True
+            seen.add(task_id)
+            task_id = self._tree_parent(task_id)
+        return False
+
+    def _relink_cycle_roots(self) -> None:
+        """Moves tasks shown as roots to break a parent cycle back under their
+        parent once a move or deletion has broken that cycle."""
+        for task_id in list(self._cycle_roots):
+            task = self._tasks_by_id[task_id]
+            if task.parent_id in self._tasks_by_id and self._climbs_to(task.parent_id, task_id):
+                continue # Still a cycle
+            self._cycle_roots.discard(task_id)
+            self._remove_child(None, task)
+            self._root_walks.pop(task_id, None) # No longer a root
+            self._link(task) # Under its parent, or a waiting orphan if it was deleted
+            self._forget_positions(task_id)
+
+    def _invalidate_walk(self, task_id: str) -> None:
+        """Drops the cached walk of the root tree a task is shown in (after a
+        structural change inside it); the other trees stay cached."""
+        self._full_walk = None
+        if self._root_walks:
+            while True:
+                parent_id = self._tree_parent(task_id)
+                if parent_id is None:
+                    break
+                task_id = parent_id
+            self._root_walks.pop(task_id, None)
+
+    def _tree_positions(self) -> dict[str, tuple[int, int, int]]:
+        """Returns the ancestor/depth index, numbering the hierarchy in one walk if needed."""
+        if self._positions is None:
+            ordered = self.walk_tree()
+            positions: dict[str, tuple[int, int, int]] = {}
+            open_rows: list[int] = [] # Rows whose subtree has not ended yet
+            for row, (task, depth) in enumerate(ordered):
+                while open_rows and ordered[open_rows[-1]][1] >= depth:
+                    ended = open_rows.pop()
+                    positions[ordered[ended][0].id] = (ended, row - 1, ordered[ended][1])
+                open_rows.append(row)
+            for row in open_rows:
+                positions[ordered[row][0].id] = (row, len(ordered) - 1, ordered[row][1])
+            self._positions = positions
+        return self._positions
+
+    def _forget_positions(self, task_id: str) -> None:
+        """Drops a moved subtree from the ancestor/depth index (its tasks then climb
+        to their nearest indexed ancestor), instead of renumbering every task."""
+        if self._positions is not None:
+            for task, _ in self.walk_tree(task_id):
+                self._positions.pop(task.id, None)
+
+    def _remove_child(self, parent_id: Optional[str], task: Task) -> None:
+        """Deletes a task from one sorted children list (binary search, then identity match)."""
+        children = self._children[parent_id]
+        index = bisect.bisect_left(children, task.created_at, key=_created_at)
+        while children[index] is not task:
+            index += 1
+        del children[index]
+        if not children:
+            del self._children[parent_id]
+
+    # --- Secondary indexes ---
+    def _rebuild_secondary_indexes(self) -> None:
+        """Rebuilds the query() indexes from scratch (after replacing all tasks)."""
+        self._value_index = {name: {} for name in TaskColumns.CODED_FIELDS}
+        for task in self._tasks_by_id.values():
+            for name, index in self._value_index.items():
+                index.setdefault(getattr(task, name), {})[task.id] = task
+        self._by_updated = sorted(self._tasks_by_id.values(), key=_updated_at)
+        self._by_updated_sorted = True
+
+    def _index_task(self, task: Task, bulk: bool = False) -> None:
+        """Adds a task to the query() indexes.
+
+        Args:
+            task: The task to add.
+            bulk: Append to the updated_at index and sort it on next use (while loading).
+        """
+        for name, index in self._value_index.items():
+            index.setdefault(getattr(task, name), {})[task.id] = task
+        if bulk:
+            self._by_updated.append(task)
+            self._by_updated_sorted = False
+        else:
+            bisect.insort(self._updated_index(), task, key=_updated_at)
+
+    def _updated_index(self) -> list[Task]:
+        """Returns the tasks sorted by updated_at, sorting them first after bulk appends."""
+        if not self._by_updated_sorted:
+            self._by_updated.sort(key=_updated_at)
+            self._by_updated_sorted = True
+        return self._by_updated
+
+    def _unindex_task(self, task: Task, values: Optional[tuple] = None,
+                      updated_at: Optional[datetime] = None) -> None:
+        """Removes a task from the query() indexes.
+
+        Args:
+            task: The task to remove.
+            values: Its indexed field values, if they changed since it was indexed.
+            updated_at: Its updated_at, if it changed since it was indexed.
+        """
+        if values is None:
+            values = tuple(getattr(task, name) for name in self._value_index)
+        for (name, index), value in zip(self._value_index.items(), values):
+            tasks = index[value]
+            del tasks[task.id]
+            if not tasks:
+                del index[value]
+        if updated_at is None:
+            updated_at = task.updated_at
+        by_updated = self._updated_index()
+        position = bisect.bisect_left(by_updated, updated_at, key=_updated_at)
+        while by_updated[position] is not task:
+            position += 1
+        del by_updated[position]
+
+    def query(self, status: Union[str, Iterable[str], None] = None,
+              priority: Union[str, Iterable[str], None] = None,
+              task_type: Union[str, Iterable[str], None] = None,
+              parent: Optional[str] = None, updated_since: Optional[datetime] = None,
+              order_by: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        """Finds the tasks matching all given criteria.
+
+        Each criterion can be answered by an index (tasks per status, priority
+        and type value, children per parent, tasks sorted by updated_at). The
+        smallest candidate set drives the query and the other criteria are
+        checked on its tasks only, as they are consumed.
+
+        Args:
+            status: A status, or several (any of them matches).
+            priority: A priority, or several (e.g. ("High", "Critical")).
+            task_type: A task type, or several.
+            parent: Only direct children of the task with this UUID ID.
+            updated_since: Only tasks updated at or after this time.
+            order_by: A Task field to sort by, prefixed with "-" for descending
+                      order. status, priority and task_type sort in workflow
+                      order (e.g. "-priority" lists Critical first). Without it,
+                      tasks come in the order of the index used.
+            limit: Maximum number of tasks to return (None = all).
+
+        While tasks are still being streamed in (lazy_load), a storage with its
+        own query() answers instead, so the result covers the tasks not loaded yet.
+
+        Returns:
+            A lazy iterator over the matching Task objects.
+
+        Raises:
+            ValueError: If order_by is not a Task field.
+        """
+        storage_query = _storage_query(self._storage)
+        with self._lock:
+            loading = self._pending_load is not None
+        if storage_query is not None and loading:
+            # Nothing was changed yet (mutations finish loading), so the storage is current
+            stored = storage_query(status=status, priority=priority, task_type=task_type, parent=parent,
+                                   updated_since=updated_since, order_by=order_by, limit=limit)
+            # Tasks loaded already are returned as the managed objects
+            return (self._tasks_by_id.get(task.id) or self._adopt(task) for task in stored)
+        sort_field = sort_key = None
+        descending = False
+        if order_by is not None:
+            descending = order_by.startswith("-")
+            sort_field = order_by.lstrip("-")
+            if sort_field not in _TASK_FIELD_NAMES:
+                raise ValueError(f"Cannot order tasks by {order_by!r}")
+            sort_key = operator.attrgetter(sort_field)
+            ranks = _QUERY_RANKS.get(sort_field)
+            if ranks is not None: # Unknown values sort last
+                sort_key = lambda task, get=sort_key, ranks=ranks: ranks.get(get(task), len(ranks))
+
+        with self._lock:
+            # Per criterion: the index entries it selects, the number of tasks in them, and
+            # a per-task check used when another index drives the query
+            value_buckets: list[list[dict[str, Task]]] = []
+            sources: list[str] = [] # "value", "parent" or "updated", in criteria order
+            sizes: list[int] = []
+            checks: list[Callable[[Task], bool]] = []
+            for name, wanted in (("status", status), ("priority", priority), ("task_type", task_type)):
+                if wanted is None:
+                    continue
+                values = frozenset((wanted,) if isinstance(wanted, str) else wanted)
+                buckets = [self._value_index[name].get(value, {}) for value in values]
+                value_buckets.append(buckets)
+                sources.append("value")
+                sizes.append(sum(map(len, buckets)))
+                checks.append(lambda task, get=operator.attrgetter(name), values=values: get(task) in values)
+            parent_tasks: Optional[list[Task]] = None
+            if parent is not None:
+                if parent in self._tasks_by_id:
+                    parent_tasks = self._children.get(parent, []).copy()
+                else: # Children of a missing parent are listed among the roots
+                    parent_tasks = [self._tasks_by_id[task_id] for task_id in self._orphans.get(parent, ())]
+                sources.append("parent")
+                sizes.append(len(parent_tasks))
+                checks.append(lambda task: task.parent_id == parent)
+            if updated_since is not None or sort_field == "updated_at":
+                by_updated = self._updated_index()
+                start = 0
+                if updated_since is not None:
+                    start = bisect.bisect_left(by_updated, updated_since, key=_updated_at)
+                    sources.append("updated")
+                    sizes.append(len(by_updated) - start)
+                    checks.append(lambda task: task.updated_at >= updated_since)
+            driver = min(range(len(sizes)), key=sizes.__getitem__) if sizes else None # Most selective
+
+            if sort_field == "updated_at" and (driver is None or sources[driver] == "updated"):
+                # The updated_at index is already in order: stream it, stopping after `limit` matches
+                matches: Iterable[Task] = by_updated[start:]
+                if descending:
+                    matches = reversed(matches)
+                sort_key = None
+                if updated_since is not None:
+                    del checks[-1]
+            elif driver is None:
+                matches = self._tasks # The list cannot change, so filtered after releasing the lock
+            elif (self._columns is not None and sizes[driver] * self.COLUMNAR_QUERY_FRACTION > len(self._tasks_by_id)
+                  and (parent is None or parent in self._tasks_by_id)):
+                # No index narrows it down much: one pass over the columns beats intersecting them
+                tasks_by_id = self._tasks_by_id
+                matches = list(map(tasks_by_id.__getitem__, self._columns.match_ids(
+                    status=status, priority=priority, task_type=task_type,
+                    parent_id=parent, updated_since=updated_since)))
+                checks = []
+            elif sources[driver] == "value":
+                # Intersect index entries by ID, with the membership tests running in C
+                matching_ids = list(itertools.chain.from_iterable(value_buckets[driver]))
+                for index, buckets in enumerate(value_buckets):
+                    if index == driver:
+                        continue
+                    if len(buckets) == 1:
+                        matching_ids = list(filter(buckets[0].__contains__, matching_ids))
+                    else:
+                        members = set()
+                        for bucket in buckets:
+                            members.update(filter(bucket.__contains__, matching_ids))
+                        matching_ids = list(filter(members.__contains__, matching_ids))
+                tasks_by_id = self._tasks_by_id
+                matches = [tasks_by_id[task_id] for task_id in matching_ids]
+                checks = checks[len(value_buckets):]
+            else:
+                matches = parent_tasks if sources[driver] == "parent" else by_updated[start:]
+                del checks[driver]
+
+        for check in checks:
+            matches = filter(check, matches)
+        if sort_key is not None:
+            if limit is None:
+                return iter(sorted(matches, key=sort_key, reverse=descending))
+            select = heapq.nlargest if descending else heapq.nsmallest
+            return iter(select(limit, matches, key=sort_key))
+        return itertools.islice(matches, limit)
+
+    def parent_candidates(self, text: str = "", exclude_subtree_of: Optional[str] = None) -> Iterator[Task]:
+        """Lazily yields the tasks that could be picked as a parent, Epics first,
+        then Stories, Tasks and Bugs.
+
+        Tasks are read from the task type index one type at a time and matched
+        as they are yielded, so taking the first page of candidates only costs
+        the tasks scanned to fill it, however large the store is. With the
+        search index, the tasks without a word matching each term are dropped
+        up front, so text matching few tasks does not scan the whole store.
+
+        Args:
+            text: Terms that must each start a word (case-insensitively) of the
+                  task's display ID or title; empty matches every task.
+            exclude_subtree_of: Optional UUID ID of a task being re-parented; it and
+                                its descendants are skipped, as they would form a cycle.
+
+        Yields:
+            The matching Task objects.
+        """
+        terms = _tokenize(text)
+        allowed: Optional[set[str]] = None # IDs that can match, if narrowed by the search index
+        if self._search_index is not None:
+            with self._lock:
+                for term in terms:
+                    if not term.isdigit(): # Display IDs are not indexed
+                        task_ids = self._search_index.prefix_ids(term)
+                        allowed = task_ids if allowed is None else allowed & task_ids
+            if allowed is not None and not allowed:
+                return
+        for task_type in TASK_TYPES:
+            with self._lock:
+                bucket = self._value_index["task_type"].get(task_type, {})
+            for task in self._iter_bucket(bucket, allowed):
+                if terms:
+                    label = f"{task.display_id} {task.title}".lower()
+                    if not all(term in label for term in terms): # Cheap rejection first
+                        continue
+                    words = _tokenize(label)
+                    if not all(any(word.startswith(term) for word in words) for term in terms):
+                        continue
+                if exclude_subtree_of is not None and self.in_subtree_of(task.id, exclude_subtree_of):
+                    continue
+                yield task
+
+    def _iter_bucket(self, bucket: dict[str, Task], allowed: Optional[set[str]] = None) -> Iterator[Task]:
+        """Lazily yields the tasks of an index bucket, CANDIDATE_PAGE_SIZE at a time.
+
+        Each page is read under the lock, and nothing is copied up front. If the
+        bucket changed between pages, reading resumes after the tasks already
+        yielded.
+
+        Args:
+            bucket: An ID -> Task dict of a secondary index.
+            allowed: If given, only the tasks with these UUID IDs are yielded.
+        """
+        listed: set[str] = set()
+        items: Iterator[tuple[str, Task]] = iter(())
+        restart = True
+        while True:
+            with self._lock:
+                if restart:
+                    items = itertools.filterfalse(lambda item: item[0] in listed, iter(bucket.items()))
+                    if allowed is not None:
+                        items = filter(lambda item: item[0] in allowed, items)
+                    restart = False
+                try:
+                    page = list(itertools.islice(items, self.CANDIDATE_PAGE_SIZE))
+                except RuntimeError: # The bucket changed size since the last page
+                    restart = True
+                    continue
+            if not page:
+                return
+            for task_id, task in page:
+                listed.add(task_id)
+                yield task
+
+    def children_of(self, task_id: Optional[str] = None) -> list[Task]:
+        """Returns the direct children of a task, sorted by creation time.
+
+        Args:
+            task_id: The parent's UUID ID, or None for the root tasks (tasks
+                     without a parent or whose parent no longer exists).
+
+        Returns:
+            A new list of the child Task objects.
+        """
+        with self._lock:
+            return list(self._children.get(task_id, ()))
+
+    def ancestors_of(self, task_id: str) -> list[Task]:
+        """Returns the ancestors of a task, from its parent up to its root.
+
+        Args:
+            task_id: The UUID ID of the task.
+
+        Returns:
+            The ancestor Task objects (empty for roots and unknown IDs).
+        """
+        ancestors: list[Task] = []
+        with self._lock:
+            parent_id = self._tree_parent(task_id) if task_id in self._tasks_by_id else None
+            while parent_id is not None:
+                ancestors.append(self._tasks_by_id[parent_id])
+                parent_id = self._tree_parent(parent_id)
+        return ancestors
+
+    def depth_of(self, task_id: str) -> int:
+        """Returns the number of ancestors of a task (0 for roots and unknown IDs).
+
+        Read from the ancestor/depth index, so it does not climb the tree
+        (except through tasks linked or moved since the index was built).
+        """
+        with self._lock:
+            if task_id not in self._tasks_by_id:
+                return 0
+            positions = self._tree_positions()
+            climbed = 0
+            while task_id not in positions:
+                task_id = self._tree_parent(task_id)
+                if task_id is None:
+                    return climbed
+                climbed += 1
+            return climbed + positions[task_id][2]
+
+    def in_subtree_of(self, task_id: str, root_id: str) -> bool:
+        """Whether a task is root_id itself or one of its descendants.
+
+        Answered in constant time from the ancestor/depth index by comparing
+        pre-order numbers, however deep the tree is. Used to reject parent
+        assignments that would create a cycle.
+
+        Args:
+            task_id: The UUID ID of the task to test.
+            root_id: The UUID ID of the subtree's root.
+
+        Returns:
+            True if task_id is in the subtree of root_id.
+        """
+        with self._lock:
+            positions = self._tree_positions()
+            while task_id not in positions: # Linked or moved since the index was built
+                if task_id == root_id:
+                    return True
+                task_id = self._tree_parent(task_id)
+                if task_id is None:
+                    return False
+            root = positions.get(root_id)
+            return root is not None and root[0] <= positions[task_id][0] <= root[1]
+
+    def subtree_of(self, task_id: str) -> list[Task]:
+        """Returns a task followed by all its descendants, in display (pre-)order."""
+        return [task for task, _ in self.walk_tree(task_id)]
+
+    def with_ancestors(self, task_ids: Iterable[str]) -> set[str]:
+        """Returns the given task IDs plus the IDs of all their ancestors.
+
+        Used to show filter matches in context. Each ancestor chain is only
+        climbed until it reaches a task that is already in the result.
+
+        Args:
+            task_ids: UUID IDs of the tasks to include (unknown IDs are skipped).
+
+        Returns:
+            The set of included task IDs.
+        """
+        included: set[str] = set()
+        with self._lock:
+            tasks_by_id = self._tasks_by_id
+            for task_id in task_ids:
+                while task_id is not None and task_id not in included and task_id in tasks_by_id:
+                    included.add(task_id)
+                    task_id = tasks_by_id[task_id].parent_id
+        return included
+
+    def walk_tree(self, task_id: Optional[str] = None,
+                  only: Optional[set[str]] = None) -> list[tuple[Task, int]]:
+        """Lists the hierarchy in display order: each task before its children,
+        siblings by creation time.
+
+        The walk is iterative (no recursion limit on deep chains). The full
+        walk is cached per root tree: a structural change (add, move, delete)
+        drops only the cached walk of the tree it happens in, so refreshing
+        after an edit re-walks that tree alone.
+
+        Args:
+            task_id: The task whose subtree to walk, or None for every root tree.
+            only: If given, skip tasks whose IDs are not in this set, together with
+                  their subtrees (pass an ancestor-closed set, see with_ancestors).
+
+        Returns:
+            (task, level) pairs, where level is the depth below the start of the walk.
+        """
+        with self._lock:
+            if task_id is not None:
+                task = self._tasks_by_id.get(task_id)
+                return self._walk_from([task], only) if task is not None else []
+            if self._full_walk is None:
+                # Reuse the walk of every root tree no mutation touched since it was cached
+                root_walks = self._root_walks
+                full_walk: list[tuple[Task, int]] = []
+                for root in self._children.get(None, ()):
+                    walk = root_walks.get(root.id)
+                    if walk is None:
+                        walk = root_walks[root.id] = self._walk_from([root])
+                    full_walk += walk
+                self._full_walk = full_walk
+            if only is None:
+                return list(self._full_walk)
+            # An ancestor-closed set keeps exactly the pairs whose task is in it (no climbing needed)
+            walk = self._full_walk
+            return list(itertools.compress(walk, map(only.__contains__, map(_task_id, map(_walk_task, walk)))))
+
+    def _walk_from(self, starts: list[Task], only: Optional[set[str]] = None) -> list[tuple[Task, int]]:
+        """Walks the given tasks' subtrees iteratively in pre-order, starting at level 0."""
+        stack = [(task, 0) for task in reversed(starts)]
+        visited: set[str] = set() # Guards against parent cycles
+        ordered: list[tuple[Task, int]] = []
+        while stack:
+            task, level = stack.pop()
+            if task.id in visited:
+                continue
+            visited.add(task.id)
+            ordered.append((task, level))
+            children = self._children.get(task.id)
+            if children:
+                level += 1
+                if only is None:
+                    stack.extend([(child, level) for child in reversed(children)])
+                else:
+                    stack.extend([(child, level) for child in reversed(children) if child.id in only])
+        return ordered
     
     # --- Methods for add, get, update, delete will follow ---
     def add_task(self, task_details: dict) -> str:
@@ -88,25 +992,28 @@ class TaskManager:
         Returns:
             The unique UUID ID (str) of the newly created task.
         """
-        current_display_id = self._next_display_id
-        self._next_display_id += 1 # Increment for the next task
-
-        # Create a new Task object, ignoring potential id/timestamps/display_id from input dict
-        new_task = Task(
-            display_id=current_display_id, # Assign the sequential ID
-            title=task_details.get('title', ''),
-            description=task_details.get('description', ''),
-            status=task_details.get('status', 'To Do'),
-            priority=task_details.get('priority', 'Medium'),
-            task_type=task_details.get('task_type', 'Task'),
-            parent_id=task_details.get('parent_id') # Still uses UUID
-            # id (UUID), created_at, updated_at use defaults
-        )
+        with self._lock:
+            self._load_next(None) # Mutations need every task (and display ID) loaded
+            current_display_id = self._next_display_id
+            self._next_display_id += 1 # Increment for the next task
+
+            # Create a new Task object, ignoring potential id/timestamps/display_id from input dict
+            new_task = Task(
+                display_id=current_display_id, # Assign the sequential ID
+                title=task_details.get('title', ''),
+                description=task_details.get('description', ''),
+                status=task_details.get('status', 'To Do'),
+                priority=task_details.get('priority', 'Medium'),
+                task_type=task_details.get('task_type', 'Task'),
+                parent_id=task_details.get('parent_id') # Still uses UUID
+                # id (UUID), created_at, updated_at use defaults
+            )
+            new_task = self._adopt(new_task)
         
-        self._tasks.append(new_task)
-        save_tasks_to_json(self._tasks, self._file_path) # Save changes
-        # print(f"Added task {new_task.id} (Display ID: {new_task.display_id}). Total tasks: {len(self._tasks)}") # Optional debug
-        return new_task.id # Return the internal UUID
+            self._insert_task(new_task)
+            self._persist_change(new_task.id) # Save changes
+            # print(f"Added task {new_task.id} (Display ID: {new_task.display_id}). Total tasks: {len(self._tasks)}") # Optional debug
+            return new_task.id # Return the internal UUID
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """Retrieves a single task by its unique UUID ID.
@@ -117,16 +1024,108 @@ class TaskManager:
         Returns:
             The Task object if found, otherwise None.
         """
-        for task in self._tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks_by_id.get(task_id)
+
+    def task_copy(self, task_id: str) -> Optional[Task]:
+        """Returns a private copy of a task whose fields all come from one moment.
+
+        Unlike get_task(), which returns the live object, the copy is taken
+        under the manager's lock, so it never mixes fields from before and after
+        a concurrent update (and later updates do not change it).
+
+        Args:
+            task_id: The UUID ID of the task to copy.
+
+        Returns:
+            A copy of the Task, or None if there is no task with this ID.
+        """
+        with self._lock:
+            task = self._tasks_by_id.get(task_id)
+            return copy.copy(task) if task is not None else None
+
+    def get_by_display_id(self, display_id: int) -> Optional[Task]:
+        """Retrieves a single task by its sequential display ID.
+
+        Args:
+            display_id: The human-readable display ID of the task.
+
+        Returns:
+            The Task object if found, otherwise None.
+        """
+        return self._tasks_by_display_id.get(display_id)
+
+    def count_by(self, field_name: str) -> dict[str, int]:
+        """Counts the tasks per value of an enum-like field.
+
+        Args:
+            field_name: 'status', 'priority' or 'task_type'.
+
+        Returns:
+            A dict mapping each value present to its number of tasks.
+
+        Raises:
+            ValueError: If field_name is not one of the supported fields.
+        """
+        if field_name not in TaskColumns.CODED_FIELDS:
+            raise ValueError(f"Cannot count tasks by {field_name!r}")
+        with self._lock:
+            if self._columns is not None:
+                return self._columns.count_by(field_name)
+            return dict(Counter(map(operator.attrgetter(field_name), self._tasks)))
+
+    def filter_tasks(self, status: Optional[str] = None, priority: Optional[str] = None,
+                     task_type: Optional[str] = None, parent_id: Optional[str] = None,
+                     updated_since: Optional[datetime] = None) -> list[Task]:
+        """Returns the tasks matching all given filters, in insertion order.
+
+        Args:
+            status: Only tasks with this status.
+            priority: Only tasks with this priority.
+            task_type: Only tasks of this type.
+            parent_id: Only direct children of this task.
+            updated_since: Only tasks updated at or after this time ("changed since").
+
+        Returns:
+            The matching Task objects.
+        """
+        with self._lock:
+            if self._columns is not None:
+                tasks_by_id = self._tasks_by_id
+                return [tasks_by_id[task_id] for task_id in self._columns.match_ids(
+                    status=status, priority=priority, task_type=task_type,
+                    parent_id=parent_id, updated_since=updated_since)]
+            return [task for task in self._tasks
+                    if (status is None or task.status == status)
+                    and (priority is None or task.priority == priority)
+                    and (task_type is None or task.task_type == task_type)
+                    and (parent_id is None or task.parent_id == parent_id)
+                    and (updated_since is None or task.updated_at >= updated_since)]
+
+    def search(self, query: str, limit: Optional[int] = None,
+               candidates: Optional[Container[str]] = None) -> list[Task]:
+        """Full-text search over task titles and descriptions (see TaskSearchIndex.search).
+
+        Args:
+            query: The search text; every term must match a word or word prefix.
+            limit: Maximum number of results (None = all).
+            candidates: Optional IDs of the only tasks that may match (e.g. from
+                        query()); the limit applies to the matches among them.
+
+        Returns:
+            The matching Task objects, best matches first.
+        """
+        with self._lock:
+            index = self._search_index
+            if index is None:
+                index = TaskSearchIndex(self._tasks) # Not maintained: index on the fly
+            tasks_by_id = self._tasks_by_id
+            return [tasks_by_id[task_id] for task_id, _ in index.search(query, limit, candidates)]
 
     def update_task(self, task_id: str, updates: dict) -> bool:
         """Updates an existing task identified by its UUID ID.
 
         Only updates fields provided in the updates dictionary.
-        Ignores attempts to update 'id', 'display_id', or 'created_at'.
+        Ignores attempts to update 'id', 'display_id', 'created_at' or 'revision'.
         Updates the 'updated_at' timestamp on successful update.
 
         Args:
@@ -135,30 +1134,60 @@ class TaskManager:
 
         Returns:
             True if the update was successful, False if the task was not found.
+
+        Raises:
+            ValueError: If the new parent_id is the task itself or one of its
+                        descendants (a parent cycle); nothing is changed.
         """
-        task_to_update = self.get_task(task_id)
-        if task_to_update is None:
-            return False
+        with self._lock:
+            self._load_next(None) # Mutations need every task (and display ID) loaded
+            task_to_update = self.get_task(task_id)
+            if task_to_update is None:
+                return False
+            new_parent_id = updates.get("parent_id")
+            if (new_parent_id is not None and new_parent_id != task_to_update.parent_id
+                    and self.in_subtree_of(new_parent_id, task_id)):
+                raise ValueError(f"Task {task_id} cannot be moved under its own subtree ({new_parent_id})")
 
-        updated = False
-        # Exclude id, display_id, created_at from direct updates
-        allowed_fields = [f.name for f in fields(Task) if f.name not in ['id', 'display_id', 'created_at']] 
+            updated = False
+            # Indexed values before the update, to move the task between index entries
+            indexed_values = tuple(getattr(task_to_update, name) for name in self._value_index)
+            indexed_updated_at = task_to_update.updated_at
+            # Exclude id, display_id, created_at and the save-managed revision from direct updates
+            allowed_fields = [f.name for f in fields(Task) if f.name not in ['id', 'display_id', 'created_at', 'revision']] 
         
-        for key, value in updates.items():
-            if key in allowed_fields and hasattr(task_to_update, key):
-                current_value = getattr(task_to_update, key)
-                if current_value != value:
-                    setattr(task_to_update, key, value)
-                    updated = True
-            # Silently ignore disallowed fields like 'id', 'display_id', 'created_at' or unknown fields
-
-        if updated:
-            # Use timezone.utc for aware datetime objects
-            task_to_update.updated_at = datetime.now(timezone.utc) 
-            save_tasks_to_json(self._tasks, self._file_path) # Save changes
-            # print(f"Updated task {task_id}.") # Optional debug
+            for key, value in updates.items():
+                if key in allowed_fields and hasattr(task_to_update, key):
+                    current_value = getattr(task_to_update, key)
+                    if current_value != value:
+                        if self._batch is not None:
+                            self._batch._remember_original(task_to_update)
+                        if task_id not in self._base_copies:
+                            # The stored version this change is based on, to rebase it on conflicts
+                            self._base_copies[task_id] = copy.copy(task_to_update)
+                        setattr(task_to_update, key, value)
+                        updated = True
+                # Silently ignore disallowed fields like 'id', 'display_id', 'created_at' or unknown fields
+
+            if updated:
+                # Use timezone.utc for aware datetime objects
+                task_to_update.updated_at = datetime.now(timezone.utc) 
+                if self._columns is not None:
+                    self._columns.update(task_to_update)
+                if self._search_index is not None:
+                    self._search_index.update(task_to_update)
+                if task_to_update.parent_id != self._linked_parent.get(task_id):
+                    self._unlink(task_to_update)
+                    self._link(task_to_update)
+                    self._forget_positions(task_id)
+                    if self._cycle_roots:
+                        self._relink_cycle_roots()
+                self._unindex_task(task_to_update, indexed_values, indexed_updated_at)
+                self._index_task(task_to_update)
+                self._persist_change(task_id) # Save changes
+                # print(f"Updated task {task_id}.") # Optional debug
         
-        return True # Return True even if no fields were changed, as task was found
+            return True # Return True even if no fields were changed, as task was found
 
     def delete_task(self, task_id: str) -> bool:
         """Deletes a task by its unique UUID ID.
@@ -169,90 +1198,460 @@ class TaskManager:
         Returns:
             True if the deletion was successful, False if the task was not found.
         """
-        original_length = len(self._tasks)
-        # Rebuild the list excluding the task with the matching UUID ID
-        self._tasks = [task for task in self._tasks if task.id != task_id]
-        
-        if len(self._tasks) < original_length:
-            # Task was found and removed
-            save_tasks_to_json(self._tasks, self._file_path) # Save changes
-            # print(f"Deleted task {task_id}. Remaining tasks: {len(self._tasks)}") # Optional debug
-            return True
+        with self._lock:
+            self._load_next(None) # Mutations need every task (and display ID) loaded
+            deleted_task = self._remove_task(task_id)
+
+            if deleted_task is not None:
+                self._persist_change(task_id) # Save changes
+                # print(f"Deleted task {task_id}. Remaining tasks: {len(self._tasks)}") # Optional debug
+                return True
+            else:
+                # Task was not found
+                return False
+
+    def _insert_task(self, task: Task) -> None:
+        """Adds a new task to every index (caller holds _lock; nothing is saved)."""
+        self._tasks_by_id[task.id] = task
+        self._tasks_by_display_id[task.display_id] = task
+        self._extend_task_chunks([task])
+        if self._columns is not None:
+            self._columns.append(task)
+        if self._search_index is not None:
+            self._search_index.add(task)
+        self._link(task)
+        self._index_task(task)
+
+    def _remove_task(self, task_id: str) -> Optional[Task]:
+        """Removes a task from every index (caller holds _lock; nothing is saved).
+
+        Returns:
+            The removed task, or None if there was no task with this ID.
+        """
+        deleted_task = self._tasks_by_id.pop(task_id, None)
+        if deleted_task is None:
+            return None
+        # The ordered view is rebuilt on next access
+        if self._tasks_by_display_id.get(deleted_task.display_id) is deleted_task:
+            del self._tasks_by_display_id[deleted_task.display_id]
+        self._task_chunks = self._snapshot = None
+        if self._columns is not None:
+            self._columns.remove(task_id)
+        if self._search_index is not None:
+            self._search_index.remove(task_id)
+        self._unlink(deleted_task)
+        self._unindex_task(deleted_task)
+        if self._positions is not None:
+            self._positions.pop(task_id, None)
+        # Its children are orphaned and show up as roots
+        for child in self._children.pop(task_id, ()):
+            self._orphans.setdefault(task_id, set()).add(child.id)
+            bisect.insort(self._children.setdefault(None, []), child, key=_created_at)
+            self._forget_positions(child.id)
+        if self._cycle_roots:
+            self._relink_cycle_roots()
+        return deleted_task
+
+    # --- Batches ---
+    @contextmanager
+    def batch(self) -> Iterator[TaskBatch]:
+        """Groups many mutations into a single transaction with one save.
+
+        Inside the block, add/update/delete only change the in-memory tasks.
+        On a normal exit everything touched is persisted once; if the block
+        raises, all changes are rolled back and nothing is saved. Nested
+        batches join the outermost one.
+
+        Yields:
+            The TaskBatch recording which tasks were touched.
+        """
+        with self._lock:
+            self._load_next(None) # Mutations need every task (and display ID) loaded
+            if self._batch is not None:
+                yield self._batch # Nested: the outer batch commits or rolls back
+                return
+            batch = TaskBatch(_origin_index=dict(self._tasks_by_id),
+                              _origin_next_display_id=self._next_display_id)
+            self._batch = batch
+            try:
+                yield batch
+            except BaseException:
+                self._batch = None
+                self._rollback(batch)
+                raise
+            self._batch = None
+            if batch.touched_ids:
+                self._persist_changes(batch.touched_ids)
+
+    def _rollback(self, batch: TaskBatch) -> None:
+        """Restores the tasks to the state they had when the batch started."""
+        for task_id in batch._originals:
+            if task_id not in self._dirty_ids: # Changed only inside the batch
+                self._base_copies.pop(task_id, None)
+        for task_id, original in batch._originals.items():
+            task = batch._origin_index.get(task_id)
+            if task is not None:
+                for f in fields(Task):
+                    setattr(task, f.name, getattr(original, f.name))
+        self._tasks = list(batch._origin_index.values())
+        self._next_display_id = batch._origin_next_display_id
+
+    def add_tasks(self, task_details_list: Iterable[dict]) -> list[str]:
+        """Adds several tasks in one transaction with a single save.
+
+        Args:
+            task_details_list: Task detail dictionaries, as accepted by add_task.
+
+        Returns:
+            The UUID IDs of the new tasks, in input order.
+        """
+        with self.batch():
+            return [self.add_task(task_details) for task_details in task_details_list]
+
+    def update_tasks(self, updates_by_id: dict[str, dict]) -> int:
+        """Updates several tasks in one transaction with a single save.
+
+        Unknown task IDs are skipped.
+
+        Args:
+            updates_by_id: Maps task UUID IDs to update dictionaries, as accepted by update_task.
+
+        Returns:
+            The number of tasks that were actually changed.
+        """
+        with self.batch() as batch:
+            for task_id, updates in updates_by_id.items():
+                self.update_task(task_id, updates)
+        return batch.count
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """Deletes several tasks in one transaction with a single save.
+
+        Unknown task IDs are skipped.
+
+        Args:
+            task_ids: UUID IDs of the tasks to delete.
+
+        Returns:
+            The number of tasks that were deleted.
+        """
+        with self.batch():
+            return sum(self.delete_task(task_id) for task_id in task_ids)
+
+    # --- Persistence ---
+    def _persist_change(self, task_id: str) -> None:
+        """Persists a single mutation, or defers it while a batch is open.
+
+        Args:
+            task_id: The UUID ID of the added, updated or deleted task.
+        """
+        if self._batch is not None:
+            self._batch.touched_ids.add(task_id)
+            return
+        self._persist_changes([task_id])
+
+    def _persist_changes(self, task_ids: Iterable[str]) -> None:
+        """Persists the current state of the given tasks.
+
+        Incremental backends (e.g. the JSON journal or SQLite) receive only the
+        changed tasks; otherwise the whole task list is rewritten. With a
+        save_delay the tasks are only marked dirty and the background writer
+        persists them later.
+
+        Args:
+            task_ids: UUID IDs of the tasks that changed.
+        """
+        if self._save_delay is not None:
+            with self._lock:
+                self._dirty_ids.update(task_ids)
+                self._last_change = time.monotonic()
+                self._start_writer()
+                self._changes_pending.notify()
+            return
+        # Synchronous mode: the caller holds _lock, which already serializes the writes.
+        # Publish the snapshot first, so readers of `tasks` do not wait for the write.
+        self._tasks
+        task_ids = set(task_ids)
+        with self._storage_lock():
+            self._resolve_concurrent_changes(task_ids)
+            self._write_changes(self._capture_changes(task_ids, detach=False))
+
+    def _storage_lock(self):
+        """The store's inter-process write lock (a no-op for backends without one)."""
+        if isinstance(self._storage, JsonFileStorage):
+            return self._storage.lock()
+        return nullcontext()
+
+    def _capture_changes(self, task_ids: Iterable[str], detach: bool) -> Union[list[Task], list[TaskChange]]:
+        """Collects what has to be written for the given changes (caller holds _lock).
+
+        Args:
+            task_ids: UUID IDs of the tasks that changed.
+            detach: If True, the result must stay consistent while the tasks keep
+                    changing (it is written later, on another thread).
+
+        Returns:
+            The full task list (non-incremental backends) or the list of changes.
+        """
+        for task_id in task_ids: # Stamp the new revisions being saved
+            task = self._tasks_by_id.get(task_id)
+            if task is not None:
+                task.revision += 1
+            self._base_copies.pop(task_id, None)
+        if not self._storage.incremental:
+            # Fields hold immutable values, so shallow copies form a consistent snapshot
+            return [copy.copy(task) for task in self._tasks] if detach else self._tasks
+        changes: list[TaskChange] = []
+        for task_id in task_ids:
+            task = self._tasks_by_id.get(task_id)
+            changes.append((task_id, copy.copy(task) if detach and task is not None else task))
+        return changes
+
+    def _write_changes(self, payload: Union[list[Task], list[TaskChange]]) -> None:
+        """Hands captured changes to the storage backend (serialized by the caller)."""
+        if self._storage.incremental:
+            self._storage.save_changes(payload)
         else:
-            # Task was not found
-            return False
+            self._storage.save_all(payload)
 
-# --- JSON Persistence Functions ---
+    # --- Deferred Persistence ---
+    @property
+    def pending_changes(self) -> int:
+        """Number of changed tasks not yet written to disk (deferred mode)."""
+        return len(self._dirty_ids)
 
-def _datetime_encoder(obj):
-    """JSON encoder for datetime objects."""
-    """Custom JSON encoder to serialize datetime objects into ISO 8601 format.
-    
-    Raises:
-        TypeError: If the object is not a datetime object.
-    """
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-
-def _datetime_decoder(dct):
-    """JSON decoder hook for datetime objects."""
-    """Custom JSON object hook to deserialize ISO 8601 strings back into 
-    datetime objects for specific keys ('created_at', 'updated_at').
-    If a datetime string is parsed successfully but lacks timezone info,
-    it is assumed to be UTC.
-    """
-    for key, value in dct.items():
-        # Basic ISO format check (adjust if using different formats)
-        if isinstance(value, str) and len(value) > 10 and value[10] == 'T': 
+    @property
+    def is_flushing(self) -> bool:
+        """True while pending changes are being written to disk."""
+        return self._flushing
+
+    def flush(self) -> None:
+        """Writes all pending changes to disk now. Safe to call from any thread."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty_ids:
+                    return
+            with self._storage_lock():
+                try:
+                    with self._lock:
+                        # Flagged first: the changes never look neither pending nor being written
+                        self._flushing = True
+                        task_ids, self._dirty_ids = self._dirty_ids, set()
+                        self._resolve_concurrent_changes(task_ids)
+                        payload = self._capture_changes(task_ids, detach=True)
+                    self._write_changes(payload) # Disk I/O happens without holding _lock
+                finally:
+                    self._flushing = False
+
+    def close(self) -> None:
+        """Stops the background writer and flushes pending changes.
+
+        The manager stays usable afterwards; the writer restarts on the next change.
+        """
+        with self._lock:
+            writer = self._writer_thread
+            self._closing = True
+            self._changes_pending.notify_all()
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            self._writer_thread = None
+            self._closing = False
+        self.flush()
+        with self._write_lock:
+            self._storage.close()
+
+    def _start_writer(self) -> None:
+        """Starts the background writer thread if it is not running (caller holds _lock)."""
+        if self._writer_thread is None and not self._closing:
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="task-writer", daemon=True
+            )
+            self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """Flushes pending changes once they have been quiet for save_delay seconds."""
+        while True:
+            with self._lock:
+                while not self._dirty_ids and not self._closing:
+                    self._changes_pending.wait()
+                # Debounce: wait until no new change arrived for save_delay seconds
+                while not self._closing:
+                    remaining = self._last_change + self._save_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changes_pending.wait(remaining)
+                if self._closing:
+                    return # close() flushes whatever is left
+            self.flush()
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Blocks until a running background journal compaction (if any) has finished."""
+        if isinstance(self._storage, JsonFileStorage):
+            self._storage.wait_for_compaction(timeout)
+
+    # --- External Changes ---
+    def reload_external_changes(self) -> ExternalMerge:
+        """Merges the changes other processes wrote to the store since it was last
+        read or written, matching tasks by UUID.
+
+        Only the JSON file storage can detect such changes; in journal mode just the
+        appended records are parsed. Tasks with local changes that are not saved yet
+        keep the local version; it is rebased on the stored one when it is saved.
+        Merged changes are not saved again. Writes are held back while the store is
+        read, so they cannot interleave.
+
+        Returns:
+            The ExternalMerge describing what changed (empty if nothing did),
+            including changes merged while our own changes were being saved.
+        """
+        if not isinstance(self._storage, JsonFileStorage):
+            return ExternalMerge()
+        with self._write_lock:
+            with self._lock:
+                self._load_next(None) # Merging needs every task loaded
+                merge, self._unreported_merge = self._unreported_merge, ExternalMerge()
+                try:
+                    changes = self._storage.read_external_changes()
+                except (json.JSONDecodeError, FileNotFoundError, TypeError) as e:
+                    # Probably caught mid-write by a non-atomic writer; retried on the next change
+                    logger.error(f"Error reloading tasks from storage: {e}")
+                    changes = None
+                if changes is not None:
+                    self._concurrent.update(self._fold_external_changes(changes, self._dirty_ids, merge))
+        return merge
+
+    def _fold_external_changes(self, changes: ExternalChanges, local_ids: set[str],
+                               merge: ExternalMerge) -> dict[str, Optional[Task]]:
+        """Merges stored changes into the manager (caller holds _lock).
+
+        Args:
+            changes: The changes read from the store.
+            local_ids: UUID IDs of tasks with unsaved local changes; these are left alone.
+            merge: Records what was changed.
+
+        Returns:
+            The stored versions (None = deleted) of the tasks in local_ids that
+            changed in the store, for rebasing the local changes on.
+        """
+        conflicts: dict[str, Optional[Task]] = {}
+        for task_id, stored in changes.tasks.items():
+            if task_id in local_ids:
+                conflicts[task_id] = stored
+            else:
+                self._merge_stored_task(task_id, stored, merge)
+        if changes.complete:
+            # Tasks missing from a full re-read were deleted by the other process
+            # (unless they were added here and not saved yet: those have no base copy)
+            for task_id in [task_id for task_id in self._tasks_by_id if task_id not in changes.tasks]:
+                if task_id not in local_ids:
+                    self._merge_stored_task(task_id, None, merge)
+                elif task_id in self._base_copies:
+                    conflicts[task_id] = None
+        return conflicts
+
+    def _resolve_concurrent_changes(self, task_ids: set[str]) -> None:
+        """Brings in what other processes stored since we last synced, right before
+        our changes are written (caller holds _lock and the store lock).
+
+        Only if the store version moved are the files read, and then only their
+        changes. Other processes' changes to tasks we did not touch are merged as
+        they are; for the tasks we are saving, our changed fields are re-applied
+        on top of their stored version (a deletion by the other process wins).
+
+        Args:
+            task_ids: UUID IDs of the tasks about to be saved.
+        """
+        conflicts = {task_id: self._concurrent.pop(task_id) for task_id in task_ids if task_id in self._concurrent}
+        if isinstance(self._storage, JsonFileStorage):
             try:
-                # Attempt to parse common datetime fields
-                if key in ['created_at', 'updated_at']:
-                    dt = datetime.fromisoformat(value)
-                    # If the parsed datetime is naive (no tzinfo), assume UTC
-                    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    dct[key] = dt
-            except ValueError:
-                pass # Ignore if parsing fails, leave as string
-    return dct
-
-def save_tasks_to_json(tasks: list[Task], file_path: str):
-    """Saves a list of Task objects to a JSON file.
-    
-    Args:
-        tasks: The list of Task objects to save.
-        file_path: The path to the JSON file.
-    """
-    try:
-        # Convert list of Task objects to list of dictionaries
-        tasks_as_dict = [asdict(task) for task in tasks]
-        with open(file_path, 'w') as f:
-            json.dump(tasks_as_dict, f, indent=4, default=_datetime_encoder)
-    except IOError as e:
-        logger.error(f"Error saving tasks to {file_path}: {e}")
-    except TypeError as e:
-        logger.error(f"Error serializing task data: {e}")
-
-def load_tasks_from_json(file_path: str) -> list[Task]:
-    """Loads a list of Task objects from a JSON file.
-
-    Args:
-        file_path: The path to the JSON file.
-
-    Returns:
-        A list of Task objects, or an empty list if the file 
-        doesn't exist or contains invalid data.
-    """
-    if not os.path.exists(file_path):
-        return []
-    try:
-        with open(file_path, 'r') as f:
-            tasks_data = json.load(f, object_hook=_datetime_decoder)
-            # Convert dictionaries back to Task objects
-            # Filter out any potential None values from malformed data
-            tasks_list = [Task(**data) for data in tasks_data if data is not None]
-            return tasks_list
-    except (json.JSONDecodeError, FileNotFoundError, TypeError) as e:
-        logger.error(f"Error loading tasks from {file_path}: {e}")
-        # Optionally: backup corrupted file here
-        return []
+                changes = self._storage.read_external_changes(if_version_changed=True)
+            except (json.JSONDecodeError, FileNotFoundError, TypeError) as e:
+                logger.error(f"Error reading concurrent changes from storage: {e}")
+                changes = None
+            if changes is not None:
+                conflicts.update(self._fold_external_changes(changes, task_ids, self._unreported_merge))
+        for task_id, stored in conflicts.items():
+            self._rebase_change(task_id, stored, self._unreported_merge)
+
+    def _rebase_change(self, task_id: str, stored: Optional[Task], merge: ExternalMerge) -> None:
+        """Re-applies an unsaved local change on top of the version another process
+        stored meanwhile, if that version is newer than the one the change started from."""
+        task = self._tasks_by_id.get(task_id)
+        if task is None:
+            return # Deleted here: the deletion is saved either way
+        base = self._base_copies.get(task_id)
+        if stored is None:
+            if base is not None: # Not a task added here
+                logger.warning(f"Task {task_id} was deleted by another process; dropping the local change")
+                self._remove_task(task_id)
+                merge.deleted_ids.add(task_id)
+            return
+        if stored.revision == (base.revision if base is not None else task.revision):
+            return # Nobody else saved the task since our change started
+        if base is None:
+            rebased = copy.copy(task) # Unknown what changed here: the local version wins
+        else:
+            rebased = copy.copy(stored)
+            for name in _TASK_FIELD_NAMES:
+                if name != "revision" and getattr(task, name) != getattr(base, name):
+                    setattr(rebased, name, getattr(task, name))
+        rebased.revision = stored.revision
+        self._replace_task_fields(task, rebased, merge)
+
+    def _merge_stored_task(self, task_id: str, stored: Optional[Task], merge: ExternalMerge) -> None:
+        """Brings one task in line with its stored state (caller holds _lock).
+
+        Args:
+            task_id: The UUID ID of the task.
+            stored: The task as stored, or None if it was deleted from the store.
+            merge: Records what was changed.
+        """
+        task = self._tasks_by_id.get(task_id)
+        self._base_copies.pop(task_id, None) # In line with the store again
+        if stored is None:
+            if task is not None:
+                self._remove_task(task_id)
+                merge.deleted_ids.add(task_id)
+        elif task is None:
+            self._insert_task(self._adopt(stored))
+            self._next_display_id = max(self._next_display_id, stored.display_id + 1)
+            merge.added_ids.add(task_id)
+        elif _get_task_fields(task) != _get_task_fields(stored):
+            self._replace_task_fields(task, stored, merge)
+
+    def _replace_task_fields(self, task: Task, stored: Task, merge: ExternalMerge) -> None:
+        """Copies every field of a stored task onto the in-memory one and updates the indexes."""
+        moved = stored.parent_id != task.parent_id or stored.created_at != task.created_at
+        # A parent inside the task's own subtree would detach it from the roots: like
+        # loaded cycles, the task is then shown as a root
+        makes_cycle = (moved and stored.parent_id is not None
+                       and stored.parent_id in self._tasks_by_id
+                       and self.in_subtree_of(stored.parent_id, task.id))
+        if moved:
+            self._unlink(task) # Children lists are sorted by the old created_at
+        self._unindex_task(task)
+        if self._tasks_by_display_id.get(task.display_id) is task:
+            del self._tasks_by_display_id[task.display_id]
+        for name in _TASK_FIELD_NAMES:
+            setattr(task, name, getattr(stored, name))
+        self._tasks_by_display_id[task.display_id] = task
+        self._next_display_id = max(self._next_display_id, task.display_id + 1)
+        if self._columns is not None:
+            self._columns.update(task)
+        if self._search_index is not None:
+            self._search_index.update(task)
+        if makes_cycle:
+            self._linked_parent[task.id] = task.parent_id
+            bisect.insort(self._children.setdefault(None, []), task, key=_created_at)
+            self._cycle_roots.add(task.id)
+            self._invalidate_walk(task.id)
+        elif moved:
+            self._link(task)
+        if moved:
+            self._forget_positions(task.id)
+            if self._cycle_roots:
+                self._relink_cycle_roots()
+            merge.moved_ids.add(task.id)
+        self._index_task(task)
+        merge.updated_ids.add(task.id)
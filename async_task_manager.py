@@ -0,0 +1,141 @@
+"""
+Asyncio facade over TaskManager for the AI Pair Programming Task Manager.
+
+TaskManager's methods block: mutations wait for its lock (held while a save
+captures the changes) and, without deferred persistence, write to disk
+themselves. AsyncTaskManager runs them on worker threads, so an event loop
+(e.g. the Textual TUI) keeps handling input and redrawing while large saves
+are in flight.
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from AI_Pair_Programming_Task_Manager import ExternalMerge, Task, TaskManager
+
+logger = logging.getLogger(__name__)
+
+class AsyncTaskManager:
+    """Awaitable add/update/delete/query over a TaskManager.
+
+    Mutations run one at a time, in the order they were started, on a
+    dedicated thread. They do not save: wrap a manager created with
+    save_delay, so mutations only mark tasks as changed and its debounced
+    background writer saves once edits pause (a manager without save_delay
+    writes each change itself, on the mutation thread). save() writes
+    everything now, on a second thread; concurrent calls are coalesced, so at
+    most one save waits behind the one being written. Reads run on the event
+    loop's default executor.
+    """
+
+    def __init__(self, task_manager: TaskManager):
+        """Initializes the facade.
+
+        Args:
+            task_manager: The TaskManager the calls are forwarded to. It can
+                          still be read directly (e.g. get_task()) from any thread.
+        """
+        self.task_manager = task_manager
+        self._mutations = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-mutations")
+        self._saves = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-saves")
+        self._save_lock: Optional[asyncio.Lock] = None # Held while a save is written (created on the loop)
+        self._queued_save: Optional[asyncio.Task] = None # Save not started yet; new changes join it
+
+    # --- Mutations ---
+    async def add_task(self, task_details: dict) -> str:
+        """Creates a task (see TaskManager.add_task) and returns its UUID ID."""
+        return await self.apply(TaskManager.add_task, task_details)
+
+    async def update_task(self, task_id: str, updates: dict) -> bool:
+        """Updates a task (see TaskManager.update_task); False if it does not exist.
+
+        Raises:
+            ValueError: If the new parent would create a cycle.
+        """
+        return await self.apply(TaskManager.update_task, task_id, updates)
+
+    async def delete_task(self, task_id: str) -> bool:
+        """Deletes a task (see TaskManager.delete_task); False if it does not exist."""
+        return await self.apply(TaskManager.delete_task, task_id)
+
+    async def update_tasks(self, updates_by_id: dict[str, dict]) -> int:
+        """Updates several tasks in one transaction (see TaskManager.update_tasks).
+
+        Raises:
+            ValueError: If a new parent would create a cycle (nothing is changed).
+        """
+        return await self.apply(TaskManager.update_tasks, updates_by_id)
+
+    async def delete_tasks(self, task_ids: list[str]) -> int:
+        """Deletes several tasks in one transaction (see TaskManager.delete_tasks)."""
+        return await self.apply(TaskManager.delete_tasks, task_ids)
+
+    async def reload_external_changes(self) -> ExternalMerge:
+        """Merges changes other processes stored (see TaskManager.reload_external_changes)."""
+        return await self.apply(TaskManager.reload_external_changes)
+
+    async def apply(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs function(task_manager, *args) on the mutation thread.
+
+        Use it for read-modify-write steps (e.g. moving a task to the next status)
+        so they see the result of every mutation started before them.
+
+        Returns:
+            What the function returned, once the change is made in memory
+            (the manager's writer saves it later; await save() to write it now).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._mutations, functools.partial(function, self.task_manager, *args))
+
+    # --- Reads ---
+    async def query(self, **criteria: Any) -> list[Task]:
+        """Returns the tasks matching the criteria (see TaskManager.query)."""
+        return await self._read(lambda: list(self.task_manager.query(**criteria)))
+
+    async def search(self, query: str, limit: Optional[int] = None,
+                     candidates: Optional[Container[str]] = None) -> list[Task]:
+        """Returns the tasks matching a full-text query (see TaskManager.search)."""
+        return await self._read(self.task_manager.search, query, limit, candidates)
+
+    async def count_by(self, field_name: str) -> dict[str, int]:
+        """Counts the tasks per value of a field (see TaskManager.count_by)."""
+        return await self._read(self.task_manager.count_by, field_name)
+
+    async def _read(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs a read on the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args))
+
+    # --- Saving ---
+    def _request_save(self) -> asyncio.Task:
+        """Schedules a save, joining the one already waiting to start if there is one."""
+        if self._queued_save is None:
+            self._queued_save = asyncio.ensure_future(self._save())
+        return self._queued_save
+
+    async def _save(self) -> None:
+        """Waits for the save in flight, then writes every change made until now."""
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            self._queued_save = None # Changes from here on need the next save
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._saves, self.task_manager.flush)
+            except Exception as e:
+                logger.error(f"Error saving tasks: {e}")
+
+    async def save(self) -> None:
+        """Writes every change made so far, without waiting for the debounce."""
+        await asyncio.shield(self._request_save())
+
+    async def close(self) -> None:
+        """Writes pending changes, closes the TaskManager and stops the worker threads."""
+        await self.save()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._mutations, lambda: None) # Let started mutations finish
+        await loop.run_in_executor(self._saves, self.task_manager.close)
+        self._mutations.shutdown(wait=False)
+        self._saves.shutdown(wait=False)
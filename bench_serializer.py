@@ -0,0 +1,79 @@
+"""
+Benchmark: Task serialization for full saves.
+
+Compares the previous save path (dataclasses.asdict + json.dump(indent=4))
+with write_tasks_json in indented and compact mode, on 10k and 100k tasks.
+
+Usage:
+    python bench_serializer.py [--sizes 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import io
+import json
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+from AI_Pair_Programming_Task_Manager import Task, write_tasks_json
+from task_serialization import _datetime_encoder
+
+def make_tasks(count: int) -> list[Task]:
+    """Builds a realistic mix of tasks with distinct timestamps."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    statuses = ["To Do", "In Progress", "Done", "Blocked"]
+    types = ["Epic", "Story", "Task", "Bug"]
+    tasks = []
+    for i in range(count):
+        created = start + timedelta(seconds=i)
+        tasks.append(Task(
+            display_id=i + 1,
+            title=f"Task number {i}",
+            description="Some longer description of the work to be done. " * 2,
+            status=statuses[i % 4],
+            task_type=types[i % 4],
+            parent_id=tasks[i // 10].id if i >= 10 else None,
+            created_at=created,
+            updated_at=created + timedelta(minutes=i % 7),
+        ))
+    return tasks
+
+def asdict_path(tasks: list[Task]) -> str:
+    """The previous save path."""
+    f = io.StringIO()
+    json.dump([asdict(task) for task in tasks], f, indent=4, default=_datetime_encoder)
+    return f.getvalue()
+
+def serializer_path(tasks: list[Task], compact: bool = False) -> str:
+    """The dedicated serializer."""
+    f = io.StringIO()
+    write_tasks_json(tasks, f, compact=compact)
+    return f.getvalue()
+
+def best_of(repeat: int, func, *args) -> float:
+    """Returns the fastest of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'asdict+dump':>12} {'indent':>10} {'compact':>10} {'speedup':>8} {'compact':>8}")
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        assert serializer_path(tasks) == asdict_path(tasks), "indented output must be identical"
+        old = best_of(args.repeat, asdict_path, tasks)
+        indented = best_of(args.repeat, serializer_path, tasks)
+        compact = best_of(args.repeat, serializer_path, tasks, True)
+        print(f"{size:>8} {old:>11.3f}s {indented:>9.3f}s {compact:>9.3f}s "
+              f"{old / indented:>7.1f}x {old / compact:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
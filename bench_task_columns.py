@@ -0,0 +1,47 @@
+"""
+Benchmark: type filters and status counts over TaskColumns.
+
+Compares a Python scan over Task objects with the TaskColumns array passes
+(pure array module, and NumPy when installed).
+
+Usage:
+    python bench_task_columns.py [--sizes 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+
+from task_columns import TaskColumns, _numpy
+from bench_serializer import best_of, make_tasks
+
+def scan_filter(tasks, task_type):
+    return [task.id for task in tasks if task.task_type == task_type]
+
+def scan_count(tasks):
+    return Counter(task.status for task in tasks)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = [("array", False)] + ([("numpy", True)] if _numpy() is not None else [])
+    since = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        print(f"{size} tasks")
+        print(f"  {'scan':>8}: filter {best_of(args.repeat, scan_filter, tasks, 'Bug') * 1000:8.1f}ms"
+              f"  count {best_of(args.repeat, scan_count, tasks) * 1000:8.1f}ms")
+        for name, use_numpy in modes:
+            columns = TaskColumns(tasks, use_numpy=use_numpy)
+            assert columns.match_ids(task_type="Bug") == scan_filter(tasks, "Bug")
+            filter_time = best_of(args.repeat, lambda: columns.match_ids(task_type="Bug"))
+            count_time = best_of(args.repeat, columns.count_by, "status")
+            since_time = best_of(args.repeat, lambda: columns.match_rows(updated_since=since))
+            print(f"  {name:>8}: filter {filter_time * 1000:8.1f}ms  count {count_time * 1000:8.1f}ms"
+                  f"  changed-since {since_time * 1000:8.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: in-memory footprint of loaded tasks.
+
+Loads the same task file as Task dataclasses, as CompactTask objects and as
+CompactTask objects with 16-byte UUIDs, and reports the memory each
+representation keeps alive (measured with tracemalloc).
+
+Usage:
+    python bench_task_memory.py [--sizes 10000 100000]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from AI_Pair_Programming_Task_Manager import CompactTask, load_tasks_from_json, save_tasks_to_json
+from bench_serializer import make_tasks
+
+def retained_bytes(build) -> int:
+    """Returns the bytes still allocated after build() once its result is kept."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'Task':>10} {'Compact':>10} {'+uuids':>10} {'saving':>8} {'+uuids':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            path = os.path.join(tmp_dir, f"tasks_{size}.json")
+            save_tasks_to_json(make_tasks(size), path)
+            # Each representation is loaded from disk so strings are not shared between runs
+            plain = retained_bytes(lambda: load_tasks_from_json(path))
+            compact = retained_bytes(
+                lambda: [CompactTask.from_task(task) for task in load_tasks_from_json(path)])
+            packed = retained_bytes(
+                lambda: [CompactTask.from_task(task, compact_uuids=True) for task in load_tasks_from_json(path)])
+            print(f"{size:>8} {plain / 2**20:>8.1f}MB {compact / 2**20:>8.1f}MB {packed / 2**20:>8.1f}MB "
+                  f"{1 - compact / plain:>7.0%} {1 - packed / plain:>7.0%}")
+
+if __name__ == "__main__":
+    main()
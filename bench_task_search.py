@@ -0,0 +1,67 @@
+"""
+Benchmark: per-keystroke full-text search over TaskSearchIndex.
+
+Indexes tasks with titles and descriptions drawn from a Zipf-distributed
+vocabulary, then times TaskSearchIndex.search() for every prefix of a few
+queries, as typed into the TUI search box, against a linear scan.
+
+Usage:
+    python bench_task_search.py [--sizes 10000 100000] [--limit 200] [--repeat 3]
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from AI_Pair_Programming_Task_Manager import Task, TaskSearchIndex
+from bench_serializer import best_of
+
+COMMON_WORDS = ("the", "to", "and", "of", "a", "in", "for", "with", "on", "when",
+                "fix", "add", "update", "remove", "test", "support", "error", "page")
+QUERIES = ("fix login", "parser refactor", "update tests", "zz")
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    """Common words followed by pronounceable made-up words (and the query words)."""
+    syllables = ["ba", "co", "de", "fi", "ga", "lo", "mu", "ne", "pa", "ri", "so", "ta", "ve", "xi"]
+    words = list(COMMON_WORDS) + ["login", "parser", "refactor", "tests"]
+    while len(words) < size:
+        words.append("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return words
+
+def make_tasks(count: int, seed: int = 1) -> list[Task]:
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(20_000, rng)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1))) # Zipf
+    def sentence(words: int) -> str:
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=words))
+    return [Task(display_id=i + 1, title=sentence(rng.randint(3, 8)),
+                 description=sentence(rng.randint(10, 40))) for i in range(count)]
+
+def scan(tasks, query):
+    terms = query.lower().split()
+    return [task.id for task in tasks
+            if all(term in f"{task.title} {task.description}".lower() for term in terms)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        start = time.perf_counter()
+        index = TaskSearchIndex(tasks)
+        index.search("warm up") # Builds the sorted vocabulary
+        print(f"{size} tasks: indexed in {time.perf_counter() - start:.2f}s")
+        for query in QUERIES:
+            timings = [best_of(args.repeat, index.search, query[:end], args.limit)
+                       for end in range(1, len(query) + 1)]
+            scan_time = best_of(1, scan, tasks, query)
+            print(f"  {query!r:>18}: worst keystroke {max(timings) * 1000:6.2f}ms"
+                  f"  mean {sum(timings) / len(timings) * 1000:6.2f}ms  (scan {scan_time * 1000:7.1f}ms)")
+
+if __name__ == "__main__":
+    main()
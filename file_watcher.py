@@ -0,0 +1,191 @@
+"""
+File watcher for the AI Pair Programming Task Manager.
+
+Notices when other processes (e.g. agents sharing the task file) write the
+task files, so the TUI can merge their changes instead of overwriting them.
+Uses Linux inotify through ctypes (no extra dependency) where available and
+falls back to polling the files' inode, size and modification time.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+# struct inotify_event header: wd, mask, cookie, len (followed by len bytes of name)
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _load_inotify():
+    """Returns libc if it provides inotify (Linux), otherwise None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+def _signature(path: str) -> Optional[tuple[int, int, int]]:
+    """Returns (inode, size, modification time in ns) of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+class FileWatcher:
+    """Calls a function on a background thread whenever one of the watched files changes.
+
+    With inotify the directories holding the files are watched, so files that
+    are replaced atomically (written to a temporary file, then renamed) or
+    created later are still noticed. Events arriving in a burst are coalesced
+    into a single call. Without inotify the files are polled instead.
+    """
+
+    # Seconds between checks when polling
+    POLL_INTERVAL = 1.0
+    # Seconds without further events before a burst of events is reported
+    SETTLE_DELAY = 0.05
+
+    def __init__(self, paths: Iterable[str], on_change: Callable[[], None],
+                 poll_interval: Optional[float] = None, use_inotify: Optional[bool] = None):
+        """Initializes the watcher (call start() to begin watching).
+
+        Args:
+            paths: The files to watch (they need not exist yet).
+            on_change: Called without arguments, on the watcher thread, after changes.
+            poll_interval: Seconds between checks when polling (default POLL_INTERVAL).
+            use_inotify: Force (True) or disable (False) inotify; by default it is
+                         used when the platform provides it.
+        """
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.on_change = on_change
+        self.poll_interval = poll_interval if poll_interval is not None else self.POLL_INTERVAL
+        self._libc = _load_inotify() if use_inotify is not False else None
+        if use_inotify and self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._stop = threading.Event()
+        self._wake_fds: Optional[tuple[int, int]] = None # Pipe interrupting select() on stop
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        """True if changes are reported by inotify rather than found by polling."""
+        return self._libc is not None
+
+    def start(self) -> None:
+        """Starts the watcher thread (no-op if it is already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        # Taken before returning, so changes made right after start() are noticed
+        signatures = [_signature(path) for path in self.paths]
+        target = lambda: self._polling_loop(signatures)
+        if self._libc is not None:
+            inotify_fd = self._open_inotify()
+            if inotify_fd is not None:
+                self._wake_fds = os.pipe()
+                target = lambda: self._inotify_loop(inotify_fd)
+        self._thread = threading.Thread(target=target, name="task-file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the watcher thread and waits for it to finish."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        if self._wake_fds is not None:
+            os.write(self._wake_fds[1], b"x")
+        if thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+        if self._wake_fds is not None:
+            for fd in self._wake_fds:
+                os.close(fd)
+            self._wake_fds = None
+
+    def _notify(self) -> None:
+        """Calls on_change, keeping the watcher alive if it fails."""
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"Error handling a change of {', '.join(self.paths)}: {e}")
+
+    # --- Polling ---
+    def _polling_loop(self, signatures: list) -> None:
+        """Compares the files' signatures every poll_interval seconds."""
+        while not self._stop.wait(self.poll_interval):
+            current = [_signature(path) for path in self.paths]
+            if current != signatures:
+                signatures = current
+                self._notify()
+
+    # --- inotify ---
+    def _open_inotify(self) -> Optional[int]:
+        """Creates an inotify instance watching the files' directories (None on failure)."""
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            logger.error(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}; polling instead")
+            self._libc = None
+            return None
+        for directory in {os.path.dirname(path) for path in self.paths}:
+            if self._libc.inotify_add_watch(fd, os.fsencode(directory), _IN_WATCH_MASK) < 0:
+                logger.error(f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}; polling instead")
+                os.close(fd)
+                self._libc = None
+                return None
+        return fd
+
+    def _read_events(self, fd: int, names: set[bytes]) -> bool:
+        """Drains pending inotify events; True if one concerned a watched file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+                relevant = relevant or name in names
+
+    def _inotify_loop(self, fd: int) -> None:
+        """Waits for inotify events, reporting each burst that touched a watched file once."""
+        names = {os.fsencode(os.path.basename(path)) for path in self.paths}
+        wake_fd = self._wake_fds[0]
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd, wake_fd], [], [])
+                if wake_fd in ready or not self._read_events(fd, names):
+                    continue
+                # Let the burst (e.g. write, rename, journal append) finish first
+                while not self._stop.is_set():
+                    ready, _, _ = select.select([fd, wake_fd], [], [], self.SETTLE_DELAY)
+                    if not ready or wake_fd in ready:
+                        break
+                    self._read_events(fd, names)
+                if not self._stop.is_set():
+                    self._notify()
+        finally:
+            os.close(fd)
@@ -0,0 +1,692 @@
+"""
+JSON file storage for the AI Pair Programming Task Manager.
+
+JsonFileStorage keeps the tasks in a JSON snapshot file, optionally with an
+append-only change journal that is compacted into the snapshot in the
+background. Writers in different processes take turns through an advisory
+lock on a sidecar file, which also holds the store version.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError: # Not on Windows: writers in other processes are then not locked out
+    fcntl = None
+
+from task_model import ExternalChanges, Task, TaskChange
+from task_serialization import (
+    _STREAM_CHUNK_SIZE, _datetime_decoder, _datetime_encoder, _iter_snapshot, _read_snapshot,
+    _write_snapshot, task_to_dict, write_tasks_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# Journal size (in bytes) after which the snapshot is compacted in the background
+DEFAULT_JOURNAL_COMPACT_BYTES = 1024 * 1024
+# Times a compaction is rebuilt when other writers move the store version under it
+COMPACTION_ATTEMPTS = 3
+
+# --- Store Locking and Versions ---
+# Every write to a task file (snapshot rewrite, journal append, rotation and
+# compaction) holds an advisory fcntl lock on the sidecar '<file>.lock', so
+# writers in different processes take turns. The lock file also holds the store
+# version: a counter bumped by every write (including compaction), so a writer
+# can tell cheaply whether anybody else wrote since it last synced.
+
+def _lock_path(file_path: str) -> str:
+    """Returns the path of the lock (and version) file of a task file."""
+    return f"{file_path}.lock"
+
+class _StoreLock:
+    """The advisory lock of one task store, re-entrant within a thread."""
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self._thread_lock = threading.RLock() # Serializes the threads of this process
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError as e:
+                # The write that follows fails the same way and reports it
+                logger.error(f"Error locking {self.lock_path}: {e}")
+                fd = None
+            if fd is not None and fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX) # Blocks while another process writes
+                except BaseException:
+                    os.close(fd)
+                    self._thread_lock.release()
+                    raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+_store_locks: dict[str, _StoreLock] = {}
+_store_locks_guard = threading.Lock()
+
+@contextmanager
+def lock_task_store(file_path: str) -> Iterator[None]:
+    """Holds the write lock of a task store for the duration of the block.
+
+    Re-entrant within a thread; other threads and processes wait for it.
+
+    Args:
+        file_path: The path to the JSON snapshot file.
+    """
+    lock_path = os.path.abspath(_lock_path(file_path))
+    with _store_locks_guard:
+        lock = _store_locks.setdefault(lock_path, _StoreLock(lock_path))
+    lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+def read_store_version(file_path: str) -> int:
+    """Returns the version of a task store (0 if it was never written with versions)."""
+    try:
+        with open(_lock_path(file_path), 'rb') as f:
+            return int(f.read(32) or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def _bump_store_version(file_path: str) -> int:
+    """Increments the store version (caller holds the store lock) and returns it."""
+    version = read_store_version(file_path) + 1
+    fd = os.open(_lock_path(file_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, str(version).encode(), 0)
+    finally:
+        os.close(fd)
+    return version
+
+def save_tasks_to_json(tasks: list[Task], file_path: str, compact: bool = False):
+    """Saves a list of Task objects to a JSON file.
+
+    A full save supersedes any change journal, so the journal files are
+    discarded once the snapshot has been written. The write holds the store
+    lock and bumps the store version; it replaces whatever other processes
+    stored (TaskManager merges their changes before saving).
+    
+    Args:
+        tasks: The list of Task objects to save.
+        file_path: The path to the JSON file.
+        compact: If True, write without indentation (smaller and faster).
+    """
+    try:
+        with lock_task_store(file_path):
+            _write_snapshot(tasks, file_path, compact=compact)
+            _discard_journal(file_path)
+            _bump_store_version(file_path)
+    except IOError as e:
+        logger.error(f"Error saving tasks to {file_path}: {e}")
+    except TypeError as e:
+        logger.error(f"Error serializing task data: {e}")
+
+def load_tasks_from_json(file_path: str) -> list[Task]:
+    """Loads a list of Task objects from a JSON file.
+
+    Args:
+        file_path: The path to the JSON file.
+
+    Returns:
+        A list of Task objects, or an empty list if the file 
+        doesn't exist or contains invalid data.
+    """
+    try:
+        return list(iter_tasks_from_json(file_path))
+    except (json.JSONDecodeError, FileNotFoundError, TypeError) as e:
+        logger.error(f"Error loading tasks from {file_path}: {e}")
+        # Optionally: backup corrupted file here
+        return []
+
+def iter_tasks_from_json(file_path: str) -> Iterator[Task]:
+    """Streams the Task objects of a JSON file (snapshot + journal) one at a time.
+
+    The top-level array is parsed incrementally, so memory stays bounded by
+    one record (plus the small journal) no matter how large the file is.
+
+    Args:
+        file_path: The path to the JSON file.
+
+    Yields:
+        Task objects in insertion order. Nothing is yielded if neither the
+        file nor a journal exists.
+
+    Raises:
+        json.JSONDecodeError, TypeError: On invalid data. Tasks yielded before
+        the error are valid.
+    """
+    # A journal may exist without a snapshot if nothing was compacted yet
+    snapshot = _iter_snapshot(file_path) if os.path.exists(file_path) else iter(())
+    changes = _read_journal_changes([_rotated_journal_path(file_path), _journal_path(file_path)])
+    return _merge_journal_changes(snapshot, changes)
+
+# --- Change Journal ---
+# In journal mode every mutation appends one JSON line to '<file>.journal':
+#   {"op": "put", "task": {...}}  -- task added or updated (full task state)
+#   {"op": "del", "id": "..."}    -- task deleted
+# Compaction renames the journal to '<file>.journal.1' (so new records go to a
+# fresh journal), folds it into the snapshot, then removes it. Replaying is
+# idempotent, so a compaction interrupted at any point loses nothing.
+
+def _journal_path(file_path: str) -> str:
+    """Returns the path of the active change journal for a task file."""
+    return f"{file_path}.journal"
+
+def _rotated_journal_path(file_path: str) -> str:
+    """Returns the path of the journal segment being compacted."""
+    return f"{file_path}.journal.1"
+
+def append_journal_record(file_path: str, record: dict) -> int:
+    """Appends a single change record to the journal of a task file.
+
+    Args:
+        file_path: The path to the JSON snapshot file.
+        record: The change record ('put' or 'del').
+
+    Returns:
+        The size of the journal in bytes after the append (0 on error).
+    """
+    return append_journal_records(file_path, [record])
+
+def append_journal_records(file_path: str, records: Iterable[dict]) -> int:
+    """Appends several change records to the journal of a task file in one write.
+
+    Args:
+        file_path: The path to the JSON snapshot file.
+        records: The change records ('put' or 'del').
+
+    Returns:
+        The size of the journal in bytes after the append (0 on error).
+    """
+    appended = _append_journal_records(file_path, records)
+    return appended[2] if appended is not None else 0
+
+def _append_journal_records(file_path: str, records: Iterable[dict]) -> Optional[tuple[int, int, int]]:
+    """Appends change records to the journal of a task file in one write.
+
+    Returns:
+        (journal inode, offset where the records start, offset where they end),
+        or None on error.
+    """
+    try:
+        lines = "".join(
+            json.dumps(record, default=_datetime_encoder, separators=(',', ':')) + "\n"
+            for record in records
+        ).encode()
+        with lock_task_store(file_path):
+            with open(_journal_path(file_path), 'ab') as f:
+                f.write(lines)
+                end = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+            _bump_store_version(file_path)
+        return inode, end - len(lines), end
+    except IOError as e:
+        logger.error(f"Error appending to journal of {file_path}: {e}")
+    except TypeError as e:
+        logger.error(f"Error serializing journal record: {e}")
+    return None
+
+def _read_journal(journal_path: str):
+    """Yields the change records stored in a journal file.
+
+    A truncated last line (e.g. from a crash mid-append) is skipped.
+    """
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, 'r') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line, object_hook=_datetime_decoder)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable journal record {journal_path}:{line_number}")
+
+def _read_journal_changes(journal_paths: list[str]) -> dict[str, Optional[Task]]:
+    """Reduces journal segments to the final state of every task they mention.
+
+    Args:
+        journal_paths: Journal segments, oldest first.
+
+    Returns:
+        Maps task UUID IDs to their latest Task, or None if the task was deleted.
+    """
+    changes: dict[str, Optional[Task]] = {}
+    for path in journal_paths:
+        _apply_journal_records(changes, _read_journal(path), path)
+    return changes
+
+def _apply_journal_records(changes: dict[str, Optional[Task]], records: Iterable[dict], path: str) -> None:
+    """Folds change records into a task UUID ID -> Task (None = deleted) dict."""
+    for record in records:
+        try:
+            op = record.get("op")
+            if op == "put":
+                task = Task(**record["task"])
+                changes[task.id] = task
+            elif op == "del":
+                changes[record["id"]] = None
+        except (KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Skipping invalid journal record in {path}: {e}")
+
+def _read_journal_tail(journal_path: str, offset: int) -> tuple[dict[str, Optional[Task]], int]:
+    """Reads only the records appended to a journal after a byte offset.
+
+    A last line that is still being written (no newline yet) is left for the next read.
+
+    Returns:
+        The changes (as returned by _read_journal_changes) and the offset just
+        after the last complete record.
+    """
+    with open(journal_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].decode().splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line, object_hook=_datetime_decoder))
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unreadable journal record in {journal_path} after byte {offset}")
+    changes: dict[str, Optional[Task]] = {}
+    _apply_journal_records(changes, records, journal_path)
+    return changes, offset + end
+
+def _journal_position(journal_path: str) -> Optional[tuple[int, int]]:
+    """Returns (inode, offset just after the last complete record) of a journal,
+    or None if it is missing. A record still being appended is not counted."""
+    try:
+        with open(journal_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start = max(0, size - _STREAM_CHUNK_SIZE) # Records are far shorter than this
+            f.seek(start)
+            return os.fstat(f.fileno()).st_ino, start + f.read(size - start).rfind(b"\n") + 1
+    except FileNotFoundError:
+        return None
+
+def _file_signature(path: str) -> Optional[tuple[int, int, int]]:
+    """Returns (inode, size, modification time in ns) of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+def _merge_journal_changes(tasks: Iterable[Task], changes: dict[str, Optional[Task]]) -> Iterator[Task]:
+    """Applies journaled changes to a stream of snapshot tasks.
+
+    Updated tasks keep their position, deleted tasks are skipped and tasks
+    added through the journal follow the snapshot tasks.
+    """
+    for task in tasks:
+        if task.id in changes:
+            task = changes.pop(task.id)
+            if task is None:
+                continue
+        yield task
+    for task in changes.values():
+        if task is not None:
+            yield task
+
+def _discard_journal(file_path: str) -> None:
+    """Removes all journal segments of a task file (after a full save)."""
+    for path in (_rotated_journal_path(file_path), _journal_path(file_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+def rotate_journal(file_path: str) -> bool:
+    """Moves the active journal aside so it can be compacted.
+
+    New records go to a fresh journal while the rotated segment is folded into
+    the snapshot. If a previous compaction was interrupted, its segment is
+    compacted first and the active journal is left in place.
+
+    Returns:
+        True if there is a rotated segment waiting to be compacted.
+    """
+    rotated = _rotated_journal_path(file_path)
+    with lock_task_store(file_path):
+        if os.path.exists(rotated):
+            return True
+        active = _journal_path(file_path)
+        if not os.path.exists(active):
+            return False
+        os.replace(active, rotated)
+    return True
+
+def _build_compacted_snapshot(file_path: str, compact: bool = False) -> Optional[tuple[str, int]]:
+    """Writes the snapshot with the rotated journal segment folded in to a temporary file.
+
+    Runs without the store lock: the snapshot is only ever replaced atomically
+    and the rotated segment is not appended to, so both can be read while
+    other writers work.
+
+    Returns:
+        (temporary file path, store version the inputs were read at), or None
+        if there is no rotated segment.
+    """
+    version = read_store_version(file_path)
+    rotated = _rotated_journal_path(file_path)
+    if not os.path.exists(rotated):
+        return None # Nothing rotated, or another process compacted it already
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)),
+                                    prefix=f"{os.path.basename(file_path)}.", suffix=".compact")
+    try:
+        tasks = _read_snapshot(file_path) if os.path.exists(file_path) else []
+        changes = _read_journal_changes([rotated])
+        with os.fdopen(fd, 'w') as f:
+            write_tasks_json(_merge_journal_changes(tasks, changes), f, compact=compact)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, version
+
+def _install_compacted_snapshot(file_path: str, tmp_path: str, version: int) -> bool:
+    """Replaces the snapshot with a compacted one, unless the store moved since it was built.
+
+    Holds the store lock only for the version check, the rename and the removal
+    of the rotated segment. Compaction bumps the store version, so a stale
+    compaction (e.g. one racing a full save) can never remove a newer segment.
+
+    Returns:
+        True if the snapshot was replaced; otherwise the temporary file is removed.
+    """
+    with lock_task_store(file_path):
+        if read_store_version(file_path) == version and os.path.exists(_rotated_journal_path(file_path)):
+            os.replace(tmp_path, file_path)
+            os.remove(_rotated_journal_path(file_path))
+            _bump_store_version(file_path)
+            return True
+    os.remove(tmp_path)
+    return False
+
+def compact_rotated_journal(file_path: str, compact: bool = False) -> None:
+    """Folds the rotated journal segment into the snapshot and removes it.
+
+    Only the on-disk snapshot and rotated segment are read, so this can safely
+    run on a background thread. The new snapshot is built without the store
+    lock; if another writer bumps the store version meanwhile it is rebuilt
+    (up to COMPACTION_ATTEMPTS times, after which the segment is left for the
+    next compaction).
+
+    Args:
+        file_path: The path to the JSON snapshot file.
+        compact: If True, write the snapshot without indentation.
+    """
+    try:
+        for _ in range(COMPACTION_ATTEMPTS):
+            built = _build_compacted_snapshot(file_path, compact)
+            if built is None or _install_compacted_snapshot(file_path, *built):
+                return
+    except (json.JSONDecodeError, KeyError, TypeError, IOError) as e:
+        logger.error(f"Error compacting journal of {file_path}: {e}")
+
+def compact_journal(file_path: str) -> None:
+    """Synchronously folds the whole journal of a task file into its snapshot."""
+    while rotate_journal(file_path):
+        compact_rotated_journal(file_path)
+        if os.path.exists(_rotated_journal_path(file_path)):
+            break # Compaction failed (already logged); keep the segment for replay
+
+# --- Storage Backends ---
+
+class JsonFileStorage:
+    """The default TaskStorage: a JSON snapshot file, optionally with a change journal.
+
+    Without a journal every save rewrites the whole file. In journal mode each
+    change appends one record to the sidecar journal, and the journal is folded
+    into the snapshot on a background thread once it passes a size threshold.
+
+    The storage remembers which version of the files it last read or wrote, so
+    read_external_changes() can tell writes by other processes from its own.
+    Writes hold the store lock (see lock_task_store) and bump the store version.
+    """
+
+    def __init__(self, file_path: str = "tasks.json", journal: bool = False,
+                 journal_compact_bytes: int = DEFAULT_JOURNAL_COMPACT_BYTES,
+                 compact: bool = False):
+        """Initializes the storage.
+
+        Args:
+            file_path: The path to the JSON snapshot file.
+            journal: If True, changes are appended to '<file_path>.journal'.
+            journal_compact_bytes: Journal size that triggers a background compaction.
+            compact: If True, snapshots are written without indentation.
+        """
+        self.file_path = file_path
+        self.journal = journal
+        self.journal_compact_bytes = journal_compact_bytes
+        self.compact = compact
+        self._compaction_thread: Optional[threading.Thread] = None
+        # Version of the files last read or written by this storage: the store
+        # version, the snapshot's signature, and the journal's (inode, offset up
+        # to which it was read)
+        self._seen_version = 0
+        self._seen_snapshot: Optional[tuple[int, int, int]] = None
+        self._seen_journal: Optional[tuple[int, int]] = None
+        self._seen_lock = threading.Lock() # Also updated by the compaction thread
+
+    @property
+    def incremental(self) -> bool:
+        """Only journal mode can persist individual changes."""
+        return self.journal
+
+    @property
+    def watch_paths(self) -> tuple[str, ...]:
+        """The files whose changes read_external_changes() looks for."""
+        return self.file_path, _journal_path(self.file_path), _rotated_journal_path(self.file_path)
+
+    @property
+    def version(self) -> int:
+        """The current store version (bumped by every write, from any process)."""
+        return read_store_version(self.file_path)
+
+    def lock(self):
+        """Returns a context manager holding the store's inter-process write lock."""
+        return lock_task_store(self.file_path)
+
+    def load(self) -> list[Task]:
+        """Loads the snapshot and replays the journal."""
+        self._remember_files()
+        return load_tasks_from_json(self.file_path)
+
+    def iter_load(self) -> Iterator[Task]:
+        """Streams the snapshot (with the journal applied) one task at a time."""
+        self._remember_files()
+        return iter_tasks_from_json(self.file_path)
+
+    def save_all(self, tasks: list[Task]) -> None:
+        """Rewrites the whole snapshot (discarding the journal)."""
+        with self.lock():
+            if self.compact:
+                save_tasks_to_json(tasks, self.file_path, compact=True)
+            else:
+                save_tasks_to_json(tasks, self.file_path)
+            with self._seen_lock:
+                self._seen_version = read_store_version(self.file_path)
+                self._seen_snapshot = _file_signature(self.file_path)
+                self._seen_journal = None
+
+    def save_changes(self, changes: list[TaskChange]) -> None:
+        """Appends one journal record per change, compacting when the journal grows too big."""
+        records = []
+        for task_id, task in changes:
+            if task is not None:
+                records.append({"op": "put", "task": task_to_dict(task)})
+            else:
+                records.append({"op": "del", "id": task_id})
+        with self.lock():
+            appended = _append_journal_records(self.file_path, records)
+            if appended is None:
+                return
+            inode, start, end = appended
+            with self._seen_lock:
+                # Skip our own records, unless another process appended before them
+                if self._seen_journal == (inode, start) or (self._seen_journal is None and start == 0):
+                    self._seen_journal = (inode, end)
+                    self._seen_version = read_store_version(self.file_path)
+        if end >= self.journal_compact_bytes:
+            self._start_compaction()
+
+    def read_external_changes(self, if_version_changed: bool = False) -> Optional[ExternalChanges]:
+        """Returns the changes other processes made to the files since this storage
+        last read or wrote them, or None if there are none.
+
+        Records appended to the journal are read incrementally from where reading
+        stopped last time (following the journal into its rotated segment). A
+        replaced or rewritten snapshot can only be re-read in full.
+
+        Args:
+            if_version_changed: Only look at the files if the store version moved
+                                since they were last read or written (call with
+                                the store lock held; unversioned edits are missed).
+
+        Raises:
+            json.JSONDecodeError, TypeError, FileNotFoundError: If the files cannot
+                be read (e.g. a non-atomic writer is half-way); nothing is marked read.
+        """
+        version = read_store_version(self.file_path)
+        with self._seen_lock:
+            if if_version_changed and version == self._seen_version:
+                return None
+            seen_snapshot, seen_journal = self._seen_snapshot, self._seen_journal
+        changes = self._read_changes(seen_snapshot, seen_journal)
+        with self._seen_lock:
+            self._seen_version = max(self._seen_version, version)
+        return changes
+
+    def _read_changes(self, seen_snapshot: Optional[tuple[int, int, int]],
+                      seen_journal: Optional[tuple[int, int]]) -> Optional[ExternalChanges]:
+        """Reads what changed in the files since they were at the given versions."""
+        snapshot = _file_signature(self.file_path)
+        if snapshot != seen_snapshot:
+            return self._reread_files()
+        journal = _file_signature(_journal_path(self.file_path))
+        if journal is not None and seen_journal is not None and journal[0] == seen_journal[0]:
+            if journal[1] == seen_journal[1]:
+                return None # Nothing appended
+            if journal[1] < seen_journal[1]:
+                return self._reread_files() # Truncated in place
+            changes, offset = _read_journal_tail(_journal_path(self.file_path), seen_journal[1])
+            self._advance_journal(seen_journal, (journal[0], offset))
+            return ExternalChanges(changes) if changes else None
+        # The journal read so far (if any) was rotated away: finish it from the
+        # rotated segment, then start on the new journal
+        changes: dict[str, Optional[Task]] = {}
+        rotated = _file_signature(_rotated_journal_path(self.file_path))
+        if seen_journal is not None:
+            if rotated is None or rotated[0] != seen_journal[0]:
+                return self._reread_files() # Already compacted into a snapshot
+            changes, _ = _read_journal_tail(_rotated_journal_path(self.file_path), seen_journal[1])
+        elif rotated is not None:
+            # Created and rotated since we last looked (replaying it again is harmless)
+            changes, _ = _read_journal_tail(_rotated_journal_path(self.file_path), 0)
+        new_seen = None
+        if journal is not None:
+            new_changes, offset = _read_journal_tail(_journal_path(self.file_path), 0)
+            changes.update(new_changes)
+            new_seen = (journal[0], offset)
+        self._advance_journal(seen_journal, new_seen)
+        return ExternalChanges(changes) if changes else None
+
+    def _remember_files(self) -> None:
+        """Records the current version of the files as read (before reading them,
+        so a change made while they are read is picked up again later)."""
+        with self._seen_lock:
+            self._seen_version = read_store_version(self.file_path)
+            self._seen_snapshot = _file_signature(self.file_path)
+            self._seen_journal = _journal_position(_journal_path(self.file_path))
+
+    def _advance_journal(self, expected: Optional[tuple[int, int]], seen: Optional[tuple[int, int]]) -> None:
+        """Moves the journal read position, unless our own save moved it meanwhile."""
+        with self._seen_lock:
+            if self._seen_journal == expected:
+                self._seen_journal = seen
+
+    def _reread_files(self) -> Optional[ExternalChanges]:
+        """Re-reads every stored task (the snapshot was replaced or rewritten)."""
+        if not os.path.exists(self.file_path) and not os.path.exists(_journal_path(self.file_path)):
+            # A missing store is never taken to mean "everything was deleted"
+            self._remember_files()
+            return None
+        with self._seen_lock:
+            expected = self._seen_snapshot, self._seen_journal
+        snapshot = _file_signature(self.file_path)
+        journal = _journal_position(_journal_path(self.file_path))
+        tasks = {task.id: task for task in iter_tasks_from_json(self.file_path)}
+        with self._seen_lock:
+            if (self._seen_snapshot, self._seen_journal) == expected:
+                self._seen_snapshot, self._seen_journal = snapshot, journal
+        return ExternalChanges(tasks, complete=True)
+
+    def close(self) -> None:
+        """Waits for a running background compaction."""
+        self.wait_for_compaction()
+
+    def _start_compaction(self) -> None:
+        """Rotates the journal and folds it into the snapshot on a background thread."""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return # A compaction is already running; it will be picked up next time
+        with self.lock(), self._seen_lock:
+            if not rotate_journal(self.file_path):
+                return
+            rotated = _file_signature(_rotated_journal_path(self.file_path))
+            if rotated is not None and self._seen_journal == (rotated[0], rotated[1]):
+                self._seen_journal = None # Read to the end; the next journal starts fresh
+        self._compaction_thread = threading.Thread(
+            target=self._compact_rotated_journal, name="task-journal-compactor", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def _compact_rotated_journal(self) -> None:
+        """Runs the compaction, recording the snapshot it writes as our own.
+
+        The snapshot is built without the store lock; the lock is only held to
+        install it, so writers in this and other processes keep going meanwhile.
+        """
+        try:
+            for _ in range(COMPACTION_ATTEMPTS):
+                built = _build_compacted_snapshot(self.file_path, self.compact)
+                if built is None:
+                    return
+                with self.lock(): # No other writer can slip in between
+                    before = _file_signature(self.file_path), read_store_version(self.file_path)
+                    if not _install_compacted_snapshot(self.file_path, *built):
+                        continue
+                    with self._seen_lock:
+                        if (self._seen_snapshot, self._seen_version) == before:
+                            self._seen_snapshot = _file_signature(self.file_path)
+                            self._seen_version = read_store_version(self.file_path)
+                    return
+        except (json.JSONDecodeError, KeyError, TypeError, IOError) as e:
+            logger.error(f"Error compacting journal of {self.file_path}: {e}")
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Blocks until a running background compaction (if any) has finished."""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join(timeout)
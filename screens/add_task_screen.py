@@ -4,9 +4,10 @@ from textual.app import ComposeResult
 from textual.containers import Container 
 from textual.screen import ModalScreen 
 from textual.widgets import Input, Button, Label, Select # Import Select
-from typing import Optional, Dict, List, Tuple, Any # Import List, Tuple, Any
+from typing import Optional, Dict, Tuple, Any # Import Tuple, Any
 
-from AI_Pair_Programming_Task_Manager import Task # Import Task for type hinting
+from AI_Pair_Programming_Task_Manager import TaskManager
+from screens.parent_picker import ParentPicker # Type-ahead, paged parent selection
 
 # Define options for Select widgets (copied from EditTaskScreen for independence)
 # Could potentially be moved to a shared constants file later
@@ -19,7 +20,6 @@ PRIORITY_OPTIONS: list[tuple[str, str]] = [
 TYPE_OPTIONS: list[tuple[str, str]] = [
     ("Epic", "Epic"), ("Story", "Story"), ("Task", "Task"), ("Bug", "Bug"),
 ]
-NO_PARENT_VALUE = "__NONE__"
 
 class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type hint
     """Screen with a form to add a new task.
@@ -34,6 +34,7 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
         height: auto;
         max-width: 80%;
         max-height: 80%;
+        overflow-y: auto; /* Scroll the form on short terminals */
         border: thick $accent;
         padding: 1 2;
         background: $panel;
@@ -43,8 +44,9 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
     }
     #add-task-buttons {
         margin-top: 1;
-        align: center;
+        align-horizontal: center;
         width: 100%;
+        height: auto;
     }
     #add-task-buttons Button {
         margin-left: 1;
@@ -55,22 +57,14 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
     }
     """
 
-    def __init__(self, all_tasks: List[Task]) -> None:
+    def __init__(self, task_manager: TaskManager) -> None:
         """Initialize the add screen.
         
         Args:
-            all_tasks: List of all current tasks (for parent selection).
+            task_manager: The TaskManager parent candidates are searched in.
         """
         super().__init__()
-        self.all_tasks = all_tasks
-        # Prepare parent options
-        self.parent_options: list[tuple[str, str]] = [
-            ("(No Parent)", NO_PARENT_VALUE)
-        ]
-        self.parent_options.extend(
-            (f"{t.id[:4]}...: {t.title}", t.id)
-            for t in self.all_tasks
-        )
+        self.task_manager = task_manager
 
     def compose(self) -> ComposeResult:
         with Container(id="add-task-dialog"):
@@ -84,7 +78,7 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
             yield Label("Type:")
             yield Select(options=TYPE_OPTIONS, value="Task", id="add-task-select-type") # Default: Task
             yield Label("Parent Task:")
-            yield Select(options=self.parent_options, value=NO_PARENT_VALUE, id="add-task-select-parent") # Default: No Parent
+            yield ParentPicker(self.task_manager, id="add-task-parent") # Default: No Parent
             
             with Container(id="add-task-buttons"):
                 yield Button("Save", variant="primary", id="add-task-save")
@@ -104,7 +98,6 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
             status_select = self.query_one("#add-task-select-status", Select)
             priority_select = self.query_one("#add-task-select-priority", Select)
             type_select = self.query_one("#add-task-select-type", Select)
-            parent_select = self.query_one("#add-task-select-parent", Select)
             
             if not title_input.value:
                 self.app.bell()
@@ -113,14 +106,12 @@ class AddTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type
                 return
 
             # Basic check for selects - assumes they have a value if options exist
-            if status_select.value is None or priority_select.value is None or type_select.value is None or parent_select.value is None:
+            if status_select.value is None or priority_select.value is None or type_select.value is None:
                 self.app.bell()
                 self.app.notify("A selection value is missing. Please ensure all dropdowns are set.", severity="error", title="Validation Error")
                 return
                 
-            # Get parent ID, handling NO_PARENT_VALUE
-            selected_parent_id = parent_select.value
-            parent_id = selected_parent_id if selected_parent_id != NO_PARENT_VALUE else None
+            parent_id = self.query_one("#add-task-parent", ParentPicker).value # None = no parent
 
             new_task_details = {
                 "title": title_input.value,
@@ -0,0 +1,106 @@
+"""Modal screen for changing several marked tasks at once."""
+
+from typing import Any, Dict, Optional
+
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import Button, Checkbox, Label, Select
+
+from AI_Pair_Programming_Task_Manager import TaskManager
+from screens.edit_task_screen import STATUS_OPTIONS, PRIORITY_OPTIONS, TYPE_OPTIONS
+from screens.parent_picker import ParentPicker
+
+class BulkEditScreen(ModalScreen[Optional[Dict[str, Any]]]):
+    """A modal screen setting the status, priority, type and/or parent of many tasks.
+
+    Fields left at "(unchanged)" keep each task's own value; the parent is
+    only changed when "Change parent" is ticked. Dismisses with the updates
+    shared by every marked task (e.g. {"status": "Done"}), or None if cancelled.
+    """
+
+    DEFAULT_CSS = """
+    BulkEditScreen > Container {
+        width: auto;
+        height: auto;
+        max-width: 80%;
+        max-height: 80%;
+        overflow-y: auto; /* Scroll the form on short terminals */
+        border: thick $accent;
+        padding: 1 2;
+        background: $panel;
+    }
+    #bulk-edit-dialog > * {
+        margin-bottom: 1;
+    }
+    #bulk-edit-buttons {
+        margin-top: 1;
+        align-horizontal: center;
+        width: 100%;
+        height: auto;
+    }
+    #bulk-edit-buttons Button {
+        margin-left: 1;
+        margin-right: 1;
+    }
+    Select {
+        width: 100%; /* Make selects take full width */
+    }
+    """
+
+    def __init__(self, task_count: int, task_manager: TaskManager) -> None:
+        """Initialize the bulk edit screen.
+
+        Args:
+            task_count: The number of marked tasks, shown in the title.
+            task_manager: The TaskManager parent candidates are searched in.
+        """
+        super().__init__()
+        self.task_count = task_count
+        self.task_manager = task_manager
+
+    def compose(self) -> ComposeResult:
+        """Create the UI widgets for the bulk edit form."""
+        with Container(id="bulk-edit-dialog"):
+            yield Label(f"Edit {self.task_count} Marked Tasks", id="bulk-edit-title")
+            yield Label("Status:")
+            yield Select(options=STATUS_OPTIONS, prompt="(unchanged)", id="bulk-edit-select-status")
+            yield Label("Priority:")
+            yield Select(options=PRIORITY_OPTIONS, prompt="(unchanged)", id="bulk-edit-select-priority")
+            yield Label("Type:")
+            yield Select(options=TYPE_OPTIONS, prompt="(unchanged)", id="bulk-edit-select-type")
+            yield Checkbox("Change parent", id="bulk-edit-change-parent")
+            yield ParentPicker(self.task_manager, id="bulk-edit-parent")
+
+            with Container(id="bulk-edit-buttons"):
+                yield Button("Apply", variant="primary", id="bulk-edit-apply")
+                yield Button("Cancel", id="bulk-edit-cancel")
+
+    def on_mount(self) -> None:
+        """Focus the status select when the screen is mounted."""
+        self.query_one("#bulk-edit-parent", ParentPicker).disabled = True # Until "Change parent" is ticked
+        self.query_one("#bulk-edit-select-status", Select).focus()
+
+    def on_checkbox_changed(self, event: Checkbox.Changed) -> None:
+        """Enables the parent picker while "Change parent" is ticked."""
+        self.query_one("#bulk-edit-parent", ParentPicker).disabled = not event.value
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button presses for apply or cancel."""
+        if event.button.id == "bulk-edit-cancel":
+            self.dismiss(None) # Indicate cancellation
+        elif event.button.id == "bulk-edit-apply":
+            updates: Dict[str, Any] = {}
+            for field_name, select_id in (("status", "#bulk-edit-select-status"),
+                                          ("priority", "#bulk-edit-select-priority"),
+                                          ("task_type", "#bulk-edit-select-type")):
+                value = self.query_one(select_id, Select).value
+                if value != Select.NULL:
+                    updates[field_name] = value
+            if self.query_one("#bulk-edit-change-parent", Checkbox).value:
+                updates["parent_id"] = self.query_one("#bulk-edit-parent", ParentPicker).value # None = no parent
+            if not updates:
+                self.app.bell()
+                self.app.notify("Choose at least one field to change.", severity="warning")
+                return # Prevent dismissal
+            self.dismiss(updates)
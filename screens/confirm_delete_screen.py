@@ -5,15 +5,20 @@ from textual.widgets import Button, Label
 
 # --- Confirm Delete Screen ---
 class ConfirmDeleteScreen(ModalScreen[bool]): # Return bool on dismiss
-    """Screen to confirm deleting a task."""
+    """Screen to confirm deleting a task (or several marked tasks)."""
 
-    def __init__(self, task_title: str) -> None:
+    def __init__(self, task_title: str, task_count: int = 1) -> None:
         super().__init__()
         self.task_title = task_title
+        self.task_count = task_count
 
     def compose(self) -> ComposeResult:
+        if self.task_count > 1:
+            question = f"Really delete {self.task_count} marked tasks?"
+        else:
+            question = f"Really delete task '{self.task_title}'?"
         yield Container(
-            Label(f"Really delete task '{self.task_title}'?"),
+            Label(question),
             Container(
                 Button("Delete", variant="error", id="delete-confirm"),
                 Button("Cancel", id="delete-cancel"),
@@ -26,4 +31,4 @@ class ConfirmDeleteScreen(ModalScreen[bool]): # Return bool on dismiss
         if event.button.id == "delete-confirm":
             self.dismiss(True) # Confirm deletion
         else:
-            self.dismiss(False) # Cancel deletion 
\ No newline at end of file
+            self.dismiss(False) # Cancel deletion
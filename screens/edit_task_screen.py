@@ -6,7 +6,8 @@ from textual.screen import ModalScreen
 from textual.widgets import Input, Button, Label, Select # Import Select
 from typing import Optional, Dict, Tuple, Any, List # Import List
 
-from AI_Pair_Programming_Task_Manager import Task # Import Task for type hinting
+from AI_Pair_Programming_Task_Manager import Task, TaskManager # Import Task for type hinting
+from screens.parent_picker import ParentPicker # Type-ahead, paged parent selection
 
 # Define options for Select widgets based on Task Literals
 # (Text, Value) - Text is displayed, Value is stored/returned
@@ -31,9 +32,6 @@ TYPE_OPTIONS: list[tuple[str, str]] = [
     ("Bug", "Bug"),
 ]
 
-# Define a constant for the 'no parent' value
-NO_PARENT_VALUE = "__NONE__"
-
 class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return type hint
     """A modal screen for editing the details of an existing task.
 
@@ -47,6 +45,7 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
         height: auto;
         max-width: 80%;
         max-height: 80%;
+        overflow-y: auto; /* Scroll the form on short terminals */
         border: thick $accent;
         padding: 1 2;
         background: $panel;
@@ -58,6 +57,7 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
         margin-top: 1;
         align-horizontal: center;
         width: 100%;
+        height: auto;
     }
     #edit-task-buttons Button {
         margin-left: 1;
@@ -68,33 +68,19 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
     }
     """ # Basic styling for the modal
 
-    def __init__(self, task_to_edit: Task, all_tasks: List[Task]) -> None:
+    def __init__(self, task_to_edit: Task, task_manager: TaskManager) -> None:
         """Initialize the edit screen.
 
         Args:
             task_to_edit: The Task object to be edited.
-            all_tasks: A list of all tasks (used for parent selection).
+            task_manager: The TaskManager parent candidates are searched in.
         """
         super().__init__()
         self.task_to_edit = task_to_edit # Store the task object
-        self.all_tasks = all_tasks # Store all tasks for parent selection
-        
-        # Prepare parent options, excluding the task itself
-        self.parent_options: list[tuple[str, str]] = [
-            ("(No Parent)", NO_PARENT_VALUE) # Special value for no parent
-        ]
-        self.parent_options.extend(
-            (f"[{t.display_id}] {t.title}", t.id) # Display [display_id] and title, store UUID
-            for t in self.all_tasks 
-            if t.id != self.task_to_edit.id # Cannot be its own parent
-            # TODO: Add check for circular dependency later if needed
-        )
+        self.task_manager = task_manager
 
     def compose(self) -> ComposeResult:
         """Create the UI widgets for the edit form."""
-        # Determine the initial value for parent Select
-        current_parent_id = self.task_to_edit.parent_id if self.task_to_edit.parent_id else NO_PARENT_VALUE
-        
         # Prefill inputs with existing task data
         with Container(id="edit-task-dialog"):
             yield Label("Edit Task", id="edit-task-title")
@@ -107,7 +93,9 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
             yield Label("Type:")
             yield Select(options=TYPE_OPTIONS, value=self.task_to_edit.task_type, id="edit-task-select-type")
             yield Label("Parent Task:")
-            yield Select(options=self.parent_options, value=current_parent_id, id="edit-task-select-parent")
+            # The task itself and its descendants are never offered as its parent
+            yield ParentPicker(self.task_manager, value=self.task_to_edit.parent_id,
+                               exclude_subtree_of=self.task_to_edit.id, id="edit-task-parent")
             
             with Container(id="edit-task-buttons"):
                 yield Button("Save", variant="primary", id="edit-task-save")
@@ -131,7 +119,6 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
             status_select = self.query_one("#edit-task-select-status", Select)
             priority_select = self.query_one("#edit-task-select-priority", Select)
             type_select = self.query_one("#edit-task-select-type", Select)
-            parent_select = self.query_one("#edit-task-select-parent", Select)
             
             if not title_input.value:
                 # TODO: Provide better feedback (e.g., highlight input)
@@ -141,15 +128,13 @@ class EditTaskScreen(ModalScreen[Optional[Dict[str, Any]]]): # Update return typ
                 return # Prevent dismissal
                 
             # Ensure Select widgets have values (should always have one if options exist)
-            if status_select.value is None or priority_select.value is None or type_select.value is None or parent_select.value is None:
+            if status_select.value is None or priority_select.value is None or type_select.value is None:
                  self.app.bell()
                  self.app.notify("A selection value is missing. Please ensure all dropdowns are set.", severity="error", title="Validation Error")
                  # Optionally focus the first problematic Select
                  return # Prevent dismissal
 
-            # Get parent ID, converting our special value back to None
-            selected_parent_id = parent_select.value
-            parent_id = selected_parent_id if selected_parent_id != NO_PARENT_VALUE else None
+            parent_id = self.query_one("#edit-task-parent", ParentPicker).value # None = no parent
 
             updated_task_details = {
                 "title": title_input.value,
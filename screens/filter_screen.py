@@ -0,0 +1,107 @@
+"""Modal screen for combining task filters (status, priority and type)."""
+
+from typing import Dict, Optional, Tuple, Any
+
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Label, Select, SelectionList
+
+from AI_Pair_Programming_Task_Manager import TASK_STATUSES, TASK_PRIORITIES, TASK_TYPES
+
+ANY_TYPE_VALUE = "__ANY__"
+
+class FilterScreen(ModalScreen[Optional[Dict[str, Any]]]):
+    """Screen to pick the statuses, priorities and type shown in the task list.
+
+    Several statuses or priorities can be ticked at once (e.g. High + Critical).
+    Dismisses with {"status": tuple, "priority": tuple, "task_type": str or None},
+    where an empty tuple or None means "any", or None if cancelled.
+    """
+
+    DEFAULT_CSS = """
+    FilterScreen > Container {
+        width: auto;
+        height: auto;
+        max-width: 80%;
+        max-height: 80%;
+        border: thick $accent;
+        padding: 1 2;
+        background: $panel;
+    }
+    #filter-lists {
+        height: auto;
+    }
+    #filter-lists SelectionList {
+        width: 24;
+        height: auto;
+        margin-right: 1;
+    }
+    #filter-buttons {
+        margin-top: 1;
+        align-horizontal: center;
+        width: 100%;
+        height: auto;
+    }
+    #filter-buttons Button {
+        margin-left: 1;
+        margin-right: 1;
+    }
+    """
+
+    def __init__(self, statuses: Tuple[str, ...] = (), priorities: Tuple[str, ...] = (),
+                 task_type: Optional[str] = None) -> None:
+        """Initialize the filter screen with the filters currently applied.
+
+        Args:
+            statuses: The statuses currently shown (empty = all).
+            priorities: The priorities currently shown (empty = all).
+            task_type: The task type currently shown (None = all).
+        """
+        super().__init__()
+        self.statuses = statuses
+        self.priorities = priorities
+        self.task_type = task_type
+
+    def compose(self) -> ComposeResult:
+        with Container(id="filter-dialog"):
+            yield Label("Filter Tasks (nothing ticked = any)", id="filter-title")
+            with Horizontal(id="filter-lists"):
+                yield SelectionList[str](
+                    *((status, status, status in self.statuses) for status in TASK_STATUSES),
+                    id="filter-status",
+                )
+                yield SelectionList[str](
+                    *((priority, priority, priority in self.priorities) for priority in TASK_PRIORITIES),
+                    id="filter-priority",
+                )
+            yield Label("Type:")
+            yield Select(options=[("Any type", ANY_TYPE_VALUE)] + [(task_type, task_type) for task_type in TASK_TYPES],
+                         value=self.task_type or ANY_TYPE_VALUE, allow_blank=False, id="filter-type")
+            with Container(id="filter-buttons"):
+                yield Button("Apply", variant="primary", id="filter-apply")
+                yield Button("Clear", id="filter-clear")
+                yield Button("Cancel", id="filter-cancel")
+
+    def on_mount(self) -> None:
+        """Set the list titles and focus the status list on mount."""
+        self.query_one("#filter-status", SelectionList).border_title = "Status"
+        self.query_one("#filter-priority", SelectionList).border_title = "Priority"
+        self.query_one("#filter-status", SelectionList).focus()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle button presses."""
+        if event.button.id == "filter-cancel":
+            self.dismiss(None) # Keep the current filters
+        elif event.button.id == "filter-clear":
+            self.dismiss({"status": (), "priority": (), "task_type": None})
+        elif event.button.id == "filter-apply":
+            task_type = self.query_one("#filter-type", Select).value
+            self.dismiss({
+                # Keep the workflow order regardless of the order things were ticked in
+                "status": tuple(status for status in TASK_STATUSES
+                                if status in self.query_one("#filter-status", SelectionList).selected),
+                "priority": tuple(priority for priority in TASK_PRIORITIES
+                                  if priority in self.query_one("#filter-priority", SelectionList).selected),
+                "task_type": None if task_type == ANY_TYPE_VALUE else task_type,
+            })
@@ -1,9 +1,11 @@
 from textual.renderables.styled import Styled
 from textual.color import Color # Keep Color import if needed for more complex styling
-from textual.widgets import DataTable # Import DataTable
 from textual.app import App # Import App
+from textual.content import Content
 from AI_Pair_Programming_Task_Manager import Task, TaskManager # Import TaskManager
-from typing import List, Optional, TYPE_CHECKING, Dict, Set
+from typing import List, Optional, TYPE_CHECKING, Tuple
+from collections import OrderedDict
+from datetime import datetime
 import logging
 
 # Avoid circular import for type hints
@@ -35,228 +37,225 @@ def style_status(status: str) -> str:
     else:
         return status # Return plain status if no style defined
 
-def _add_rows_recursively(
-    table: DataTable, 
-    parent_id: Optional[str], 
-    tasks_by_parent: Dict[Optional[str], List[Task]],
-    tasks_by_id: Dict[str, Task],
-    added_keys: Set[str],
-    level: int = 0
-) -> None:
-    """Recursively adds task rows to the table, indenting children.
-    
+# Task fields are substituted as $variables, so markup-like text in them is shown literally
+TASK_DETAILS_MARKUP = (
+    "[b]ID:[/b] $id\n"
+    "[b]Title:[/b] $title\n"
+    "[b]Status:[/b] $status\n"
+    "[b]Priority:[/b] $priority\n"
+    "[b]Type:[/b] $task_type\n"
+    "[b]Created:[/b] $created\n"
+    "[b]Updated:[/b] $updated\n\n"
+    "[b]Description:[/b]\n$description"
+)
+
+def render_task_details(task: Task) -> Content:
+    """Renders the details view content for a task.
+
     Args:
-        table: The DataTable to add rows to.
-        parent_id: The ID of the parent task whose children should be added.
-        tasks_by_parent: Dictionary mapping parent IDs to lists of child Tasks.
-        tasks_by_id: Dictionary mapping task IDs to Task objects.
-        added_keys: Set of task IDs already added to the table (to prevent duplicates).
-        level: The current depth in the hierarchy for indentation.
+        task: The task to describe.
+
+    Returns:
+        The parsed content, ready for Static.update().
     """
-    children = tasks_by_parent.get(parent_id, [])
-    indent = "  " * level # Two spaces per level
-    for task in sorted(children, key=lambda t: t.created_at): # Sort children, e.g., by creation time
-        if task.id not in added_keys:
-            # Add the row with indented title
-            table.add_row(
-                task.display_id, # Display the sequential ID
-                f"{indent}{task.title}", # Indented title
-                style_status(task.status),
-                task.priority, 
-                task.task_type,
-                key=task.id # KEY remains the UUID
-            )
-            added_keys.add(task.id)
-            # Recursively add children of this task
-            _add_rows_recursively(table, task.id, tasks_by_parent, tasks_by_id, added_keys, level + 1)
+    return Content.from_markup(
+        TASK_DETAILS_MARKUP,
+        id=task.id, title=task.title, status=task.status, priority=task.priority,
+        task_type=task.task_type, description=task.description,
+        created=task.created_at.strftime('%Y-%m-%d %H:%M'),
+        updated=task.updated_at.strftime('%Y-%m-%d %H:%M'),
+    )
 
-def refresh_task_table(table: DataTable, tasks: List[Task], filter_type: Optional[str] = None) -> None:
-    """Clears and re-populates the task table hierarchically based on parent_id.
-    
-    Handles building the tree, adding rows recursively with indentation, 
-    applying basic filtering, and restoring cursor position.
+class TaskDetailsCache:
+    """Bounded LRU cache of rendered task details, keyed on (task ID, updated_at).
+
+    Every update_task() bumps updated_at, so an edited task misses the cache
+    and is rendered again while unchanged tasks are rendered only once.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """Initializes an empty cache.
+
+        Args:
+            maxsize: The number of rendered tasks kept; the least recently used are dropped.
+        """
+        self.maxsize = maxsize
+        self._rendered: "OrderedDict[Tuple[str, datetime], Content]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._rendered)
+
+    def render(self, task: Task) -> Content:
+        """Returns the rendered details of a task, rendering them only on a cache miss."""
+        key = (task.id, task.updated_at)
+        content = self._rendered.get(key)
+        if content is not None:
+            self._rendered.move_to_end(key)
+            return content
+        content = self._rendered[key] = render_task_details(task)
+        if len(self._rendered) > self.maxsize:
+            self._rendered.popitem(last=False) # Evict the least recently used
+        return content
+
+def task_row_cells(task: Task, level: int = 0, dimmed: bool = False) -> tuple:
+    """Returns the task list cells (ID, Title, Status, Priority, Type) for a task.
 
     Args:
-        table: The DataTable widget to update.
-        tasks: The list of ALL Task objects.
-        filter_type: Optional task type string to filter by (applied AFTER hierarchy).
+        task: The task to display.
+        level: Its depth in the hierarchy, used to indent the title.
+        dimmed: Render the row dimmed (an ancestor shown only for context).
     """
-    
-    # --- Build Tree Structure --- 
-    tasks_by_id: Dict[str, Task] = {task.id: task for task in tasks}
-    tasks_by_parent: Dict[Optional[str], List[Task]] = {}
-    root_tasks: List[Task] = []
-    
-    for task in tasks:
-        parent_id = task.parent_id
-        if parent_id not in tasks_by_parent:
-            tasks_by_parent[parent_id] = []
-        tasks_by_parent[parent_id].append(task)
-        # Check if it's a root task (no parent ID or parent doesn't exist)
-        # Note: This handles orphaned tasks gracefully
-        if parent_id is None or parent_id not in tasks_by_id:
-             root_tasks.append(task)
-             # If an orphan had parent_id set, ensure it's treated as root
-             if parent_id is not None:
-                 task.parent_id = None # Correct the data structure in memory for hierarchy building
-                 if parent_id in tasks_by_parent:
-                     # Clean up tasks_by_parent if orphan was moved
-                     tasks_by_parent[parent_id] = [t for t in tasks_by_parent[parent_id] if t.id != task.id]
-                     if not tasks_by_parent[parent_id]:
-                         del tasks_by_parent[parent_id]
-                 # Add to None parent list if not already there implicitly
-                 if None not in tasks_by_parent: tasks_by_parent[None] = []
-                 if task not in tasks_by_parent[None]: tasks_by_parent[None].append(task)
-                 
-    # --- Populate Table --- 
-    current_cursor_row_key = None
-    current_cursor_col = 0 # Default to column 0
-    if table.row_count > 0 and table.cursor_coordinate and table.is_valid_coordinate(table.cursor_coordinate):
-         try:
-             current_cursor_row_key = table.get_row_at(table.cursor_coordinate.row)[0] # Get ID from first column
-             current_cursor_col = table.cursor_coordinate.column # Store previous column
-         except (IndexError, RowDoesNotExist):
-             current_cursor_row_key = None 
-             current_cursor_col = 0
-             
-    table.clear()
-    added_keys: Set[str] = set()
-    _add_rows_recursively(table, None, tasks_by_parent, tasks_by_id, added_keys, level=0)
-    
-    # --- Filtering (Simple Approach) ---
-    # This simple filter removes rows that don't match, potentially breaking visual hierarchy.
-    # A better approach would involve greying out non-matching rows or filtering 
-    # the initial `tasks` list while preserving ancestors of matching tasks.
-    if filter_type:
-        rows_to_remove = []
-        for row_key in list(table.rows.keys()): # Iterate over copy of keys
-            task = tasks_by_id.get(str(row_key))
-            if task and task.task_type != filter_type:
-                rows_to_remove.append(row_key)
-        for key in rows_to_remove:
-            if key in table.rows:
-                 table.remove_row(key)
-                 if key in added_keys:
-                      added_keys.remove(key)
+    indent = "  " * level # Two spaces per level
+    cells = (
+        task.display_id, # Display the sequential ID
+        f"{indent}{task.title}", # Indented title
+        style_status(task.status),
+        task.priority,
+        task.task_type,
+    )
+    if dimmed:
+        return tuple(f"[dim]{cell}[/dim]" for cell in cells)
+    return cells
 
-    # --- Restore Cursor --- 
-    new_cursor_row_index = None
-    if current_cursor_row_key and current_cursor_row_key in added_keys:
-        try:
-            new_cursor_row_index = table.get_row_index(current_cursor_row_key)
-        except KeyError:
-             new_cursor_row_index = None 
-             
-    if new_cursor_row_index is not None:
-        # Restore previous row and column (or default to 0)
-        table.cursor_coordinate = (new_cursor_row_index, max(0, current_cursor_col)) # Use stored/default column
-    elif table.row_count > 0:
-        # Move to first row if previous selection is gone or invalid
-        table.cursor_coordinate = (0, max(0, current_cursor_col)) # Use stored/default column
-        
-    # print(f"Refreshed table hierarchically. Displaying {len(added_keys)} tasks (Filter: {filter_type or 'All'})")
+def _cycle_field(task_manager: TaskManager, task_id: str, field_name: str,
+                 cycle: List[str], step: int) -> Optional[str]:
+    """Moves a task's field to the next value of a cycle.
+
+    Runs on the AsyncTaskManager's mutation thread, so the current value read
+    includes every change started before (e.g. 's' pressed twice in a row).
+
+    Returns:
+        The new value, or None if the task does not exist.
+    """
+    task = task_manager.get_task(task_id)
+    if task is None:
+        return None
+    try:
+        current_index = cycle.index(getattr(task, field_name))
+    except ValueError:
+        current_index = -1 # Default to the first value if the current one is not in the cycle
+    new_value = cycle[(current_index + step) % len(cycle)]
+    return new_value if task_manager.update_task(task_id, {field_name: new_value}) else None
+
+def _cycle_fields(task_manager: TaskManager, task_ids: List[str], field_name: str,
+                  cycle: List[str], step: int) -> int:
+    """Moves each task's field to its own next value of a cycle, in one transaction.
+
+    Returns:
+        The number of tasks changed (deleted tasks are skipped).
+    """
+    with task_manager.batch() as batch:
+        for task_id in task_ids:
+            _cycle_field(task_manager, task_id, field_name, cycle, step)
+    return batch.count
+
+async def _cycle_marked_tasks(app: 'TaskManagerApp', task_ids: List[str], field_name: str,
+                              cycle: List[str], step: int, rows_changed: bool) -> None:
+    """Cycles a field of every marked task with a single save and table update.
+
+    Args:
+        app: The main TaskManagerApp instance.
+        task_ids: The marked tasks.
+        field_name: "status" or "priority".
+        cycle: The values in cycling order.
+        step: 1 to move forward, -1 to move backward.
+        rows_changed: True if the new values may move tasks out of the filtered rows.
+    """
+    try:
+        changed = await app.async_task_manager.apply(_cycle_fields, task_ids, field_name, cycle, step)
+    except Exception as e:
+        logger.error(f"Error cycling {field_name} of {len(task_ids)} tasks: {e}")
+        app.bell()
+        app.notify(f"An error occurred while updating {field_name}.", severity="error")
+        return
+    app.notify(f"Cycled {field_name} of {changed} marked task(s).")
+    app._refresh_task_table(filter_type=app.current_filter, rows_changed=rows_changed, changed_ids=task_ids)
+    app._update_details_view()
 
-def cycle_task_status(app: 'TaskManagerApp', reverse: bool = False) -> None:
+async def cycle_task_status(app: 'TaskManagerApp', reverse: bool = False) -> None:
     """Cycles the status of the app's currently selected task.
     
-    Retrieves the selected task, calculates the next status in the cycle 
-    (defined in app.STATUS_CYCLE), updates the task via TaskManager, 
-    refreshes the UI, and shows notifications.
+    Calculates the next status in the cycle (defined in app.STATUS_CYCLE)
+    and updates the task through the app's AsyncTaskManager, then refreshes
+    the UI and shows notifications. If tasks are marked, each marked task
+    moves to its next status instead, in one transaction.
     
     Args:
         app: The main TaskManagerApp instance.
         reverse: If True, cycle status backwards.
     """
-    if app.selected_task_id is None:
-        app.bell()
-        app.notify("No task selected to cycle status.", severity="warning")
+    step = -1 if reverse else 1
+    marked_ids = app._marked_task_ids()
+    if marked_ids:
+        await _cycle_marked_tasks(app, marked_ids, "status", app.STATUS_CYCLE, step,
+                                  rows_changed=bool(app.status_filter))
         return
-        
-    task = app.task_manager.get_task(app.selected_task_id)
-    if not task:
+    task_id = app.selected_task_id
+    if task_id is None:
         app.bell()
-        app.notify(f"Selected task {app.selected_task_id} not found.", severity="error")
+        app.notify("No task selected to cycle status.", severity="warning")
         return
         
     try:
-        current_index = app.STATUS_CYCLE.index(task.status)
-    except ValueError:
-        current_index = -1 # Default to first status if current one not found
-        
-    step = -1 if reverse else 1
-    next_index = (current_index + step) % len(app.STATUS_CYCLE)
-    new_status = app.STATUS_CYCLE[next_index]
-    
-    updates = {"status": new_status}
-    try:
-        success = app.task_manager.update_task(app.selected_task_id, updates)
-        if success:
+        new_status = await app.async_task_manager.apply(_cycle_field, task_id, "status", app.STATUS_CYCLE, step)
+        if new_status is not None:
             app.notify(f"Status updated to {new_status}")
-            app._refresh_task_table(filter_type=app.current_filter) # Refresh table
-            # Trigger details view update by simulating re-select
-            # Ensure DataTable is imported if direct access is needed, otherwise rely on app method
+            # Only cells changed: re-render the visible rows without rebuilding them,
+            # unless the task may now fall outside the status filter
+            app._refresh_task_table(filter_type=app.current_filter, rows_changed=bool(app.status_filter),
+                                    changed_ids=[task_id])
             try:
-                table = app.query_one(DataTable)
-                app.on_data_table_row_selected(DataTable.RowSelected(table)) # Simulate re-select
+                app._update_details_view() # Show the new status in the details view
             except Exception as e:
-                # Log error if table query fails
+                # Log error if the details view cannot be updated
                 app.notify("Error updating details view after status change.", severity="error")
-                logger.error(f"Error querying DataTable after status cycle: {e}") # Assuming logger is available
+                logger.error(f"Error updating details view after status cycle: {e}") # Assuming logger is available
         else:
             app.bell()
-            app.notify(f"Failed to update status for task {app.selected_task_id}.", severity="error")
+            app.notify(f"Selected task {task_id} not found.", severity="error")
     except Exception as e:
-        logger.error(f"Error updating status for {app.selected_task_id}: {e}") # Assuming logger is available
+        logger.error(f"Error updating status for {task_id}: {e}") # Assuming logger is available
         app.bell()
         app.notify("An error occurred while updating status.", severity="error")
 
-def cycle_task_priority(app: 'TaskManagerApp') -> None:
+async def cycle_task_priority(app: 'TaskManagerApp') -> None:
     """Cycles the priority of the app's currently selected task upwards.
 
-    Retrieves the selected task, calculates the next priority in the cycle 
-    (defined in app.PRIORITY_CYCLE), updates the task via TaskManager, 
-    refreshes the UI, and shows notifications.
+    Calculates the next priority in the cycle (defined in app.PRIORITY_CYCLE)
+    and updates the task through the app's AsyncTaskManager, then refreshes
+    the UI and shows notifications. If tasks are marked, each marked task
+    moves to its next priority instead, in one transaction.
     
     Args:
         app: The main TaskManagerApp instance.
     """
-    if app.selected_task_id is None:
-        app.bell()
-        app.notify("No task selected to cycle priority.", severity="warning")
+    marked_ids = app._marked_task_ids()
+    if marked_ids:
+        await _cycle_marked_tasks(app, marked_ids, "priority", app.PRIORITY_CYCLE, 1,
+                                  rows_changed=bool(app.priority_filter))
         return
-        
-    task = app.task_manager.get_task(app.selected_task_id)
-    if not task:
+    task_id = app.selected_task_id
+    if task_id is None:
         app.bell()
-        app.notify(f"Selected task {app.selected_task_id} not found.", severity="error")
+        app.notify("No task selected to cycle priority.", severity="warning")
         return
         
     try:
-        current_index = app.PRIORITY_CYCLE.index(task.priority)
-    except ValueError:
-        current_index = -1 # Default to Low if not found
-    
-    next_index = (current_index + 1) % len(app.PRIORITY_CYCLE)
-    new_priority = app.PRIORITY_CYCLE[next_index]
-    
-    updates = {"priority": new_priority}
-    try:
-        success = app.task_manager.update_task(app.selected_task_id, updates)
-        if success:
+        new_priority = await app.async_task_manager.apply(_cycle_field, task_id, "priority", app.PRIORITY_CYCLE, 1)
+        if new_priority is not None:
             app.notify(f"Priority updated to {new_priority}")
-            app._refresh_task_table(filter_type=app.current_filter)
-            # Trigger details view update by simulating re-select
+            app._refresh_task_table(filter_type=app.current_filter, rows_changed=bool(app.priority_filter),
+                                    changed_ids=[task_id])
             try:
-                table = app.query_one(DataTable)
-                app.on_data_table_row_selected(DataTable.RowSelected(table)) # Simulate re-select
+                app._update_details_view() # Show the new priority in the details view
             except Exception as e:
                 app.notify("Error updating details view after priority change.", severity="error")
-                logger.error(f"Error querying DataTable after priority cycle: {e}") # Assuming logger is available
+                logger.error(f"Error updating details view after priority cycle: {e}") # Assuming logger is available
         else:
             app.bell() 
-            app.notify(f"Failed to update priority for task {app.selected_task_id}.", severity="error")
+            app.notify(f"Selected task {task_id} not found.", severity="error")
     except Exception as e:
-        logger.error(f"Error updating priority for {app.selected_task_id}: {e}") # Assuming logger is available
+        logger.error(f"Error updating priority for {task_id}: {e}") # Assuming logger is available
         app.bell()
         app.notify("An error occurred while updating priority.", severity="error")
 
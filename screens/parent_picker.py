@@ -0,0 +1,109 @@
+"""Type-ahead parent picker used by the Add/Edit task screens."""
+
+from itertools import islice
+from typing import Iterator, Optional
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import Input, Label, OptionList
+from textual.widgets.option_list import Option
+
+from AI_Pair_Programming_Task_Manager import Task, TaskManager
+
+# Option ID of the "(No Parent)" entry
+NO_PARENT_VALUE = "__NONE__"
+
+class ParentPicker(Vertical):
+    """Picks a parent task by typing part of its title or display ID.
+
+    Candidates come from TaskManager.parent_candidates() (Epics and Stories
+    first) one page at a time: the next page is only fetched when the
+    highlight reaches the end of the list, so opening the picker costs the
+    same however many tasks the store holds.
+    """
+
+    DEFAULT_CSS = """
+    ParentPicker {
+        height: auto;
+    }
+    ParentPicker > OptionList {
+        height: auto;
+        max-height: 6;
+    }
+    """
+
+    # Candidates fetched per page
+    PAGE_SIZE = 20
+
+    def __init__(self, task_manager: TaskManager, value: Optional[str] = None,
+                 exclude_subtree_of: Optional[str] = None, *, id: Optional[str] = None) -> None:
+        """Initialize the picker.
+
+        Args:
+            task_manager: The TaskManager the candidates are queried from.
+            value: The UUID ID of the initially chosen parent (None = no parent).
+            exclude_subtree_of: Optional UUID ID of the task being edited; it and
+                                its descendants are never offered.
+        """
+        super().__init__(id=id)
+        self.task_manager = task_manager
+        self.value = value
+        self.exclude_subtree_of = exclude_subtree_of
+        self._candidates: Iterator[Task] = iter(())
+        self._exhausted = True # No more candidates to fetch for the current text
+
+    def compose(self) -> ComposeResult:
+        yield Label(self._describe(self.value), markup=False, id="parent-picker-current")
+        yield Input(placeholder="Type to search parents by title or ID...", id="parent-picker-input")
+        yield OptionList(markup=False, id="parent-picker-options")
+
+    def on_mount(self) -> None:
+        """List the first page of candidates."""
+        self.search("")
+
+    def _describe(self, task_id: Optional[str]) -> str:
+        """The label text for the chosen parent."""
+        if task_id is None:
+            return "Parent: (No Parent)"
+        task = self.task_manager.get_task(task_id)
+        return f"Parent: [{task.display_id}] {task.title}" if task else f"Parent: {task_id} (missing)"
+
+    def search(self, text: str) -> None:
+        """Restarts the candidate list for the given text, showing its first page."""
+        option_list = self.query_one("#parent-picker-options", OptionList)
+        option_list.clear_options()
+        option_list.add_option(Option("(No Parent)", id=NO_PARENT_VALUE))
+        self._candidates = self.task_manager.parent_candidates(text, exclude_subtree_of=self.exclude_subtree_of)
+        self._exhausted = False
+        self._load_page()
+
+    def _load_page(self) -> None:
+        """Appends the next page of candidates to the option list."""
+        page = list(islice(self._candidates, self.PAGE_SIZE))
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        self.query_one("#parent-picker-options", OptionList).add_options(
+            Option(f"[{task.display_id}] {task.task_type}: {task.title}", id=task.id) for task in page
+        )
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Narrows the candidates as the search text is typed."""
+        event.stop() # Not the app's task search
+        self.search(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Moves focus from the search text to the candidates on Enter."""
+        event.stop()
+        self.query_one("#parent-picker-options", OptionList).focus()
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        """Fetches the next page once the highlight reaches the last candidate."""
+        event.stop()
+        if not self._exhausted and event.option_index >= event.option_list.option_count - 1:
+            self._load_page()
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Chooses the selected candidate as the parent."""
+        event.stop()
+        self.value = None if event.option.id == NO_PARENT_VALUE else event.option.id
+        self.query_one("#parent-picker-current", Label).update(self._describe(self.value))
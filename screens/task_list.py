@@ -0,0 +1,420 @@
+"""
+Virtual task list widget for the AI Pair Programming Task Manager.
+
+A Line API view over the TaskManager hierarchy. The row model only holds
+(task ID, level, dimmed) per row; cells are looked up, styled and rendered
+when a row scrolls into view, and only the rows around the viewport are
+kept in a cache. Mounting and scrolling therefore cost the same at 100k
+tasks as at 100, unlike a DataTable that stores a styled row per task.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rich.text import Text
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from AI_Pair_Programming_Task_Manager import Task, TaskManager
+from screens.helpers import task_row_cells
+
+COLUMN_LABELS = ("ID", "Title", "Status", "Priority", "Type")
+# Widths of the columns after Title, which takes the remaining space
+STATUS_WIDTH = 11
+PRIORITY_WIDTH = 8
+TYPE_WIDTH = 5
+
+# One row of the model: (task ID, hierarchy level, dimmed)
+TaskRow = Tuple[str, int, bool]
+
+class TaskList(ScrollView, can_focus=True):
+    """Scrollable, virtualized list of tasks with a row cursor.
+
+    Rows are keyed by task UUID like the DataTable rows were: use
+    select_task()/cursor_task_id to work with the selection, and handle
+    TaskList.TaskHighlighted / TaskList.TaskSelected messages. show_tasks()
+    lists search results flat, in rank order, with the matched words highlighted.
+
+    Several tasks can be marked for bulk actions: space toggles the task under
+    the cursor, shift+up/down (or shift+click) marks the range from where the
+    extension started, and ctrl+click toggles a clicked task. marked_task_ids
+    lists them; marks of tasks that leave the list are dropped.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Cursor Up", show=False),
+        Binding("down", "cursor_down", "Cursor Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "cursor_home", "First Task", show=False),
+        Binding("end", "cursor_end", "Last Task", show=False),
+        Binding("enter", "select_cursor", "Select Task", show=False),
+        Binding("space", "toggle_mark", "Mark Task"),
+        Binding("shift+up", "extend_marks_up", "Mark Range Up", show=False),
+        Binding("shift+down", "extend_marks_down", "Mark Range Down", show=False),
+    ]
+
+    COMPONENT_CLASSES = {"task-list--header", "task-list--cursor", "task-list--match", "task-list--marked"}
+
+    DEFAULT_CSS = """
+    TaskList {
+        height: 1fr;
+        overflow-x: hidden;
+    }
+    TaskList > .task-list--header {
+        text-style: bold;
+        background: $panel;
+    }
+    TaskList > .task-list--cursor {
+        background: $accent;
+    }
+    TaskList > .task-list--marked {
+        background: $secondary 40%;
+        text-style: bold;
+    }
+    TaskList > .task-list--match {
+        color: $warning;
+        text-style: bold underline;
+    }
+    """
+
+    # Rows beyond each edge of the viewport that stay rendered in the cache
+    OVERSCAN = 20
+
+    class TaskHighlighted(Message):
+        """Posted when the cursor moves to another task."""
+
+        def __init__(self, task_list: "TaskList", task_id: Optional[str]) -> None:
+            super().__init__()
+            self.task_list = task_list
+            self.task_id = task_id
+
+        @property
+        def control(self) -> "TaskList":
+            return self.task_list
+
+    class TaskSelected(Message):
+        """Posted when a task is chosen with Enter or a click."""
+
+        def __init__(self, task_list: "TaskList", task_id: str) -> None:
+            super().__init__()
+            self.task_list = task_list
+            self.task_id = task_id
+
+        @property
+        def control(self) -> "TaskList":
+            return self.task_list
+
+    def __init__(self, task_manager: TaskManager, *, name: Optional[str] = None,
+                 id: Optional[str] = None, classes: Optional[str] = None) -> None:
+        """Initializes an empty list; call refresh_rows() or append_tasks() to fill it.
+
+        Args:
+            task_manager: The TaskManager the rows are read from.
+        """
+        super().__init__(name=name, id=id, classes=classes)
+        self.task_manager = task_manager
+        self._rows: List[TaskRow] = []
+        self._row_of: Dict[str, int] = {} # Task ID -> row index
+        self._id_width = 2
+        self.cursor_row = 0
+        self._highlighted_id: Optional[str] = None # Task last announced via TaskHighlighted
+        self._line_cache: Dict[int, Strip] = {} # Rendered rows around the viewport
+        self._highlight: Optional[re.Pattern] = None # Words highlighted in the titles
+        self._marked: Set[str] = set() # Task IDs marked for bulk actions
+        self._range_anchor: Optional[int] = None # Row a shift+arrow range extends from
+        self._range_base: Set[str] = set() # Marks from before that range was started
+        self._range_cursor: Optional[int] = None # Cursor row after the last range extension
+
+    # --- Row Model ---
+    @property
+    def row_count(self) -> int:
+        """The number of rows in the list."""
+        return len(self._rows)
+
+    @property
+    def task_ids(self) -> List[str]:
+        """The task IDs in display order."""
+        return [task_id for task_id, _, _ in self._rows]
+
+    @property
+    def cursor_task_id(self) -> Optional[str]:
+        """The UUID of the task under the cursor, or None if the list is empty."""
+        if 0 <= self.cursor_row < len(self._rows):
+            return self._rows[self.cursor_row][0]
+        return None
+
+    def refresh_rows(self, filter_type: Optional[str] = None,
+                     matching_ids: Optional[Set[str]] = None) -> None:
+        """Rebuilds the rows from the TaskManager hierarchy, keeping the cursor on its task.
+
+        Ancestors of the shown tasks are kept (dimmed) so every match appears
+        under its parents.
+
+        Args:
+            filter_type: Optional task type to show.
+            matching_ids: Optional IDs of the tasks to show (e.g. from
+                          TaskManager.query); overrides filter_type.
+        """
+        cursor_task_id = self.cursor_task_id
+        self._highlight = None
+        if filter_type and matching_ids is None:
+            matching_ids = {task.id for task in self.task_manager.query(task_type=filter_type)}
+        if matching_ids is not None:
+            walk = self.task_manager.walk_tree(only=self.task_manager.with_ancestors(matching_ids))
+            rows = [(task.id, level, task.id not in matching_ids) for task, level in walk]
+        else:
+            walk = self.task_manager.walk_tree()
+            rows = [(task.id, level, False) for task, level in walk]
+        self._set_rows(rows, (task for task, _ in walk))
+        # Stay on the same task, or at the same position if it is gone
+        self.move_cursor(self._row_of.get(cursor_task_id, self.cursor_row))
+
+    def show_tasks(self, tasks: Iterable[Task], highlight: Optional[re.Pattern] = None) -> None:
+        """Lists the given tasks flat, in the given order (e.g. ranked search results).
+
+        Args:
+            tasks: The tasks to show.
+            highlight: Optional pattern whose matches are highlighted in the titles.
+        """
+        tasks = list(tasks)
+        cursor_task_id = self.cursor_task_id
+        self._highlight = highlight
+        self._set_rows([(task.id, 0, False) for task in tasks], tasks)
+        self.move_cursor(self._row_of.get(cursor_task_id, 0))
+
+    def append_tasks(self, tasks: Iterable[Task]) -> None:
+        """Adds tasks as flat rows at the end (e.g. while tasks are still loading)."""
+        tasks = list(tasks)
+        for index, task in enumerate(tasks, len(self._rows)):
+            self._row_of[task.id] = index
+        self._rows.extend((task.id, 0, False) for task in tasks)
+        self._id_width = max(self._id_width, self._widest_id(tasks))
+        self.invalidate()
+        if self._highlighted_id is None:
+            self.move_cursor(self.cursor_row, scroll=False) # Announce the first task
+
+    def _set_rows(self, rows: List[TaskRow], tasks: Iterable[Task]) -> None:
+        """Replaces the row model and schedules a repaint."""
+        self._rows = rows
+        self._row_of = {task_id: index for index, (task_id, _, _) in enumerate(rows)}
+        self._id_width = self._widest_id(tasks)
+        self._marked.intersection_update(self._row_of) # Hidden or deleted tasks are not acted on
+        self._range_anchor = None
+        self.invalidate()
+
+    @staticmethod
+    def _widest_id(tasks: Iterable[Task]) -> int:
+        """Width of the ID column needed for these tasks (at least 2)."""
+        return max(2, max((len(str(task.display_id)) for task in tasks), default=0))
+
+    def invalidate(self) -> None:
+        """Drops the rendered rows so they are re-read from the TaskManager
+        (enough after a task's fields changed without changing the row order)."""
+        self._line_cache.clear()
+        self.virtual_size = Size(self.size.width, len(self._rows) + 1) # +1 for the header
+        self.refresh()
+
+    def refresh_tasks(self, task_ids: Iterable[str]) -> None:
+        """Re-renders only the rows of the given tasks (after their fields changed
+        in place), leaving every other rendered row cached."""
+        for task_id in task_ids:
+            row = self._row_of.get(task_id)
+            if row is not None:
+                self._line_cache.pop(row, None)
+                self.refresh_line(row + 1) # +1 for the header
+
+    # --- Marks ---
+    @property
+    def marked_task_ids(self) -> List[str]:
+        """The UUIDs of the marked tasks, in display order."""
+        return sorted(self._marked, key=self._row_of.__getitem__)
+
+    @property
+    def marked_count(self) -> int:
+        """The number of marked tasks."""
+        return len(self._marked)
+
+    def toggle_mark(self, task_id: str) -> None:
+        """Marks a listed task, or unmarks it if it is marked."""
+        if task_id not in self._row_of:
+            return
+        self._range_anchor = None
+        self._set_marks(self._marked ^ {task_id})
+
+    def clear_marks(self) -> None:
+        """Unmarks every task."""
+        self._range_anchor = None
+        self._set_marks(set())
+
+    def _set_marks(self, marked: Set[str]) -> None:
+        """Replaces the marks, repainting only the rows whose mark changed."""
+        changed = self._marked ^ marked
+        self._marked = marked
+        for task_id in changed:
+            self.refresh_line(self._row_of[task_id] + 1) # +1 for the header
+
+    def _extend_range(self, to_row: int) -> int:
+        """Marks the rows from the range's anchor to a row, on top of the marks
+        made before the range started. A range whose end is no longer under
+        the cursor is over, so a new one starts at the cursor.
+
+        Returns:
+            The (clamped) row the range now ends at.
+        """
+        if self._range_anchor is None or self._range_cursor != self.cursor_row:
+            self._range_anchor = self.cursor_row
+            self._range_base = set(self._marked)
+        to_row = max(0, min(to_row, len(self._rows) - 1))
+        first, last = sorted((self._range_anchor, to_row))
+        self._set_marks(self._range_base.union(task_id for task_id, _, _ in self._rows[first:last + 1]))
+        self._range_cursor = to_row
+        return to_row
+
+    def action_toggle_mark(self) -> None:
+        task_id = self.cursor_task_id
+        if task_id is not None:
+            self.toggle_mark(task_id)
+            self.move_cursor(self.cursor_row + 1)
+
+    def action_extend_marks_up(self) -> None:
+        if self._rows:
+            self.move_cursor(self._extend_range(self.cursor_row - 1))
+
+    def action_extend_marks_down(self) -> None:
+        if self._rows:
+            self.move_cursor(self._extend_range(self.cursor_row + 1))
+
+    # --- Cursor ---
+    def move_cursor(self, row: int, scroll: bool = True) -> None:
+        """Moves the cursor to a row (clamped), scrolling it into view.
+
+        Args:
+            row: The target row index.
+            scroll: Whether to scroll the row into view.
+        """
+        row = max(0, min(row, len(self._rows) - 1))
+        self.cursor_row = row
+        if scroll:
+            visible_rows = max(1, self.scrollable_content_region.height - 1)
+            if row < self.scroll_offset.y:
+                self.scroll_to(y=row, animate=False)
+            elif row >= self.scroll_offset.y + visible_rows:
+                self.scroll_to(y=row - visible_rows + 1, animate=False)
+        self.refresh()
+        if self.cursor_task_id != self._highlighted_id:
+            self._highlighted_id = self.cursor_task_id
+            self.post_message(self.TaskHighlighted(self, self._highlighted_id))
+
+    def select_task(self, task_id: str) -> bool:
+        """Moves the cursor to a task.
+
+        Returns:
+            False if the task is not in the list (e.g. filtered out).
+        """
+        row = self._row_of.get(task_id)
+        if row is None:
+            return False
+        self.move_cursor(row)
+        return True
+
+    def _page_size(self) -> int:
+        return max(1, self.scrollable_content_region.height - 2)
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(self.cursor_row - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(self.cursor_row + 1)
+
+    def action_page_up(self) -> None:
+        self.move_cursor(self.cursor_row - self._page_size())
+
+    def action_page_down(self) -> None:
+        self.move_cursor(self.cursor_row + self._page_size())
+
+    def action_cursor_home(self) -> None:
+        self.move_cursor(0)
+
+    def action_cursor_end(self) -> None:
+        self.move_cursor(len(self._rows) - 1)
+
+    def action_select_cursor(self) -> None:
+        task_id = self.cursor_task_id
+        if task_id is not None:
+            self.post_message(self.TaskSelected(self, task_id))
+
+    def on_click(self, event: events.Click) -> None:
+        """Moves the cursor to the clicked row and selects it (shift+click marks
+        the range up to it, ctrl+click toggles its mark)."""
+        row = event.style.meta.get("row")
+        if row is None:
+            return
+        if event.shift:
+            self._extend_range(row)
+        elif event.ctrl:
+            self.toggle_mark(self._rows[row][0])
+        self.move_cursor(row, scroll=False)
+        self.action_select_cursor()
+
+    # --- Rendering ---
+    def on_resize(self, event: events.Resize) -> None:
+        self.invalidate()
+
+    def _column_widths(self, width: int) -> Tuple[int, ...]:
+        """Widths of the five columns for the given line width (single-space gaps)."""
+        fixed = self._id_width + STATUS_WIDTH + PRIORITY_WIDTH + TYPE_WIDTH + 4
+        return (self._id_width, max(5, width - fixed), STATUS_WIDTH, PRIORITY_WIDTH, TYPE_WIDTH)
+
+    def _render_cells(self, cells: Iterable[Text], width: int) -> Strip:
+        """Lays the cells out in columns and renders them as one (unstyled) line."""
+        fitted = []
+        for cell, column_width in zip(cells, self._column_widths(width)):
+            cell.truncate(column_width, overflow="ellipsis", pad=True)
+            fitted.append(cell)
+        line = Text(" ").join(fitted)
+        strip = Strip(line.render(self.app.console), line.cell_len)
+        return strip.adjust_cell_length(width)
+
+    def render_line(self, y: int) -> Strip:
+        """Renders one line of the viewport: the header, or the row scrolled to it."""
+        width = self.size.width
+        base_style = self.rich_style
+        if y == 0:
+            header_style = base_style + self.get_component_rich_style("task-list--header")
+            return self._render_cells((Text(label) for label in COLUMN_LABELS), width).apply_style(header_style)
+
+        scroll_y = self.scroll_offset.y
+        row = scroll_y + y - 1
+        if row >= len(self._rows):
+            return Strip.blank(width, base_style)
+        strip = self._line_cache.get(row)
+        if strip is None:
+            task_id, level, dimmed = self._rows[row]
+            task = self.task_manager.get_task(task_id)
+            if task is None: # Deleted since the rows were built
+                strip = Strip.blank(width, base_style)
+            else:
+                cells = [Text.from_markup(str(cell)) for cell in task_row_cells(task, level, dimmed)]
+                if self._highlight is not None:
+                    cells[1].highlight_regex(self._highlight, self.get_component_rich_style("task-list--match", partial=True))
+                strip = self._render_cells(cells, width).apply_meta({"row": row})
+            self._line_cache[row] = strip
+            self._prune_cache(scroll_y)
+        if row == self.cursor_row:
+            return strip.apply_style(base_style + self.get_component_rich_style("task-list--cursor"))
+        if self._rows[row][0] in self._marked:
+            return strip.apply_style(base_style + self.get_component_rich_style("task-list--marked"))
+        return strip.apply_style(base_style)
+
+    def _prune_cache(self, scroll_y: int) -> None:
+        """Keeps only the cached rows within the overscan window around the viewport."""
+        height = self.size.height
+        if len(self._line_cache) <= height + 2 * self.OVERSCAN:
+            return
+        first, last = scroll_y - self.OVERSCAN, scroll_y + height + self.OVERSCAN
+        self._line_cache = {row: strip for row, strip in self._line_cache.items() if first <= row <= last}
@@ -0,0 +1,257 @@
+"""
+SQLite storage backend for the AI Pair Programming Task Manager.
+
+Stores one row per task in a stdlib `sqlite3` database, with indexes on the
+columns the TUI filters and sorts by. Single-task changes are single-row
+writes, so saving no longer scales with the size of the board.
+
+Usage (migrate an existing JSON task file):
+    python sqlite_storage.py migrate tasks.json tasks.db
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, Union
+
+from AI_Pair_Programming_Task_Manager import (
+    Task, TaskChange, load_tasks_from_json, TASK_STATUSES, TASK_PRIORITIES, TASK_TYPES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Column order used for all reads and writes
+TASK_COLUMNS = (
+    "id", "display_id", "title", "description", "status", "priority",
+    "task_type", "parent_id", "created_at", "updated_at", "revision",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    display_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    parent_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_type ON tasks (task_type);
+CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks (parent_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at);
+"""
+
+# Fields query(order_by=...) sorts in workflow order rather than alphabetically
+_ORDER_RANKS = {"status": TASK_STATUSES, "priority": TASK_PRIORITIES, "task_type": TASK_TYPES}
+
+# Upsert keeps the rowid of existing rows, so loading ORDER BY rowid keeps insertion order
+_UPSERT_SQL = (
+    f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in TASK_COLUMNS)}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in TASK_COLUMNS[1:])
+)
+
+def _timestamp_to_db(value: datetime) -> str:
+    """Stores timestamps as UTC ISO 8601 text, which sorts chronologically."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+def _task_to_row(task: Task) -> tuple:
+    """Converts a Task into a row tuple in TASK_COLUMNS order."""
+    return (
+        task.id, task.display_id, task.title, task.description, task.status,
+        task.priority, task.task_type, task.parent_id,
+        _timestamp_to_db(task.created_at), _timestamp_to_db(task.updated_at), task.revision,
+    )
+
+def _row_to_task(row: tuple) -> Task:
+    """Converts a row tuple in TASK_COLUMNS order back into a Task."""
+    (task_id, display_id, title, description, status, priority,
+     task_type, parent_id, created_at, updated_at, revision) = row
+    return Task(
+        id=task_id, display_id=display_id, title=title, description=description,
+        status=status, priority=priority, task_type=task_type, parent_id=parent_id,
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at), revision=revision,
+    )
+
+class SqliteTaskStorage:
+    """TaskStorage backed by an indexed SQLite database.
+
+    Each change is an upsert or delete of a single row, and filters are
+    answered by indexed queries instead of scanning every task.
+    """
+
+    incremental = True
+
+    def __init__(self, db_path: str = "tasks.db"):
+        """Initializes the storage, creating the schema if needed.
+
+        Args:
+            db_path: The path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Returns the open connection, (re)opening it after close()."""
+        if self._connection is None:
+            # TaskManager serializes writes, so the connection may move between threads
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            # Databases created before tasks had revisions lack the column
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(tasks)")}
+            if columns and "revision" not in columns:
+                self._connection.execute("ALTER TABLE tasks ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def load(self) -> list[Task]:
+        """Returns all stored tasks in insertion order."""
+        return list(self.iter_load())
+
+    def iter_load(self) -> Iterator[Task]:
+        """Streams the stored tasks in insertion order, one row at a time."""
+        cursor = self._connect().execute(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY rowid"
+        )
+        for row in cursor:
+            yield _row_to_task(row)
+
+    def save_all(self, tasks: list[Task]) -> None:
+        """Replaces the stored tasks with the given list in one transaction."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM tasks")
+                connection.executemany(_UPSERT_SQL, (_task_to_row(task) for task in tasks))
+        except sqlite3.Error as e:
+            logger.error(f"Error saving tasks to {self.db_path}: {e}")
+
+    def save_changes(self, changes: list[TaskChange]) -> None:
+        """Upserts or deletes one row per changed task, in one transaction."""
+        connection = self._connect()
+        try:
+            with connection:
+                for task_id, task in changes:
+                    if task is not None:
+                        connection.execute(_UPSERT_SQL, _task_to_row(task))
+                    else:
+                        connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        except sqlite3.Error as e:
+            logger.error(f"Error saving changes to {self.db_path}: {e}")
+
+    def query(self, status: Union[str, Iterable[str], None] = None,
+              priority: Union[str, Iterable[str], None] = None,
+              task_type: Union[str, Iterable[str], None] = None,
+              parent: Optional[str] = None, updated_since: Optional[datetime] = None,
+              order_by: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        """Finds the stored tasks matching all given criteria, using the column indexes.
+
+        Takes the same criteria as TaskManager.query, so TaskManager (and the
+        headless CLI) can answer queries here without loading every task.
+
+        Args:
+            status: A status, or several (any of them matches).
+            priority: A priority, or several.
+            task_type: A task type, or several.
+            parent: Only direct children of the task with this UUID ID.
+            updated_since: Only tasks updated at or after this time.
+            order_by: A Task field to sort by, prefixed with "-" for descending
+                      order (status, priority and task_type in workflow order).
+                      Without it, tasks come in insertion order.
+            limit: Maximum number of tasks to return (None = all).
+
+        Returns:
+            A lazy iterator over the matching tasks, one row at a time.
+
+        Raises:
+            ValueError: If order_by is not a Task field.
+        """
+        clauses = []
+        params: list = []
+        for column, wanted in (("status", status), ("priority", priority), ("task_type", task_type)):
+            if wanted is None:
+                continue
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        if parent is not None:
+            clauses.append("parent_id = ?")
+            params.append(parent)
+        if updated_since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(_timestamp_to_db(updated_since))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "rowid"
+        if order_by is not None:
+            column = order_by.lstrip("-")
+            if column not in TASK_COLUMNS:
+                raise ValueError(f"Cannot order tasks by {order_by!r}")
+            ranks = _ORDER_RANKS.get(column)
+            if ranks is not None: # Unknown values sort last
+                column = "CASE {} {} ELSE {} END".format(
+                    column, " ".join(f"WHEN ? THEN {rank}" for rank in range(len(ranks))), len(ranks))
+                params.extend(ranks)
+            order = f"{column} {'DESC' if order_by.startswith('-') else 'ASC'}, rowid"
+        sql = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self._connect().execute(sql, params)
+        return map(_row_to_task, cursor)
+
+    def close(self) -> None:
+        """Closes the database connection (it is reopened on next use)."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """Copies all tasks from a JSON task file (and its journal) into a SQLite database.
+
+    Args:
+        json_path: The path to the existing JSON task file.
+        db_path: The path to the SQLite database to create or overwrite.
+
+    Returns:
+        The number of migrated tasks.
+    """
+    tasks = load_tasks_from_json(json_path)
+    storage = SqliteTaskStorage(db_path)
+    try:
+        storage.save_all(tasks)
+    finally:
+        storage.close()
+    return len(tasks)
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point (currently only the 'migrate' command)."""
+    parser = argparse.ArgumentParser(description="SQLite storage for the task manager.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="Migrate a JSON task file to SQLite.")
+    migrate_parser.add_argument("json_path", help="Existing JSON task file, e.g. tasks.json")
+    migrate_parser.add_argument("db_path", help="SQLite database to write, e.g. tasks.db")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        if not os.path.exists(args.json_path):
+            print(f"Error: {args.json_path} does not exist.", file=sys.stderr)
+            return 1
+        count = migrate_json_to_sqlite(args.json_path, args.db_path)
+        print(f"Migrated {count} tasks from {args.json_path} to {args.db_path}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Headless command line interface for the AI Pair Programming Task Manager.
+
+Imports, exports, queries and bulk-updates a task store without the Textual
+TUI (textual is never imported), so scripts and agent loops start quickly.
+Records are streamed one at a time as JSON Lines or CSV, and changes are
+saved once per batch of records instead of once per record.
+
+Usage:
+    python task_cli.py import new_tasks.jsonl
+    python task_cli.py export --status Done --format csv done.csv
+    python task_cli.py query --type Bug --order-by=-priority --limit 10
+    python task_cli.py bulk-update --status Blocked --set priority=High
+    python task_cli.py bulk-update --input changes.csv
+    python task_cli.py --db tasks.db export -
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from dataclasses import fields
+from datetime import datetime, timezone
+from typing import IO, Iterable, Iterator, Optional
+
+from AI_Pair_Programming_Task_Manager import (
+    Task, TaskManager, TaskStorage, JsonFileStorage, TASK_STATUSES, TASK_PRIORITIES, TASK_TYPES,
+)
+
+# Every Task field, in the order they are exported
+TASK_FIELDS = tuple(f.name for f in fields(Task))
+# Fields a record may set on import or bulk update (the rest are assigned by TaskManager)
+EDITABLE_FIELDS = ("title", "description", "status", "priority", "task_type", "parent_id")
+ALLOWED_VALUES = {"status": TASK_STATUSES, "priority": TASK_PRIORITIES, "task_type": TASK_TYPES}
+FORMATS = ("jsonl", "csv")
+DEFAULT_BATCH_SIZE = 1000
+
+# --- Streaming ---
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yields lists of up to `size` consecutive items."""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def detect_format(path: str, explicit: Optional[str]) -> str:
+    """Returns the explicit format, else 'csv' for *.csv paths and 'jsonl' otherwise."""
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Parses records lazily from JSON Lines or CSV (empty CSV cells are left out).
+
+    Raises:
+        ValueError: If a JSON line is not an object.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        yield record
+
+def task_record(task: Task, field_names: Iterable[str] = TASK_FIELDS) -> dict:
+    """Returns a task's fields as JSON/CSV-ready values (timestamps in ISO 8601)."""
+    record = {}
+    for name in field_names:
+        value = getattr(task, name)
+        record[name] = value.isoformat() if isinstance(value, datetime) else value
+    return record
+
+def write_records(tasks: Iterable[Task], stream: IO[str], fmt: str,
+                  field_names: Iterable[str] = TASK_FIELDS) -> int:
+    """Writes tasks one at a time as JSON Lines or CSV and returns how many were written."""
+    field_names = tuple(field_names)
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=field_names)
+        writer.writeheader()
+        for count, task in enumerate(tasks, 1):
+            writer.writerow(task_record(task, field_names))
+        return count
+    for count, task in enumerate(tasks, 1):
+        stream.write(json.dumps(task_record(task, field_names), ensure_ascii=False) + "\n")
+    return count
+
+def editable_fields(record: dict) -> dict:
+    """Returns the fields of a record a task may be given, checking their values.
+
+    Raises:
+        ValueError: If a status, priority or task type is unknown.
+    """
+    details = {name: record[name] for name in EDITABLE_FIELDS if name in record}
+    for name, allowed in ALLOWED_VALUES.items():
+        if name in details and details[name] not in allowed:
+            raise ValueError(f"unknown {name} {details[name]!r} (expected one of {', '.join(allowed)})")
+    if details.get("parent_id") == "":
+        details["parent_id"] = None
+    return details
+
+# --- Commands ---
+def import_tasks(manager: TaskManager, records: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Adds a task per record, saving once per batch.
+
+    Tasks get new IDs. A parent_id naming the 'id' of another record of the
+    same import is pointed at that record's new task, so exported hierarchies
+    survive a round trip in any record order. Only children still waiting for
+    their parent's record are remembered; the records themselves are not kept.
+
+    Returns:
+        The number of tasks added.
+
+    Raises:
+        ValueError: If a record has an unknown status, priority or task type
+                    (batches before it are already saved).
+    """
+    new_ids: dict[str, str] = {} # Imported ID -> ID of the task created for it
+    waiting: dict[str, list[str]] = {} # Imported parent ID not seen yet -> new IDs of its children
+    count = 0
+    for batch in batched(records, batch_size):
+        checked = [(record, editable_fields(record)) for record in batch] # Nothing saved if one is invalid
+        with manager.batch():
+            for record, details in checked:
+                parent_id = details.get("parent_id")
+                if parent_id in new_ids:
+                    details["parent_id"] = new_ids[parent_id]
+                elif parent_id is not None and manager.get_task(parent_id) is None:
+                    details["parent_id"] = None # Linked once the parent's record arrives
+                task_id = manager.add_task(details)
+                if parent_id is not None and details["parent_id"] is None:
+                    waiting.setdefault(parent_id, []).append(task_id)
+                imported_id = record.get("id")
+                if imported_id:
+                    new_ids[imported_id] = task_id
+                    for child_id in waiting.pop(imported_id, ()):
+                        manager.update_task(child_id, {"parent_id": task_id})
+        count += len(checked)
+    if waiting: # Parents missing from the import keep their original IDs
+        with manager.batch():
+            for parent_id, child_ids in waiting.items():
+                for child_id in child_ids:
+                    manager.update_task(child_id, {"parent_id": parent_id})
+    return count
+
+def bulk_update(manager: TaskManager, updates_by_id: Iterable[tuple[str, dict]],
+                batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Applies (task ID, updates) pairs, saving once per batch. Unknown IDs are skipped.
+
+    Returns:
+        The number of tasks actually changed.
+
+    Raises:
+        ValueError: If a new parent would create a cycle (that batch is rolled
+                    back, earlier ones are saved).
+    """
+    changed = 0
+    for batch in batched(updates_by_id, batch_size):
+        with manager.batch() as transaction:
+            for task_id, updates in batch:
+                manager.update_task(task_id, updates)
+        changed += transaction.count
+    return changed
+
+def matches_filters(task: Task, status: Optional[list[str]] = None, priority: Optional[list[str]] = None,
+                    task_type: Optional[list[str]] = None, parent: Optional[str] = None,
+                    updated_since: Optional[datetime] = None) -> bool:
+    """Whether a task passes the filters (None = any), as TaskManager.query would decide."""
+    return ((not status or task.status in status)
+            and (not priority or task.priority in priority)
+            and (not task_type or task.task_type in task_type)
+            and (parent is None or task.parent_id == parent)
+            and (updated_since is None or task.updated_at >= updated_since))
+
+def open_storage(args: argparse.Namespace) -> TaskStorage:
+    """Opens the store selected by the global options."""
+    if args.db:
+        from sqlite_storage import SqliteTaskStorage # Only needed for SQLite stores
+        return SqliteTaskStorage(args.db)
+    return JsonFileStorage(args.file, journal=args.journal)
+
+def _parse_timestamp(value: str) -> datetime:
+    """argparse type for --updated-since (naive times are taken as UTC)."""
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO 8601 timestamp: {value!r}")
+    return timestamp.replace(tzinfo=timezone.utc) if timestamp.tzinfo is None else timestamp
+
+def _parse_assignment(value: str) -> tuple[str, str]:
+    """argparse type for --set FIELD=VALUE."""
+    name, separator, field_value = value.partition("=")
+    if not separator or name not in EDITABLE_FIELDS:
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE with FIELD one of {', '.join(EDITABLE_FIELDS)}")
+    return name, field_value
+
+def _filter_criteria(args: argparse.Namespace) -> dict:
+    """The query() criteria given on the command line."""
+    return {"status": args.status, "priority": args.priority, "task_type": args.task_type,
+            "parent": args.parent, "updated_since": args.updated_since}
+
+def _open_input(path: str) -> IO[str]:
+    return sys.stdin if path == "-" else open(path, "r", newline="", encoding="utf-8")
+
+def _open_output(path: str) -> IO[str]:
+    return sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+
+def _close(stream: IO[str]) -> None:
+    if stream not in (sys.stdin, sys.stdout):
+        stream.close()
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(description="Headless access to a task store (no TUI).")
+    parser.add_argument("--file", default="tasks.json", help="JSON task file (default: tasks.json)")
+    parser.add_argument("--journal", action="store_true", help="Append changes to the file's journal")
+    parser.add_argument("--db", help="Use this SQLite database instead of the JSON file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(subparser: argparse.ArgumentParser) -> None:
+        subparser.add_argument("--status", action="append", choices=TASK_STATUSES, help="Repeat to allow several")
+        subparser.add_argument("--priority", action="append", choices=TASK_PRIORITIES, help="Repeat to allow several")
+        subparser.add_argument("--type", dest="task_type", action="append", choices=TASK_TYPES,
+                               help="Repeat to allow several")
+        subparser.add_argument("--parent", help="Only direct children of this task UUID")
+        subparser.add_argument("--updated-since", type=_parse_timestamp, help="ISO 8601 timestamp")
+
+    def add_output(subparser: argparse.ArgumentParser, default_path: Optional[str]) -> None:
+        if default_path is None:
+            subparser.add_argument("output", help="File to write, or - for stdout")
+        else:
+            subparser.add_argument("output", nargs="?", default=default_path, help="File to write (default: stdout)")
+        subparser.add_argument("--format", choices=FORMATS, help="Default: from the file extension, else jsonl")
+        subparser.add_argument("--fields", help="Comma-separated fields to write (default: all)")
+
+    import_parser = subparsers.add_parser("import", help="Add tasks from JSON Lines or CSV records.")
+    import_parser.add_argument("input", help="File to read, or - for stdin")
+    import_parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension, else jsonl")
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records per save")
+
+    export_parser = subparsers.add_parser("export", help="Stream stored tasks out, without loading them all.")
+    add_output(export_parser, None)
+    add_filters(export_parser)
+
+    query_parser = subparsers.add_parser("query", help="Find tasks through the indexes.")
+    add_output(query_parser, "-")
+    add_filters(query_parser)
+    query_parser.add_argument("--search", help="Full-text terms that must all match")
+    query_parser.add_argument("--order-by", help="Task field, prefixed with - for descending order (e.g. --order-by=-priority)")
+    query_parser.add_argument("--limit", type=int, help="Maximum number of tasks")
+
+    update_parser = subparsers.add_parser("bulk-update", help="Change many tasks, saving once per batch.")
+    add_filters(update_parser)
+    update_parser.add_argument("--all", action="store_true", help="Update every task (when no filter is given)")
+    update_parser.add_argument("--set", dest="assignments", action="append", type=_parse_assignment, default=[],
+                               metavar="FIELD=VALUE", help="Value to set on every selected task (repeatable)")
+    update_parser.add_argument("--input", help="JSON Lines/CSV records with an 'id' and the fields to change, or -")
+    update_parser.add_argument("--format", choices=FORMATS, help="Format of --input")
+    update_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Tasks per save")
+    return parser
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "batch_size", 1) < 1:
+        parser.error("--batch-size must be at least 1")
+    field_names = TASK_FIELDS
+    if getattr(args, "fields", None):
+        field_names = tuple(name.strip() for name in args.fields.split(","))
+        unknown = [name for name in field_names if name not in TASK_FIELDS]
+        if unknown:
+            parser.error(f"unknown field(s): {', '.join(unknown)}")
+    if args.command == "bulk-update":
+        if args.input is None and not args.assignments:
+            parser.error("bulk-update needs --set or --input")
+        if args.input is None and not args.all and not any(_filter_criteria(args).values()):
+            parser.error("bulk-update needs a filter or --all")
+        try:
+            updates = editable_fields(dict(args.assignments))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command in ("import", "bulk-update") and not args.db and args.input not in (None, "-") \
+            and not os.path.exists(args.input):
+        print(f"Error: {args.input} does not exist.", file=sys.stderr)
+        return 1
+
+    storage = open_storage(args)
+    storage_query = getattr(storage, "query", None) # Optional part of TaskStorage
+    if args.command == "export" or (args.command == "query" and not args.search and storage_query is not None):
+        # Streamed straight from storage (through its indexes, if it has a query()):
+        # the tasks are never all in memory
+        criteria = _filter_criteria(args)
+        try:
+            if args.command == "query":
+                tasks = storage_query(**criteria, order_by=args.order_by, limit=args.limit)
+            elif storage_query is not None:
+                tasks = storage_query(**criteria)
+            else:
+                tasks = (task for task in storage.iter_load() if matches_filters(task, **criteria))
+        except ValueError as e: # E.g. an unknown --order-by field
+            storage.close()
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        output = _open_output(args.output)
+        try:
+            count = write_records(tasks, output, detect_format(args.output, args.format), field_names)
+        finally:
+            _close(output)
+            storage.close()
+        if args.command == "export":
+            print(f"Exported {count} tasks.", file=sys.stderr)
+        return 0
+
+    manager = TaskManager(storage=storage)
+    try:
+        if args.command == "import":
+            stream = _open_input(args.input)
+            try:
+                count = import_tasks(manager, read_records(stream, detect_format(args.input, args.format)),
+                                     args.batch_size)
+            except (ValueError, csv.Error) as e: # Includes json.JSONDecodeError
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            finally:
+                _close(stream)
+            print(f"Imported {count} tasks.")
+        elif args.command == "query":
+            criteria = _filter_criteria(args)
+            if args.search:
+                candidates = None
+                if any(criteria.values()): # Ranked among the filtered tasks only
+                    candidates = {task.id for task in manager.query(**criteria)}
+                tasks = manager.search(args.search, limit=args.limit, candidates=candidates)
+            else:
+                tasks = manager.query(**criteria, order_by=args.order_by, limit=args.limit)
+            output = _open_output(args.output)
+            try:
+                write_records(tasks, output, detect_format(args.output, args.format), field_names)
+            finally:
+                _close(output)
+        elif args.command == "bulk-update":
+            if args.input is None:
+                selected = [task.id for task in manager.query(**_filter_criteria(args))]
+                pairs: Iterable[tuple[str, dict]] = ((task_id, dict(updates)) for task_id in selected)
+                stream = None
+            else:
+                stream = _open_input(args.input)
+                records = read_records(stream, args.format or detect_format(args.input, None))
+                pairs = ((record.get("id", ""), {**editable_fields(record), **updates}) for record in records)
+            try:
+                changed = bulk_update(manager, pairs, args.batch_size)
+            except (ValueError, csv.Error) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            finally:
+                if stream is not None:
+                    _close(stream)
+            print(f"Updated {changed} tasks.")
+    except ValueError as e: # E.g. an unknown --order-by field
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
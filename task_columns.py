@@ -0,0 +1,360 @@
+"""
+Compact in-memory task representations for the AI Pair Programming Task Manager.
+
+CompactTask stores a task in slots with interned enum codes and packed UUIDs,
+and TaskColumns keeps the fields of every task in parallel arrays, so counts
+and filters over large stores run as bulk array operations.
+"""
+
+import functools
+import itertools
+import operator
+import re
+import uuid
+from array import array
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Union
+
+from task_model import Task, TASK_STATUSES, TASK_PRIORITIES, TASK_TYPES, _TASK_FIELD_NAMES, _get_task_fields
+
+class _EnumCodes:
+    """Interns the values of one enum-like Task field as small integer codes."""
+
+    def __init__(self, values: Iterable[str]):
+        self.values: list[str] = list(values)
+        self.codes: dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        """Returns the code for a value, registering values outside the known set."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+_STATUS_CODES = _EnumCodes(TASK_STATUSES)
+_PRIORITY_CODES = _EnumCodes(TASK_PRIORITIES)
+_TYPE_CODES = _EnumCodes(TASK_TYPES)
+
+def _pack_uuid(value: Optional[str]):
+    """Returns the 16-byte form of a canonical UUID string; other values are kept as is."""
+    try:
+        packed = uuid.UUID(value)
+    except (ValueError, TypeError, AttributeError):
+        return value
+    return packed.bytes if str(packed) == value else value
+
+def _unpack_uuid(value) -> Optional[str]:
+    """Reverses _pack_uuid."""
+    return str(uuid.UUID(bytes=value)) if type(value) is bytes else value
+
+class CompactTask:
+    """A memory-light, slotted variant of Task with the same attributes.
+
+    status, priority and task_type are stored as small interned integer codes
+    (materialized back to their strings on access), equal timestamps share one
+    datetime object, and with compact_uuids=True the id and parent_id are kept
+    as 16 raw bytes instead of 36-character strings. Reading and assigning
+    attributes works exactly like on Task, so the TUI and TaskManager can use
+    either class.
+    """
+    __slots__ = ("_id", "display_id", "title", "description", "_status", "_priority",
+                 "_task_type", "_parent_id", "created_at", "updated_at", "revision")
+
+    def __init__(self, id: Optional[str] = None, display_id: int = 0, title: str = "",
+                 description: str = "", status: str = "To Do", priority: str = "Medium",
+                 task_type: str = "Task", parent_id: Optional[str] = None,
+                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None,
+                 revision: int = 0, compact_uuids: bool = False):
+        """Initializes the task; arguments mirror the Task fields.
+
+        Args:
+            compact_uuids: If True, store id and parent_id as 16-byte UUIDs.
+        """
+        task_id = id if id is not None else str(uuid.uuid4())
+        self._id = _pack_uuid(task_id) if compact_uuids else task_id
+        self.display_id = display_id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.task_type = task_type
+        self.parent_id = parent_id
+        self.created_at = created_at if created_at is not None else datetime.now(timezone.utc)
+        # Share the datetime object when both timestamps are equal
+        self.updated_at = self.created_at if updated_at is None or updated_at == self.created_at else updated_at
+        self.revision = revision
+
+    @classmethod
+    def from_task(cls, task: Task, compact_uuids: bool = False) -> "CompactTask":
+        """Creates a CompactTask holding the same values as a Task."""
+        return cls(*_get_task_fields(task), compact_uuids=compact_uuids)
+
+    def to_task(self) -> Task:
+        """Returns the values as a regular Task dataclass."""
+        return Task(*_get_task_fields(self))
+
+    @property
+    def id(self) -> str:
+        return _unpack_uuid(self._id)
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = _pack_uuid(value) if type(self._id) is bytes else value
+
+    @property
+    def parent_id(self) -> Optional[str]:
+        return _unpack_uuid(self._parent_id)
+
+    @parent_id.setter
+    def parent_id(self, value: Optional[str]) -> None:
+        self._parent_id = _pack_uuid(value) if type(self._id) is bytes else value
+
+    @property
+    def status(self) -> str:
+        return _STATUS_CODES.values[self._status]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._status = _STATUS_CODES.encode(value)
+
+    @property
+    def priority(self) -> str:
+        return _PRIORITY_CODES.values[self._priority]
+
+    @priority.setter
+    def priority(self, value: str) -> None:
+        self._priority = _PRIORITY_CODES.encode(value)
+
+    @property
+    def task_type(self) -> str:
+        return _TYPE_CODES.values[self._task_type]
+
+    @task_type.setter
+    def task_type(self, value: str) -> None:
+        self._task_type = _TYPE_CODES.encode(value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Task, CompactTask)):
+            return NotImplemented
+        return _get_task_fields(self) == _get_task_fields(other)
+
+    __hash__ = None # Mutable, like the Task dataclass
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(_TASK_FIELD_NAMES, _get_task_fields(self)))
+        return f"CompactTask({values})"
+
+# Code stored in every coded column of a deleted (tombstoned) row
+_DEAD_CODE = 0xFF
+
+@functools.lru_cache(maxsize=None)
+def _code_selector(codes: frozenset[int]) -> bytes:
+    """Translation table mapping the given code bytes to 1 and every other byte to 0."""
+    return bytes(int(value in codes) for value in range(256))
+
+# Translation table mapping live rows to 1 and tombstones to 0
+_LIVE_SELECTOR = bytes(int(value != _DEAD_CODE) for value in range(256))
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Returns NumPy, imported on first use so processes that never build
+    TaskColumns (e.g. the CLI) start faster, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError: # Optional: TaskColumns falls back to the array module
+        return None
+    return numpy
+
+class TaskColumns:
+    """Columnar copy of the task fields used for bulk filtering and counting.
+
+    Row i describes one task: status, priority and task_type as interned
+    one-byte codes (array 'B'), the row of its parent (array 'q', -1 for roots
+    and parents not loaded yet) and created_at/updated_at as epoch seconds
+    (array 'd'). Filters build a 0/1 byte per row with bytes.translate and
+    combine them with big-integer AND; counts use bytes.count. With NumPy
+    installed the same masks are NumPy vector operations. Either way the
+    per-row work runs in C instead of a Python loop over Task objects.
+    Deleted rows are tombstoned and reclaimed once they make up half of the table.
+    """
+    CODED_FIELDS = {"status": _STATUS_CODES, "priority": _PRIORITY_CODES, "task_type": _TYPE_CODES}
+
+    def __init__(self, tasks: Iterable[Task] = (), use_numpy: Optional[bool] = None):
+        """Initializes the columns from the given tasks.
+
+        Args:
+            tasks: The tasks to index, in insertion order.
+            use_numpy: Use NumPy for filters and counts. Defaults to True when it is installed.
+        """
+        if use_numpy is not False:
+            np = _numpy()
+            if use_numpy and np is None:
+                raise ImportError("use_numpy=True requires NumPy to be installed")
+            use_numpy = np is not None
+        self.use_numpy = use_numpy
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Replaces all rows with the given tasks."""
+        self.ids: list[Optional[str]] = [] # Task ID per row, None for deleted rows
+        self.rows: dict[str, int] = {}
+        self.codes = {name: array("B") for name in self.CODED_FIELDS}
+        self.parent_rows = array("q")
+        self.created = array("d")
+        self.updated = array("d")
+        # Rows whose parent has not been appended yet (e.g. children streamed before parents)
+        self._unresolved: dict[int, str] = {}
+        self._waiting_children: dict[str, list[int]] = {}
+        for task in tasks:
+            self.append(task)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _encode(self, name: str, value: str) -> int:
+        """Returns the one-byte code of a field value."""
+        code = self.CODED_FIELDS[name].encode(value)
+        if code >= _DEAD_CODE:
+            raise ValueError(f"TaskColumns supports at most {_DEAD_CODE} distinct {name} values")
+        return code
+
+    def append(self, task: Task) -> None:
+        """Adds a row for a new task."""
+        row = len(self.ids)
+        for name, column in self.codes.items():
+            column.append(self._encode(name, getattr(task, name)))
+        self.ids.append(task.id)
+        self.rows[task.id] = row
+        self.parent_rows.append(-1)
+        self.created.append(task.created_at.timestamp())
+        self.updated.append(task.updated_at.timestamp())
+        self._set_parent(row, task.parent_id)
+        # Resolve children that referenced this task before it was loaded
+        for child_row in self._waiting_children.pop(task.id, ()):
+            if self._unresolved.get(child_row) == task.id:
+                del self._unresolved[child_row]
+                self.parent_rows[child_row] = row
+
+    def update(self, task: Task) -> None:
+        """Refreshes the row of an existing task after it changed."""
+        row = self.rows[task.id]
+        for name, column in self.codes.items():
+            column[row] = self._encode(name, getattr(task, name))
+        self.updated[row] = task.updated_at.timestamp()
+        self._set_parent(row, task.parent_id)
+
+    def remove(self, task_id: str) -> None:
+        """Tombstones the row of a deleted task."""
+        row = self.rows.pop(task_id)
+        self.ids[row] = None
+        for column in self.codes.values():
+            column[row] = _DEAD_CODE
+        self.parent_rows[row] = -1
+        self.created[row] = self.updated[row] = float("nan") # Never matches a time filter
+        self._unresolved.pop(row, None)
+        if len(self.ids) > 2 * len(self.rows):
+            self._compact()
+
+    def _set_parent(self, row: int, parent_id: Optional[str]) -> None:
+        """Points a row at its parent's row, or waits for the parent to be appended."""
+        waiting_for = self._unresolved.pop(row, None)
+        parent_row = self.rows.get(parent_id, -1) if parent_id is not None else -1
+        self.parent_rows[row] = parent_row
+        if parent_id is not None and parent_row < 0:
+            self._unresolved[row] = parent_id
+            if waiting_for != parent_id:
+                self._waiting_children.setdefault(parent_id, []).append(row)
+
+    def _compact(self) -> None:
+        """Drops tombstoned rows, renumbering the remaining ones."""
+        alive = [row for row, task_id in enumerate(self.ids) if task_id is not None]
+        new_row = {old: new for new, old in enumerate(alive)}
+        self.ids = [self.ids[row] for row in alive]
+        self.rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        self.codes = {name: array("B", (column[row] for row in alive)) for name, column in self.codes.items()}
+        self.parent_rows = array("q", (new_row.get(self.parent_rows[row], -1) for row in alive))
+        self.created = array("d", (self.created[row] for row in alive))
+        self.updated = array("d", (self.updated[row] for row in alive))
+        self._unresolved = {new_row[row]: parent_id for row, parent_id in self._unresolved.items()}
+        self._waiting_children = {}
+        for row, parent_id in self._unresolved.items():
+            self._waiting_children.setdefault(parent_id, []).append(row)
+
+    def mask(self, status: Union[str, Iterable[str], None] = None,
+             priority: Union[str, Iterable[str], None] = None,
+             task_type: Union[str, Iterable[str], None] = None, parent_id: Optional[str] = None,
+             updated_since: Optional[datetime] = None) -> bytes:
+        """Returns one byte per row, 1 for the live tasks matching all given filters.
+
+        Args:
+            status: Only tasks with this status (or any of these statuses).
+            priority: Only tasks with this priority (or any of these priorities).
+            task_type: Only tasks of this type (or any of these types).
+            parent_id: Only direct children of this task.
+            updated_since: Only tasks updated at or after this time ("changed since").
+        """
+        row_count = len(self.ids)
+        coded = [] # (column, accepted codes)
+        for name, wanted in (("status", status), ("priority", priority), ("task_type", task_type)):
+            if wanted is not None:
+                known = self.CODED_FIELDS[name].codes
+                codes = frozenset(known[value] for value in ((wanted,) if isinstance(wanted, str) else wanted)
+                                  if value in known)
+                if not codes:
+                    return bytes(row_count) # Values never seen, nothing can match
+                coded.append((self.codes[name], codes))
+        parent_row = None
+        if parent_id is not None:
+            parent_row = self.rows.get(parent_id)
+            if parent_row is None:
+                return bytes(row_count)
+        threshold = updated_since.timestamp() if updated_since is not None else None
+
+        if self.use_numpy:
+            np = _numpy()
+            selected = np.frombuffer(self.codes["status"], dtype=np.uint8) != _DEAD_CODE
+            for column, codes in coded:
+                values = np.frombuffer(column, dtype=np.uint8)
+                selected &= values == next(iter(codes)) if len(codes) == 1 else np.isin(values, list(codes))
+            if parent_row is not None:
+                selected &= np.frombuffer(self.parent_rows, dtype=np.int64) == parent_row
+            if threshold is not None:
+                selected &= np.frombuffer(self.updated, dtype=np.float64) >= threshold
+            return selected.tobytes()
+
+        # One 0/1 byte string per condition, ANDed together as big integers
+        masks = [column.tobytes().translate(_code_selector(codes)) for column, codes in coded]
+        if parent_row is not None:
+            masks.append(bytes(map(parent_row.__eq__, self.parent_rows)))
+        if threshold is not None:
+            masks.append(bytes(map(threshold.__le__, self.updated))) # NaN (deleted) is never >=
+        if not masks:
+            return self.codes["status"].tobytes().translate(_LIVE_SELECTOR)
+        if len(masks) == 1:
+            return masks[0]
+        combined = functools.reduce(operator.and_, (int.from_bytes(mask, "little") for mask in masks))
+        return combined.to_bytes(row_count, "little")
+
+    def match_rows(self, **filters) -> list[int]:
+        """Returns the rows (in insertion order) of the tasks matching all filters (see mask)."""
+        selected = self.mask(**filters)
+        if selected.count(1) * 16 < len(selected): # Sparse: jump from match to match
+            return [match.start() for match in re.finditer(b"\x01", selected)]
+        return list(itertools.compress(range(len(selected)), selected))
+
+    def match_ids(self, **filters) -> list[str]:
+        """Returns the IDs (in insertion order) of the tasks matching all filters (see mask)."""
+        return list(itertools.compress(self.ids, self.mask(**filters)))
+
+    def count_by(self, field_name: str) -> dict[str, int]:
+        """Counts the live tasks per value of status, priority or task_type."""
+        values = self.CODED_FIELDS[field_name].values
+        if self.use_numpy:
+            np = _numpy()
+            counts = enumerate(np.bincount(np.frombuffer(self.codes[field_name], dtype=np.uint8)).tolist())
+        else:
+            data = self.codes[field_name].tobytes()
+            counts = ((code, data.count(code)) for code in range(len(values)))
+        return {values[code]: count for code, count in counts if count and code != _DEAD_CODE}
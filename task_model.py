@@ -0,0 +1,113 @@
+"""
+Task data model for the AI Pair Programming Task Manager.
+
+Defines the Task dataclass with the known values of its enum-like fields, and
+the TaskStorage interface the persistence backends implement. Every other
+module builds on these.
+"""
+
+import operator
+import uuid
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Literal, Optional, Protocol
+
+# Known values of the enum-like Task fields, in cycling order
+TASK_STATUSES = ("To Do", "In Progress", "Done", "Blocked")
+TASK_PRIORITIES = ("Low", "Medium", "High", "Critical")
+TASK_TYPES = ("Epic", "Story", "Task", "Bug")
+
+@dataclass
+class Task:
+    """Represents a single task in the Task Manager."""
+    """Represents a single task, encapsulating its properties and metadata.
+
+    Attributes:
+        id (str): Unique identifier for the task (UUID string). Used internally.
+        display_id (int): Sequential, human-readable identifier for display.
+        title (str): Short description or name of the task.
+        description (str): More detailed description of the task.
+        status (Literal): Current status (e.g., "To Do", "In Progress").
+        priority (Literal): Priority level (e.g., "Low", "Medium", "High").
+        task_type (Literal): Agile classification (e.g., "Epic", "Story", "Task").
+        parent_id (Optional[str]): UUID ID of the parent task, if any.
+        created_at (datetime): Timestamp when the task was created.
+        updated_at (datetime): Timestamp when the task was last updated.
+        revision (int): Number of times the task was saved; a writer whose change
+                        was based on an older revision rebases it (see TaskManager).
+    """
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    display_id: int = 0 # Will be assigned by TaskManager
+    title: str = ""
+    description: str = ""
+    status: Literal["To Do", "In Progress", "Done", "Blocked"] = "To Do"
+    priority: Literal["Low", "Medium", "High", "Critical"] = "Medium"
+    task_type: Literal["Epic", "Story", "Task", "Bug"] = "Task"
+    parent_id: Optional[str] = None # Still stores the UUID
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: Optional[datetime] = None # Allow None initially
+    revision: int = 0 # Bumped by TaskManager each time the task is saved
+
+    def __post_init__(self):
+        """Ensure updated_at is set to created_at initially if not provided."""
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+
+# Task fields in declaration order, and a getter returning all of them as a tuple
+_TASK_FIELD_NAMES = tuple(f.name for f in fields(Task))
+_get_task_fields = operator.attrgetter(*_TASK_FIELD_NAMES)
+
+# A pending change: (task UUID ID, current Task or None if the task was deleted)
+TaskChange = tuple[str, Optional[Task]]
+
+@dataclass
+class ExternalChanges:
+    """Changes another process made to a task store since it was last read or written.
+
+    Attributes:
+        tasks (dict): Maps task UUID IDs to their stored Task, or None if the task was deleted.
+        complete (bool): True if the store had to be re-read in full, so `tasks` holds
+                         every stored task and tasks missing from it were deleted.
+    """
+    tasks: dict[str, Optional[Task]] = field(default_factory=dict)
+    complete: bool = False
+
+class TaskStorage(Protocol):
+    """Interface of the persistence backends used by TaskManager.
+
+    Backends with `incremental = True` receive only the changed tasks through
+    save_changes(); the others are handed the complete task list via save_all().
+    The default backend is json_storage.JsonFileStorage, which can also report
+    changes made by other processes (see TaskManager.reload_external_changes);
+    see sqlite_storage.SqliteTaskStorage for an indexed SQLite engine.
+
+    Backends may also provide query(), taking the criteria of TaskManager.query
+    and answering from their own indexes (see _storage_query). TaskManager uses
+    it while tasks are still being streamed in, and the headless CLI uses it
+    instead of loading every task.
+    """
+    incremental: bool
+
+    def load(self) -> list[Task]:
+        """Returns all stored tasks in insertion order."""
+        ...
+
+    def iter_load(self) -> Iterator[Task]:
+        """Streams the stored tasks in insertion order, one at a time."""
+        ...
+
+    def save_all(self, tasks: list[Task]) -> None:
+        """Replaces the stored tasks with the given list."""
+        ...
+
+    def save_changes(self, changes: list[TaskChange]) -> None:
+        """Persists only the given added/updated/deleted tasks."""
+        ...
+
+    def close(self) -> None:
+        """Finishes background work and releases resources (the backend stays reusable)."""
+        ...
+
+def _storage_query(storage: TaskStorage) -> Optional[Callable[..., Iterator[Task]]]:
+    """Returns the storage's optional query() method, or None if it has none."""
+    return getattr(storage, "query", None)
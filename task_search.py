@@ -0,0 +1,238 @@
+"""
+Full-text search index for the AI Pair Programming Task Manager.
+
+TaskSearchIndex maps the words of task titles and descriptions to the tasks
+containing them, so searches answer from the index instead of scanning every
+task.
+"""
+
+import bisect
+import heapq
+import itertools
+import operator
+import re
+from collections import Counter
+from collections.abc import Container
+from typing import Iterable, Optional
+
+from task_model import Task
+
+# Words indexed and searched: runs of letters, digits and underscores, lowercased
+_WORD_RE = re.compile(r"\w+")
+
+def _tokenize(text: str) -> list[str]:
+    """Splits text into lowercase search tokens."""
+    return _WORD_RE.findall(text.lower())
+
+class TaskSearchIndex:
+    """Inverted full-text index over task titles and descriptions.
+
+    Each token maps to the tasks containing it, bucketed by weight (title
+    occurrences count TITLE_WEIGHT times, description occurrences once), and
+    a sorted vocabulary turns a query prefix into the range of tokens it
+    matches with two binary searches. Each task also keeps its own token
+    weights, so a candidate can be scored against every term directly.
+    """
+    TITLE_WEIGHT = 3
+    # Shorter query terms only match whole tokens (a single letter would match half the vocabulary)
+    MIN_PREFIX_LENGTH = 2
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """Initializes the index from the given tasks."""
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Replaces the indexed tasks with the given ones."""
+        # Token -> weight -> task IDs (dicts used as insertion-ordered sets)
+        self._postings: dict[str, dict[int, dict[str, None]]] = {}
+        self._task_tokens: dict[str, dict[str, int]] = {} # Task ID -> token -> weight
+        self._vocabulary: Optional[list[str]] = None # Sorted tokens, rebuilt lazily after bulk adds
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._task_tokens)
+
+    def _weights(self, task: Task) -> dict[str, int]:
+        """Returns the weight of each token of a task."""
+        weights = Counter(_tokenize(task.description))
+        for token in _tokenize(task.title):
+            weights[token] += self.TITLE_WEIGHT
+        return dict(weights)
+
+    def add(self, task: Task) -> None:
+        """Indexes a new task."""
+        weights = self._weights(task)
+        self._task_tokens[task.id] = weights
+        for token, weight in weights.items():
+            self._add_posting(token, task.id, weight)
+
+    def update(self, task: Task) -> None:
+        """Re-indexes a task after its title or description changed."""
+        old_weights = self._task_tokens.get(task.id, {})
+        weights = self._weights(task)
+        if weights == old_weights:
+            return
+        for token, weight in old_weights.items():
+            if weights.get(token) != weight:
+                self._remove_posting(token, task.id, weight)
+        for token, weight in weights.items():
+            if old_weights.get(token) != weight:
+                self._add_posting(token, task.id, weight)
+        self._task_tokens[task.id] = weights
+
+    def remove(self, task_id: str) -> None:
+        """Drops a deleted task from the index."""
+        for token, weight in self._task_tokens.pop(task_id, {}).items():
+            self._remove_posting(token, task_id, weight)
+
+    def _add_posting(self, token: str, task_id: str, weight: int) -> None:
+        buckets = self._postings.get(token)
+        if buckets is None:
+            buckets = self._postings[token] = {}
+            if self._vocabulary is not None:
+                bisect.insort(self._vocabulary, token)
+        buckets.setdefault(weight, {})[task_id] = None
+
+    def _remove_posting(self, token: str, task_id: str, weight: int) -> None:
+        buckets = self._postings[token]
+        bucket = buckets[weight]
+        del bucket[task_id]
+        if not bucket:
+            del buckets[weight]
+            if not buckets:
+                del self._postings[token]
+                if self._vocabulary is not None:
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _expand(self, term: str) -> list[str]:
+        """Returns the indexed tokens a query term matches (itself, and longer tokens it prefixes)."""
+        if len(term) < self.MIN_PREFIX_LENGTH:
+            return [term] if term in self._postings else []
+        return self._prefixed(term)
+
+    def _prefixed(self, prefix: str) -> list[str]:
+        """Returns the indexed tokens starting with prefix, in sorted order."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        # Every token starting with prefix sorts before prefix + the highest code point
+        end = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff", start)
+        return self._vocabulary[start:end]
+
+    def prefix_ids(self, prefix: str) -> set[str]:
+        """Returns the IDs of the tasks with a title or description word starting with prefix.
+
+        Unlike search(), even one-character prefixes are expanded.
+        """
+        task_ids: set[str] = set()
+        for token in self._prefixed(prefix.lower()):
+            for bucket in self._postings[token].values():
+                task_ids.update(bucket)
+        return task_ids
+
+    def _score(self, task_id: str, terms: list[tuple[str, list[str], set[str]]]) -> int:
+        """Returns a task's score for a query: per term, the weight of its best matching
+        token, doubled for a whole-word match, summed; 0 if any term does not match."""
+        weights = self._task_tokens[task_id]
+        total = 0
+        for term, tokens, token_set in terms:
+            if len(tokens) == 1:
+                weight = weights.get(tokens[0])
+                if weight is None:
+                    return 0
+                total += weight * 2 if tokens[0] == term else weight
+            else:
+                best = 0
+                for token in token_set.intersection(weights):
+                    best = max(best, weights[token] * 2 if token == term else weights[token])
+                if not best:
+                    return 0
+                total += best
+        return total
+
+    def search(self, query: str, limit: Optional[int] = None,
+               candidates: Optional[Container[str]] = None) -> list[tuple[str, int]]:
+        """Finds the tasks containing every term of the query, best matches first.
+
+        Terms match whole tokens or, from MIN_PREFIX_LENGTH characters on, token
+        prefixes (so results narrow as the query is typed); see _score for the
+        ranking. The weight buckets of each term are visited best first and the
+        search stops as soon as no task left unvisited could enter the top
+        `limit`, so a broad prefix does not cost a pass over every match.
+
+        Args:
+            query: The search text.
+            limit: Maximum number of results (None = all).
+            candidates: Optional IDs of the only tasks that may match (e.g. the
+                        result of a filter). Applied during the walk, so the
+                        top `limit` are the best of these tasks.
+
+        Returns:
+            (task ID, score) pairs sorted by descending score; ties in the order found.
+        """
+        terms = []
+        for term in dict.fromkeys(_tokenize(query)):
+            tokens = self._expand(term)
+            if not tokens:
+                return [] # Every term must match
+            terms.append((term, tokens, set(tokens)))
+        if not terms:
+            return []
+        # Per term: (score, task IDs) for each weight bucket of its tokens, best first
+        levels = []
+        for term, tokens, _ in terms:
+            term_levels = [(weight * 2 if token == term else weight, bucket)
+                           for token in tokens for weight, bucket in self._postings[token].items()]
+            term_levels.sort(key=operator.itemgetter(0), reverse=True)
+            levels.append(term_levels)
+        positions = [0] * len(levels)
+
+        top: list[tuple[int, int, str]] = [] # Min-heap of (score, -order found, task ID)
+        seen: set[str] = set()
+        found = 0
+        # Once one term's buckets are exhausted, every task matching all terms has been seen
+        while all(position < len(term_levels) for position, term_levels in zip(positions, levels)):
+            # The best score any task not seen yet can still reach
+            threshold = sum(term_levels[position][0] for position, term_levels in zip(positions, levels))
+            if limit is not None and len(top) >= limit and top[0][0] >= threshold:
+                break
+            # Visit the smallest next bucket: the cheapest way to lower the threshold
+            term_index = min(range(len(levels)), key=lambda i: len(levels[i][positions[i]][1]))
+            _, bucket = levels[term_index][positions[term_index]]
+            positions[term_index] += 1
+            unseen = list(itertools.filterfalse(seen.__contains__, bucket))
+            seen.update(unseen)
+            if candidates is not None:
+                unseen = list(filter(candidates.__contains__, unseen))
+            # Drop the tasks missing another term before scoring (map/compress keep this in C)
+            for other_index, (_, tokens, token_set) in enumerate(terms):
+                if other_index == term_index or not unseen:
+                    continue
+                weights = map(self._task_tokens.__getitem__, unseen)
+                if len(tokens) == 1:
+                    matches = map(operator.contains, weights, itertools.repeat(tokens[0]))
+                else:
+                    matches = map(operator.not_, map(token_set.isdisjoint, weights))
+                unseen = list(itertools.compress(unseen, matches))
+            for task_id in unseen:
+                found += 1
+                entry = (self._score(task_id, terms), -found, task_id)
+                if limit is None or len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+                if limit is not None and len(top) >= limit and top[0][0] >= threshold:
+                    break # The rest of this bucket cannot do better
+        return [(task_id, score) for score, _, task_id in sorted(top, reverse=True)]
+
+    @classmethod
+    def highlight_pattern(cls, query: str) -> Optional[re.Pattern]:
+        """Returns a case-insensitive regex matching the words the query's terms match
+        (for highlighting results), or None for an empty query."""
+        terms = sorted(set(_tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return None
+        alternatives = (re.escape(term) + (r"\w*" if len(term) >= cls.MIN_PREFIX_LENGTH else r"\b")
+                        for term in terms)
+        return re.compile(rf"\b(?:{'|'.join(alternatives)})", re.IGNORECASE)
@@ -0,0 +1,197 @@
+"""
+JSON serializer and streaming parser for task snapshots.
+
+Writes tasks as a JSON array field by field, and reads the array back one
+element at a time, so neither direction holds more than one record in
+flight beyond the tasks themselves.
+"""
+
+import functools
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from task_model import Task, _TASK_FIELD_NAMES, _get_task_fields
+
+# --- JSON Persistence Functions ---
+
+def _datetime_encoder(obj):
+    """JSON encoder for datetime objects."""
+    """Custom JSON encoder to serialize datetime objects into ISO 8601 format.
+    
+    Raises:
+        TypeError: If the object is not a datetime object.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+
+def _datetime_decoder(dct):
+    """JSON decoder hook for datetime objects."""
+    """Custom JSON object hook to deserialize ISO 8601 strings back into 
+    datetime objects for specific keys ('created_at', 'updated_at').
+    If a datetime string is parsed successfully but lacks timezone info,
+    it is assumed to be UTC.
+    """
+    for key, value in dct.items():
+        # Basic ISO format check (adjust if using different formats)
+        if isinstance(value, str) and len(value) > 10 and value[10] == 'T': 
+            try:
+                # Attempt to parse common datetime fields
+                if key in ['created_at', 'updated_at']:
+                    dt = datetime.fromisoformat(value)
+                    # If the parsed datetime is naive (no tzinfo), assume UTC
+                    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+                        dt = dt.replace(tzinfo=timezone.utc)
+                    dct[key] = dt
+            except ValueError:
+                pass # Ignore if parsing fails, leave as string
+    return dct
+
+# --- Task Serialization ---
+# Tasks are written field by field instead of via dataclasses.asdict + json.dump:
+# asdict deep-copies every value and json.dump with an indent runs the pure-Python
+# encoder. The indented output is byte-for-byte what json.dump(indent=4) produced.
+
+_encode_json_string = json.encoder.encode_basestring_ascii # C-accelerated when available
+
+@functools.lru_cache(maxsize=1 << 17)
+def _encode_timestamp(value: datetime) -> str:
+    """Returns the JSON string literal for a datetime, cached across saves."""
+    return _encode_json_string(value.isoformat())
+
+def _encode_json_value(value) -> str:
+    """Encodes a single task field value as JSON text."""
+    value_type = type(value)
+    if value_type is str:
+        return _encode_json_string(value)
+    if value is None:
+        return "null"
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is datetime:
+        return _encode_timestamp(value)
+    # Uncommon values (bools, floats, nested data) use the generic encoder
+    return json.dumps(value, default=_datetime_encoder)
+
+def task_to_dict(task: Task) -> dict:
+    """Returns a shallow field-name -> value dict for a task (no deep copy, unlike asdict)."""
+    return dict(zip(_TASK_FIELD_NAMES, _get_task_fields(task)))
+
+def write_tasks_json(tasks: Iterable[Task], f, compact: bool = False) -> None:
+    """Serializes tasks as a JSON array straight into a text file object.
+
+    Args:
+        tasks: The Task objects to write.
+        f: A writable text file object.
+        compact: If True, write without indentation or spaces. Otherwise the
+                 output matches json.dump(..., indent=4).
+    """
+    if compact:
+        keys = [_encode_json_string(name) + ":" for name in _TASK_FIELD_NAMES]
+        opening, field_separator, closing = "{", ",", "}"
+        first, separator, end, empty = "[", ",", "]", "[]"
+    else:
+        keys = ["        " + _encode_json_string(name) + ": " for name in _TASK_FIELD_NAMES]
+        opening, field_separator, closing = "{\n", ",\n", "\n    }"
+        first, separator, end, empty = "[\n    ", ",\n    ", "\n]", "[]"
+    prefix = first
+    wrote_any = False
+    for task in tasks:
+        values = _get_task_fields(task)
+        f.write(prefix + opening + field_separator.join(
+            [key + _encode_json_value(value) for key, value in zip(keys, values)]
+        ) + closing)
+        prefix = separator
+        wrote_any = True
+    f.write(end if wrote_any else empty)
+
+def _write_snapshot(tasks: list[Task], file_path: str, compact: bool = False):
+    """Atomically writes a list of Task objects to a JSON file.
+
+    The data is written to a temporary file next to the target, which then
+    replaces the target, so readers never observe a half-written snapshot.
+
+    Raises:
+        IOError, TypeError: If writing or serialization fails.
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        write_tasks_json(tasks, f, compact=compact)
+    os.replace(tmp_path, file_path)
+
+def _read_snapshot(file_path: str) -> list[Task]:
+    """Reads the Task objects stored in a JSON snapshot file.
+
+    Raises:
+        json.JSONDecodeError, FileNotFoundError, TypeError: On unreadable data.
+    """
+    return list(_iter_snapshot(file_path))
+
+def _iter_snapshot(file_path: str) -> Iterator[Task]:
+    """Streams the Task objects stored in a JSON snapshot file."""
+    decoder = json.JSONDecoder(object_hook=_datetime_decoder)
+    with open(file_path, 'r') as f:
+        for data in _iter_json_array(f, decoder):
+            # Filter out any potential None values from malformed data
+            if data is not None:
+                yield Task(**data)
+
+# Characters read from disk at a time by the streaming parser
+_STREAM_CHUNK_SIZE = 64 * 1024
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def _iter_json_array(f, decoder: json.JSONDecoder, chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator:
+    """Incrementally parses a top-level JSON array, yielding one element at a time.
+
+    Only the unparsed tail of the text is buffered: each element is decoded
+    with `raw_decode` as soon as it is complete, and more text is read from
+    `f` only when the buffer runs out mid-element.
+
+    Raises:
+        json.JSONDecodeError: On invalid JSON.
+        TypeError: If the document is valid JSON but not an array.
+    """
+    buffer, pos, eof = "", 0, False
+    state = "start" # start -> first (value or ']') -> separator -> value -> separator ...
+    while True:
+        pos = _JSON_WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                message = "Expecting value" if state in ("start", "value") else "Unterminated array"
+                raise json.JSONDecodeError(message, buffer, pos)
+            chunk = f.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                decoder.raw_decode(buffer, pos) # Raises the natural error for invalid JSON
+                raise TypeError("Task file must contain a JSON array")
+            pos += 1
+            state = "first"
+        elif state == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            state = "value"
+        elif state == "first" and char == "]":
+            return
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None # Element incomplete; read more below
+            if end is None or (end == len(buffer) and not eof):
+                # Need more text to finish (or be sure we finished) this element
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield value
+            pos = end
+            state = "separator"
@@ -0,0 +1,136 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from AI_Pair_Programming_Task_Manager import Task, TaskManager, save_tasks_to_json
+from sqlite_storage import SqliteTaskStorage, migrate_json_to_sqlite, main
+
+class TestSqliteTaskStorage(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the database."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "tasks.db")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_task_manager_round_trip(self):
+        """Test tasks added, updated and deleted through TaskManager are persisted row by row."""
+        manager = TaskManager(storage=SqliteTaskStorage(self.db_path))
+        epic_id = manager.add_task({"title": "Epic", "task_type": "Epic"})
+        story_id = manager.add_task({"title": "Story", "task_type": "Story", "parent_id": epic_id})
+        bug_id = manager.add_task({"title": "Bug", "task_type": "Bug"})
+        manager.update_task(story_id, {"status": "Done"})
+        manager.delete_task(bug_id)
+        manager.close()
+
+        reloaded = TaskManager(storage=SqliteTaskStorage(self.db_path))
+
+        self.assertEqual([t.id for t in reloaded.tasks], [epic_id, story_id]) # Update kept the row order
+        story = reloaded.get_task(story_id)
+        self.assertEqual(story.status, "Done")
+        self.assertEqual(story.parent_id, epic_id)
+        self.assertIsInstance(story.updated_at, datetime)
+        self.assertEqual(reloaded.get_by_display_id(1).id, epic_id)
+        reloaded.close()
+
+    def test_adds_revision_column_to_old_database(self):
+        """Test a database created before tasks had revisions gains the column on open."""
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("CREATE TABLE tasks (id TEXT PRIMARY KEY, display_id INTEGER NOT NULL, title TEXT NOT NULL, "
+                           "description TEXT NOT NULL, status TEXT NOT NULL, priority TEXT NOT NULL, "
+                           "task_type TEXT NOT NULL, parent_id TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)")
+        connection.execute("INSERT INTO tasks VALUES ('a', 1, 'Old', '', 'To Do', 'Medium', 'Task', NULL, "
+                           "'2024-01-01T00:00:00+00:00', '2024-01-01T00:00:00+00:00')")
+        connection.commit()
+        connection.close()
+
+        manager = TaskManager(storage=SqliteTaskStorage(self.db_path))
+        self.assertEqual(manager.get_task("a").revision, 0)
+        manager.update_task("a", {"status": "Done"})
+        manager.close()
+
+        storage = SqliteTaskStorage(self.db_path)
+        self.assertEqual(storage.load()[0].revision, 1)
+        storage.close()
+
+    def test_query_filters(self):
+        """Test query() combines the filters and honours updated_since."""
+        storage = SqliteTaskStorage(self.db_path)
+        now = datetime.now(timezone.utc)
+        old = Task(title="Old bug", task_type="Bug", status="Blocked", updated_at=now - timedelta(days=2))
+        new = Task(title="New bug", task_type="Bug", status="Blocked", updated_at=now)
+        other = Task(title="Story", task_type="Story", status="Blocked")
+        storage.save_all([old, new, other])
+
+        self.assertEqual([t.id for t in storage.query(status="Blocked", task_type="Bug")], [old.id, new.id])
+        self.assertEqual([t.id for t in storage.query(task_type="Bug", updated_since=now - timedelta(hours=1))], [new.id])
+        storage.close()
+
+    def test_query_matches_task_manager(self):
+        """Test query() takes TaskManager.query's criteria and returns the same tasks in the same order."""
+        storage = SqliteTaskStorage(self.db_path)
+        manager = TaskManager(storage=storage)
+        epic_id = manager.add_task({"title": "Epic", "task_type": "Epic"})
+        for i, priority in enumerate(("Low", "Critical", "Medium", "Critical", "High")):
+            manager.add_task({"title": f"Task {i}", "priority": priority, "parent_id": epic_id,
+                              "task_type": "Bug" if i % 2 else "Task"})
+        manager.add_task({"title": "Odd", "priority": "Someday"})
+
+        for criteria in ({"order_by": "-priority"}, {"order_by": "priority", "limit": 3},
+                         {"priority": ("High", "Critical"), "parent": epic_id},
+                         {"task_type": "Bug", "order_by": "title"}, {"order_by": "-updated_at", "limit": 2}):
+            with self.subTest(**criteria):
+                # Unordered results come in the order of the index used, so only compare them as sets
+                compare = self.assertEqual if "order_by" in criteria else self.assertCountEqual
+                compare([t.id for t in storage.query(**criteria)], [t.id for t in manager.query(**criteria)])
+        with self.assertRaises(ValueError):
+            storage.query(order_by="colour")
+        manager.close()
+
+    def test_lazy_manager_queries_storage(self):
+        """Test a TaskManager still streaming its tasks in answers query() from the database."""
+        storage = SqliteTaskStorage(self.db_path)
+        storage.save_all([Task(title=f"Task {i}", display_id=i + 1, status="Done" if i % 2 else "To Do")
+                          for i in range(6)])
+        manager = TaskManager(storage=storage, lazy_load=True)
+        loaded = next(manager.load_incrementally(batch_size=2))
+
+        done = list(manager.query(status="Done"))
+        self.assertEqual([t.title for t in done], ["Task 1", "Task 3", "Task 5"])
+        self.assertIs(done[0], loaded[1]) # Loaded tasks are the managed objects
+        self.assertTrue(manager.is_loading)
+        manager.close()
+
+    def test_filters_use_indexes(self):
+        """Test the filter columns are indexed."""
+        SqliteTaskStorage(self.db_path).close()
+        connection = sqlite3.connect(self.db_path)
+        for column in ("status", "priority", "task_type", "parent_id", "updated_at"):
+            plan = connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE {column} = ?", ("x",)
+            ).fetchall()
+            self.assertIn(f"idx_tasks_{column}", str(plan))
+        connection.close()
+
+    def test_migrate_from_json(self):
+        """Test the migrate command copies every task from a JSON file."""
+        json_path = os.path.join(self.temp_dir, "tasks.json")
+        tasks = [Task(title=f"Task {i}", display_id=i + 1) for i in range(3)]
+        save_tasks_to_json(tasks, json_path)
+
+        self.assertEqual(main(["migrate", json_path, self.db_path]), 0)
+
+        storage = SqliteTaskStorage(self.db_path)
+        self.assertEqual([t.id for t in storage.load()], [t.id for t in tasks])
+        self.assertEqual(migrate_json_to_sqlite(json_path, self.db_path), 3) # Re-running replaces, not duplicates
+        self.assertEqual(len(storage.load()), 3)
+        storage.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,13 +14,30 @@ from AI_Pair_Programming_Task_Manager import load_tasks_from_json, save_tasks_to
 from AI_Pair_Programming_Task_Manager import Task, TaskManager, load_tasks_from_json, save_tasks_to_json
 from AI_Pair_Programming_Task_Manager import Task, TaskManager, load_tasks_from_json, save_tasks_to_json
 from AI_Pair_Programming_Task_Manager import Task, TaskManager, load_tasks_from_json, save_tasks_to_json
-from dataclasses import dataclass, field
-from datetime import datetime
+from AI_Pair_Programming_Task_Manager import compact_journal, iter_tasks_from_json, write_tasks_json
+from task_serialization import _iter_json_array, _datetime_decoder, _datetime_encoder
+from AI_Pair_Programming_Task_Manager import CompactTask, TaskColumns, TaskSearchIndex, TaskSnapshot
+from AI_Pair_Programming_Task_Manager import rotate_journal, compact_rotated_journal, lock_task_store, read_store_version
+from AI_Pair_Programming_Task_Manager import append_journal_record
+from AI_Pair_Programming_Task_Manager import TASK_STATUSES, TASK_PRIORITIES
+from file_watcher import FileWatcher
+from async_task_manager import AsyncTaskManager
+import task_cli
+from dataclasses import dataclass, field, asdict, replace
+from datetime import datetime, timezone
 from typing import Optional, Literal
 import uuid
 import json # Add json import
 import os   # Add os import for file handling
 import tempfile # Add tempfile import
+import shutil
+import io
+import time
+import asyncio
+import threading
+import multiprocessing
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock # Add mock imports
 from unittest.mock import patch, MagicMock, PropertyMock # Import PropertyMock
 
@@ -93,7 +110,7 @@ class TestTaskManager(unittest.TestCase):
     #     if os.path.exists(self.test_json_path):
     #         os.remove(self.test_json_path)
 
-    @patch('AI_Pair_Programming_Task_Manager.load_tasks_from_json')
+    @patch('json_storage.load_tasks_from_json')
     def test_init_loads_tasks(self, mock_load):
         """Test TaskManager.__init__ calls load_tasks_from_json."""
         # Arrange: Setup the mock to return predefined tasks
@@ -112,9 +129,9 @@ class TestTaskManager(unittest.TestCase):
         self.assertEqual(manager.tasks[1].title, "Loaded Task 2")
 
     # Patch save_tasks_to_json for add_task test
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     # Also patch load_tasks_from_json for setup, return empty list initially
-    @patch('AI_Pair_Programming_Task_Manager.load_tasks_from_json') 
+    @patch('json_storage.load_tasks_from_json') 
     def test_add_task(self, mock_load, mock_save):
         """
         Test that a new task can be added to the manager.
@@ -198,7 +215,7 @@ class TestTaskManager(unittest.TestCase):
         # Assert: Check None was returned
         self.assertIsNone(retrieved_task)
 
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     def test_update_task_found(self, mock_save):
         """Test updating an existing task's details."""
         # Arrange: Setup manager with a task
@@ -223,7 +240,7 @@ class TestTaskManager(unittest.TestCase):
         # Assert: Check save was called
         mock_save.assert_called_once_with(manager.tasks, self.test_json_path)
 
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     def test_update_task_not_found(self, mock_save):
         """Test updating a non-existent task returns False and doesn't save."""
         # Arrange: Setup empty manager
@@ -239,7 +256,7 @@ class TestTaskManager(unittest.TestCase):
         self.assertFalse(result, "update_task should return False for non-existent ID")
         mock_save.assert_not_called()
 
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     def test_update_task_ignores_protected_fields(self, mock_save):
         """Test that update_task ignores attempts to change id or created_at."""
         # Arrange
@@ -261,7 +278,7 @@ class TestTaskManager(unittest.TestCase):
         self.assertEqual(updated_task.title, "New Title") # Title should change
         mock_save.assert_called_once()
 
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     def test_delete_task_found(self, mock_save):
         """Test deleting an existing task removes it and saves."""
         # Arrange
@@ -281,7 +298,7 @@ class TestTaskManager(unittest.TestCase):
         self.assertIsNone(manager.get_task(task1.id), "Deleted task should not be findable")
         mock_save.assert_called_once_with(manager.tasks, self.test_json_path)
         
-    @patch('AI_Pair_Programming_Task_Manager.save_tasks_to_json')
+    @patch('json_storage.save_tasks_to_json')
     def test_delete_task_not_found(self, mock_save):
         """Test deleting a non-existent task returns False and doesn't save."""
         # Arrange
@@ -300,7 +317,7 @@ class TestTaskManager(unittest.TestCase):
         mock_save.assert_not_called()
 
     def test_get_all_tasks_property(self):
-        """Test the tasks property returns the internal list."""
+        """Test the tasks property returns a snapshot whose list of tasks cannot change."""
         # Arrange
         manager = TaskManager(file_path=self.test_json_path)
         task1 = Task(title="Task A")
@@ -311,12 +328,578 @@ class TestTaskManager(unittest.TestCase):
         retrieved_tasks = manager.tasks # Access the property
         
         # Assert
-        self.assertIsInstance(retrieved_tasks, list)
+        self.assertIsInstance(retrieved_tasks, TaskSnapshot)
         self.assertEqual(len(retrieved_tasks), 2)
-        self.assertIs(retrieved_tasks, manager._tasks) # Check it returns the actual internal list object
+        self.assertIs(retrieved_tasks, manager.tasks) # Unchanged tasks: the same snapshot is handed out again
+        self.assertEqual(retrieved_tasks, [task1, task2])
         self.assertEqual(retrieved_tasks[0].title, "Task A")
         self.assertEqual(retrieved_tasks[1].title, "Task B")
 
+class TestTaskManagerIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Use a path that never exists so nothing is loaded from disk."""
+        self.test_json_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.json")
+
+    @patch('json_storage.load_tasks_from_json')
+    def test_indexes_built_on_load(self, mock_load):
+        """Test loaded tasks can be found by UUID and display ID."""
+        task1 = Task(title="Loaded 1", display_id=1)
+        task2 = Task(title="Loaded 2", display_id=2)
+        mock_load.return_value = [task1, task2]
+
+        manager = TaskManager(file_path=self.test_json_path)
+
+        self.assertIs(manager.get_task(task2.id), task2)
+        self.assertIs(manager.get_by_display_id(1), task1)
+        self.assertIsNone(manager.get_by_display_id(3))
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_indexes_follow_add_and_delete(self, mock_save):
+        """Test add and delete keep the ID indexes and list order in step."""
+        manager = TaskManager(file_path=self.test_json_path)
+        first_id = manager.add_task({"title": "First"})
+        second_id = manager.add_task({"title": "Second"})
+        third_id = manager.add_task({"title": "Third"})
+
+        self.assertTrue(manager.delete_task(second_id))
+
+        self.assertIsNone(manager.get_task(second_id))
+        self.assertIsNone(manager.get_by_display_id(2))
+        self.assertEqual(manager.get_by_display_id(3).id, third_id)
+        self.assertEqual([t.id for t in manager.tasks], [first_id, third_id])
+        self.assertFalse(manager.delete_task(second_id))
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_snapshots_are_list_stable_and_share_chunks(self, mock_save):
+        """Test a snapshot keeps its tasks through later adds and deletes, sharing full chunks."""
+        manager = TaskManager(file_path=self.test_json_path)
+        with manager.batch():
+            task_ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(TaskSnapshot.CHUNK_SIZE + 10)])
+        before = manager.tasks
+
+        added_id = manager.add_task({"title": "Added"})
+        after_add = manager.tasks
+        manager.delete_task(task_ids[0])
+
+        self.assertEqual([task.id for task in before], task_ids)
+        self.assertIs(after_add._chunks[0], before._chunks[0]) # The full chunk is shared, not copied
+        self.assertEqual((after_add[-1].id, after_add[-2].id), (added_id, task_ids[-1]))
+        self.assertEqual([task.id for task in reversed(after_add)], [added_id] + task_ids[::-1])
+        self.assertEqual([task.id for task in after_add[1:3]], task_ids[1:3])
+        self.assertEqual([task.id for task in manager.tasks], task_ids[1:] + [added_id])
+        with self.assertRaises(IndexError):
+            before[len(task_ids)]
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_task_copy_never_sees_half_an_update(self, mock_save):
+        """Test task_copy() returns fields from one moment while get_task() returns the live object."""
+        manager = TaskManager(file_path=self.test_json_path)
+        task_id = manager.add_task({"title": "Copied"})
+        live = manager.get_task(task_id)
+        copied = manager.task_copy(task_id)
+        done = threading.Event()
+        torn: list[tuple] = []
+
+        def write():
+            for i in range(300):
+                manager.update_task(task_id, {"title": f"Title {i}", "description": f"Title {i}"})
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            snapshot = manager.task_copy(task_id)
+            if snapshot.title != snapshot.description and snapshot.description:
+                torn.append((snapshot.title, snapshot.description))
+        writer.join()
+
+        self.assertEqual(torn, [])
+        self.assertEqual(copied.title, "Copied") # Later updates do not reach the copy
+        self.assertEqual(live.title, "Title 299")
+        self.assertIsNone(manager.task_copy("missing"))
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_snapshot_readers_do_not_wait_for_a_save(self, mock_save):
+        """Test `tasks` is returned while a synchronous save holds the manager's lock."""
+        manager = TaskManager(file_path=self.test_json_path)
+        manager.add_task({"title": "First"})
+        saving, release = threading.Event(), threading.Event()
+        mock_save.side_effect = lambda *args, **kwargs: (saving.set(), release.wait(5))
+        for mutate in (lambda: manager.add_task({"title": "Second"}),
+                       lambda: manager.delete_task(manager.tasks[0].id)):
+            saving.clear()
+            release.clear()
+            writer = threading.Thread(target=mutate)
+            writer.start()
+            self.assertTrue(saving.wait(5))
+            seen = []
+            reader = threading.Thread(target=lambda: seen.append([task.title for task in manager.tasks]))
+            reader.start()
+            reader.join(timeout=2)
+            self.assertFalse(reader.is_alive()) # Did not wait for the save
+            release.set()
+            writer.join()
+            self.assertEqual(seen, [[task.title for task in manager.tasks]]) # Already includes the change
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_readers_iterate_while_writers_mutate(self, mock_save):
+        """Test threads iterating snapshots see a consistent list while another thread adds and deletes."""
+        manager = TaskManager(file_path=self.test_json_path)
+        done = threading.Event()
+        errors: list[str] = []
+
+        def write():
+            for i in range(300):
+                task_id = manager.add_task({"title": f"Task {i}"})
+                if i % 3 == 0:
+                    manager.delete_task(task_id)
+            done.set()
+
+        def read():
+            while not done.is_set():
+                snapshot = manager.tasks
+                listed = list(snapshot)
+                if len(listed) != len(snapshot) or len({task.id for task in listed}) != len(listed):
+                    errors.append(f"Torn snapshot of {len(snapshot)} tasks")
+                if listed != list(snapshot): # Unchanged while the writer went on
+                    errors.append("Snapshot changed after it was taken")
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(manager.tasks), 200)
+
+class TestTaskManagerHierarchy(unittest.TestCase):
+
+    def setUp(self):
+        """Build epic -> (story -> task, bug), listed out of creation order."""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.epic = Task(title="Epic", display_id=1, created_at=base)
+        self.story = Task(title="Story", display_id=2, parent_id=self.epic.id, created_at=base.replace(hour=2))
+        self.bug = Task(title="Bug", display_id=3, parent_id=self.epic.id, created_at=base.replace(hour=1))
+        self.task = Task(title="Task", display_id=4, parent_id=self.story.id, created_at=base.replace(hour=3))
+        self.tasks = [self.task, self.story, self.epic, self.bug] # Children before parents
+
+    def make_manager(self, **kwargs) -> TaskManager:
+        with patch('json_storage.load_tasks_from_json', return_value=list(self.tasks)):
+            return TaskManager(file_path="dummy.json", **kwargs)
+
+    def titles(self, tasks) -> list[str]:
+        return [task.title for task in tasks]
+
+    def test_index_built_on_load(self):
+        """Test children are sorted by creation time and the tree walks in display order."""
+        manager = self.make_manager()
+        self.assertEqual(self.titles(manager.children_of(self.epic.id)), ["Bug", "Story"])
+        self.assertEqual(self.titles(manager.children_of(None)), ["Epic"])
+        self.assertEqual(self.titles(manager.ancestors_of(self.task.id)), ["Story", "Epic"])
+        self.assertEqual(manager.depth_of(self.task.id), 2)
+        self.assertEqual(self.titles(manager.subtree_of(self.story.id)), ["Story", "Task"])
+        self.assertEqual([(task.title, level) for task, level in manager.walk_tree()],
+                         [("Epic", 0), ("Bug", 1), ("Story", 1), ("Task", 2)])
+
+    def test_with_ancestors_limits_walk(self):
+        """Test a filter set closed over ancestors keeps matches under their parents."""
+        manager = self.make_manager()
+        visible = manager.with_ancestors([self.task.id, "unknown-id"])
+        self.assertEqual(visible, {self.task.id, self.story.id, self.epic.id})
+        self.assertEqual([(task.title, level) for task, level in manager.walk_tree(only=visible)],
+                         [("Epic", 0), ("Story", 1), ("Task", 2)])
+
+    def test_lazy_load_links_children_loaded_first(self):
+        """Test orphans streamed before their parent are moved under it once it arrives."""
+        storage = MagicMock(incremental=False)
+        storage.iter_load.return_value = iter(self.tasks)
+        manager = TaskManager(storage=storage, lazy_load=True)
+        batches = manager.load_incrementally(batch_size=1)
+        next(batches)
+        self.assertEqual(self.titles(manager.children_of(None)), ["Task"]) # Parent not loaded yet
+        list(batches)
+        self.assertEqual(self.titles(manager.children_of(None)), ["Epic"])
+        self.assertEqual(self.titles(manager.subtree_of(self.epic.id)), ["Epic", "Bug", "Story", "Task"])
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_index_follows_mutations(self, mock_save):
+        """Test add, re-parent, delete and rollback keep the index equal to a full rebuild."""
+        manager = self.make_manager()
+        new_id = manager.add_task({"title": "New", "parent_id": self.bug.id})
+        manager.update_task(self.story.id, {"parent_id": None})
+        self.assertEqual(self.titles(manager.children_of(None)), ["Epic", "Story"])
+        self.assertEqual(self.titles(manager.ancestors_of(new_id)), ["Bug", "Epic"])
+
+        manager.delete_task(self.bug.id) # "New" becomes an orphan shown as a root
+        self.assertEqual(self.titles(manager.children_of(None)), ["Epic", "Story", "New"])
+        self.assertEqual(manager.ancestors_of(new_id), [])
+
+        with self.assertRaises(RuntimeError), manager.batch():
+            manager.update_task(self.task.id, {"parent_id": self.epic.id})
+            raise RuntimeError("rolled back")
+
+        incremental = {parent: self.titles(children) for parent, children in manager._children.items()}
+        manager._rebuild_hierarchy()
+        rebuilt = {parent: self.titles(children) for parent, children in manager._children.items()}
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(self.titles(manager.children_of(self.story.id)), ["Task"])
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_update_rejects_parent_cycles(self, mock_save):
+        """Test moving a task under itself or a descendant raises and changes nothing."""
+        manager = self.make_manager()
+        for new_parent in (self.epic.id, self.story.id, self.task.id):
+            with self.assertRaises(ValueError):
+                manager.update_task(self.epic.id, {"parent_id": new_parent, "title": "Moved"})
+        self.assertEqual((self.epic.title, self.epic.parent_id), ("Epic", None))
+        mock_save.assert_not_called()
+        new_id = manager.add_task({"title": "New", "parent_id": self.task.id})
+        with self.assertRaises(ValueError):
+            manager.update_task(self.story.id, {"parent_id": new_id}) # Linked after the index was built
+        self.assertTrue(manager.update_task(self.bug.id, {"parent_id": new_id}))
+        self.assertEqual(manager.depth_of(self.bug.id), 4)
+
+    def test_cycles_in_loaded_data_are_shown(self):
+        """Test tasks whose parents loop back to them are shown as roots instead of dropped."""
+        first = Task(title="First", display_id=5, created_at=datetime(2024, 1, 2, tzinfo=timezone.utc))
+        second = Task(title="Second", display_id=6, parent_id=first.id, created_at=first.created_at)
+        under = Task(title="Under", display_id=7, parent_id=second.id, created_at=first.created_at.replace(hour=1))
+        first.parent_id = second.id
+        self.tasks += [first, second, under]
+        storage = MagicMock(incremental=False)
+        storage.iter_load.return_value = iter([replace(task) for task in self.tasks]) # Own copies to edit
+        lazy = TaskManager(storage=storage, lazy_load=True)
+        list(lazy.load_incrementally(batch_size=2))
+        for manager in (lazy, self.make_manager()):
+            self.assertEqual([(task.title, level) for task, level in manager.walk_tree()][4:],
+                             [("First", 0), ("Second", 1), ("Under", 2)])
+            self.assertFalse(manager.in_subtree_of(first.id, second.id))
+            self.assertEqual(manager.depth_of(under.id), 2)
+            with patch('json_storage.save_tasks_to_json'):
+                manager.update_task(second.id, {"parent_id": None}) # Breaks the cycle
+            self.assertEqual([(task.title, level) for task, level in manager.walk_tree()][4:],
+                             [("Second", 0), ("First", 1), ("Under", 1)])
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_ancestor_index_matches_climbing(self, mock_save):
+        """Test in_subtree_of/depth_of agree with climbing parent links through random edits."""
+        import random
+        rng = random.Random(7)
+        manager = self.make_manager()
+
+        def climb(task_id):
+            chain = [task_id]
+            while manager.get_task(chain[-1]).parent_id in manager._tasks_by_id:
+                chain.append(manager.get_task(chain[-1]).parent_id)
+            return chain
+
+        for step in range(150):
+            ids = [task.id for task in manager.tasks]
+            action = rng.random()
+            if action < 0.4:
+                manager.add_task({"title": f"T{step}", "parent_id": rng.choice(ids + [None])})
+            elif action < 0.85:
+                task_id, parent_id = rng.choice(ids), rng.choice(ids + [None])
+                if parent_id is not None and task_id in climb(parent_id):
+                    with self.assertRaises(ValueError):
+                        manager.update_task(task_id, {"parent_id": parent_id})
+                else:
+                    manager.update_task(task_id, {"parent_id": parent_id})
+            elif len(ids) > 3:
+                manager.delete_task(rng.choice(ids))
+            for task_id in rng.sample([task.id for task in manager.tasks], 3):
+                chain = climb(task_id)
+                self.assertEqual(manager.depth_of(task_id), len(chain) - 1)
+                for other in rng.sample([task.id for task in manager.tasks], 3):
+                    self.assertEqual(manager.in_subtree_of(task_id, other), other in chain)
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_cached_walk_follows_edits(self, mock_save):
+        """Test the cached walk equals a fresh walk after edits, re-walking only touched trees."""
+        import random
+        rng = random.Random(11)
+        manager = self.make_manager()
+        other_root = manager.add_task({"title": "Other"})
+        for i in range(5):
+            manager.add_task({"title": f"Other {i}", "parent_id": other_root})
+        manager.walk_tree()
+        other_walk = manager._root_walks[other_root]
+        manager.update_task(self.task.id, {"parent_id": self.bug.id, "status": "Done"})
+        manager.walk_tree()
+        self.assertIs(manager._root_walks[other_root], other_walk) # Not re-walked
+
+        for step in range(120):
+            ids = [task.id for task in manager.tasks]
+            action = rng.random()
+            if action < 0.4:
+                manager.add_task({"title": f"T{step}", "parent_id": rng.choice(ids + [None])})
+            elif action < 0.8:
+                task_id, parent_id = rng.choice(ids), rng.choice(ids + [None])
+                if parent_id is None or not manager.in_subtree_of(parent_id, task_id):
+                    manager.update_task(task_id, {"parent_id": parent_id})
+            elif action < 0.9 and len(ids) > 3:
+                manager.delete_task(rng.choice(ids))
+            else:
+                with self.assertRaises(RuntimeError), manager.batch():
+                    manager.update_task(rng.choice(ids), {"parent_id": None})
+                    raise RuntimeError("rolled back")
+            fresh = manager._walk_from(manager.children_of(None))
+            self.assertEqual(manager.walk_tree(), fresh)
+            visible = manager.with_ancestors(rng.sample(ids, 2))
+            self.assertEqual(manager.walk_tree(only=visible), manager._walk_from(
+                [root for root in manager.children_of(None) if root.id in visible], only=visible))
+
+class TestTaskManagerQuery(unittest.TestCase):
+
+    def setUp(self):
+        """Build 200 tasks cycling through the field values, half of them under one epic."""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.epic = Task(title="Epic", display_id=1, task_type="Epic", created_at=base, updated_at=base)
+        self.tasks = [self.epic]
+        for i in range(1, 200):
+            self.tasks.append(Task(
+                title=f"Task {i}", display_id=i + 1,
+                status=("To Do", "In Progress", "Done", "Blocked")[i % 4],
+                priority=("Low", "Medium", "High", "Critical")[i * 7 % 4 if i % 3 else 2],
+                task_type=("Story", "Task", "Bug")[i % 3],
+                parent_id=self.epic.id if i % 2 else None,
+                created_at=base, updated_at=base.replace(day=1 + i * 13 % 28)))
+
+    def make_manager(self, columnar: bool = False) -> TaskManager:
+        with patch('json_storage.load_tasks_from_json', return_value=list(self.tasks)):
+            return TaskManager(file_path="dummy.json", columnar=columnar)
+
+    def scan(self, manager, status=None, priority=None, task_type=None, parent=None, updated_since=None):
+        """The expected result of query(), as a set of IDs."""
+        def allowed(wanted, value):
+            return wanted is None or value in ((wanted,) if isinstance(wanted, str) else wanted)
+        return {task.id for task in manager.tasks
+                if allowed(status, task.status) and allowed(priority, task.priority)
+                and allowed(task_type, task.task_type) and (parent is None or task.parent_id == parent)
+                and (updated_since is None or task.updated_at >= updated_since)}
+
+    def check_queries(self, manager):
+        since = datetime(2024, 1, 20, tzinfo=timezone.utc)
+        for criteria in ({}, {"status": "In Progress"}, {"priority": ("High", "Critical"), "task_type": "Bug"},
+                         {"priority": ("High", "Critical"), "task_type": "Bug", "status": "In Progress"},
+                         {"parent": self.epic.id, "status": ("Done", "Blocked")}, {"updated_since": since},
+                         {"updated_since": since, "task_type": "Story", "parent": self.epic.id},
+                         {"status": "Unknown"}, {"parent": "missing-parent"}):
+            self.assertEqual({task.id for task in manager.query(**criteria)}, self.scan(manager, **criteria), criteria)
+
+    def test_combined_criteria(self):
+        """Test every combination of criteria matches a plain scan, lazily."""
+        manager = self.make_manager()
+        self.check_queries(manager)
+        self.assertNotIsInstance(manager.query(status="Done"), list)
+        self.check_queries(self.make_manager(columnar=True)) # Broad criteria are answered from the columns
+
+    def test_order_by_and_limit(self):
+        """Test ordering (workflow order for enum fields), descending order and limits."""
+        manager = self.make_manager()
+        by_priority = list(manager.query(task_type="Bug", order_by="-priority"))
+        self.assertEqual([task.priority for task in by_priority],
+                         sorted((task.priority for task in by_priority), key=("Low", "Medium", "High", "Critical").index,
+                                reverse=True))
+        self.assertEqual(by_priority[0].priority, "Critical")
+
+        newest = sorted(manager.tasks, key=lambda task: task.updated_at, reverse=True)
+        self.assertEqual([task.updated_at for task in manager.query(order_by="-updated_at", limit=5)],
+                         [task.updated_at for task in newest[:5]])
+        since = datetime(2024, 1, 25, tzinfo=timezone.utc)
+        self.assertEqual([task.updated_at for task in manager.query(updated_since=since, order_by="updated_at")],
+                         sorted(task.updated_at for task in manager.tasks if task.updated_at >= since))
+        self.assertEqual(len(list(manager.query(status="Done", limit=3))), 3)
+        self.assertEqual([task.title for task in manager.query(order_by="title", limit=2)], ["Epic", "Task 1"])
+        with self.assertRaises(ValueError):
+            manager.query(order_by="colour")
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_indexes_follow_mutations(self, mock_save):
+        """Test add, update, delete, rollback and lazy loading keep query() in sync."""
+        manager = self.make_manager()
+        bug_id = manager.add_task({"title": "New bug", "task_type": "Bug", "priority": "Critical",
+                                   "status": "In Progress", "parent_id": self.epic.id})
+        manager.update_task(self.tasks[3].id, {"status": "In Progress", "priority": "High"})
+        manager.delete_task(self.tasks[5].id)
+        with self.assertRaises(RuntimeError), manager.batch():
+            manager.update_task(self.tasks[6].id, {"status": "Done"})
+            raise RuntimeError("rolled back")
+        self.check_queries(manager)
+        self.assertEqual(next(manager.query(order_by="-updated_at")).id, self.tasks[3].id)
+        self.assertIn(bug_id, {task.id for task in manager.query(priority="Critical", task_type="Bug",
+                                                                 status="In Progress", parent=self.epic.id)})
+
+        storage = MagicMock(incremental=False)
+        storage.iter_load.return_value = iter(self.tasks)
+        lazy = TaskManager(storage=storage, lazy_load=True)
+        list(lazy.load_incrementally(batch_size=7))
+        self.check_queries(lazy)
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_parent_candidates(self, mock_save):
+        """Test parent candidates rank Epics/Stories first, match text and skip the edited subtree."""
+        manager = self.make_manager()
+        candidates = manager.parent_candidates()
+        self.assertNotIsInstance(candidates, list)
+        types = [task.task_type for task in candidates]
+        self.assertEqual(types, sorted(types, key=("Epic", "Story", "Task", "Bug").index))
+
+        matches = list(manager.parent_candidates("TASK 1"))
+        self.assertEqual({task.id for task in matches},
+                         {task.id for task in manager.tasks if task.title.startswith("Task 1")
+                          or task.title.startswith("Task") and str(task.display_id).startswith("1")})
+        self.assertEqual([task.task_type for task in matches[:2]], ["Story", "Story"])
+        self.assertEqual([task.title for task in manager.parent_candidates("150")],
+                         ["Task 150", "Task 149"]) # Title or display ID, the Story before the Bug
+        self.assertEqual(list(manager.parent_candidates("ask")), []) # Terms start words
+        with patch('json_storage.load_tasks_from_json', return_value=list(self.tasks)):
+            indexed = TaskManager(file_path="dummy.json", search_index=True) # Narrows through the index
+        for text in ("", "task 1", "150", "t 19", "ask", "epic", "missing"):
+            self.assertEqual([task.id for task in indexed.parent_candidates(text)],
+                             [task.id for task in self.make_manager().parent_candidates(text)], text)
+
+        child = self.tasks[1]
+        grandchild_id = manager.add_task({"title": "Grandchild", "parent_id": child.id})
+        excluded = {task.id for task in manager.parent_candidates(exclude_subtree_of=self.epic.id)}
+        self.assertTrue(excluded.isdisjoint({self.epic.id, child.id, grandchild_id}))
+        self.assertIn(self.tasks[2].id, excluded) # Not under the epic
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_parent_candidates_read_pages_lazily(self, mock_save):
+        """Test parent candidates read the type index a page at a time and survive changes between pages."""
+        manager = TaskManager(file_path="dummy.json")
+        epic_ids = manager.add_tasks([{"title": f"Epic {i}", "task_type": "Epic"} for i in range(200)])
+        with patch.object(TaskManager, "CANDIDATE_PAGE_SIZE", 10):
+            candidates = manager.parent_candidates()
+            first = [next(candidates).id for _ in range(5)]
+            manager.delete_task(epic_ids[150]) # Not read yet, so it is never listed
+            manager.delete_task(epic_ids[0]) # Resized while a page is pending
+            added_id = manager.add_task({"title": "Late epic", "task_type": "Epic"})
+            rest = [task.id for task in candidates if task.task_type == "Epic"]
+        self.assertEqual(first, epic_ids[:5])
+        self.assertEqual(first + rest, epic_ids[:150] + epic_ids[151:] + [added_id])
+
+class TestTaskManagerBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Use a path that never exists so nothing is loaded from disk."""
+        self.test_json_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.json")
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_batch_saves_once(self, mock_save):
+        """Test all mutations inside a batch are persisted with a single save."""
+        manager = TaskManager(file_path=self.test_json_path)
+        existing_id = manager.add_task({"title": "Existing"})
+        mock_save.reset_mock()
+
+        with manager.batch() as batch:
+            epic_id = manager.add_task({"title": "Epic", "task_type": "Epic"})
+            for i in range(3):
+                manager.add_task({"title": f"Story {i}", "task_type": "Story", "parent_id": epic_id})
+            manager.update_task(existing_id, {"priority": "High"})
+            mock_save.assert_not_called()
+
+        mock_save.assert_called_once_with(manager.tasks, self.test_json_path)
+        self.assertEqual(batch.count, 5)
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_batch_rolls_back_on_exception(self, mock_save):
+        """Test an exception inside a batch restores the previous state without saving."""
+        manager = TaskManager(file_path=self.test_json_path)
+        keep_id = manager.add_task({"title": "Keep", "status": "To Do"})
+        drop_id = manager.add_task({"title": "Drop"})
+        mock_save.reset_mock()
+
+        with self.assertRaises(RuntimeError):
+            with manager.batch():
+                manager.update_task(keep_id, {"status": "Done", "title": "Changed"})
+                manager.delete_task(drop_id)
+                manager.add_task({"title": "Discarded"})
+                raise RuntimeError("abort")
+
+        mock_save.assert_not_called()
+        self.assertEqual([t.id for t in manager.tasks], [keep_id, drop_id])
+        self.assertEqual(manager.get_task(keep_id).status, "To Do")
+        self.assertEqual(manager.get_task(keep_id).title, "Keep")
+        next_id = manager.add_task({"title": "Next"})
+        self.assertEqual(manager.get_task(next_id).display_id, 3) # Display IDs were rolled back too
+
+    @patch('json_storage.save_tasks_to_json')
+    def test_bulk_methods(self, mock_save):
+        """Test add_tasks, update_tasks and delete_tasks each save once and report their results."""
+        manager = TaskManager(file_path=self.test_json_path)
+
+        task_ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(4)])
+        changed = manager.update_tasks({
+            task_ids[0]: {"priority": "Critical"},
+            task_ids[1]: {"priority": "Medium"}, # Unchanged value
+            str(uuid.uuid4()): {"priority": "Low"}, # Unknown task
+        })
+
+        deleted = manager.delete_tasks([task_ids[2], task_ids[3], str(uuid.uuid4())])
+
+        self.assertEqual(len(task_ids), 4)
+        self.assertEqual(changed, 1)
+        self.assertEqual(deleted, 2)
+        self.assertEqual(mock_save.call_count, 3)
+        self.assertEqual(manager.get_task(task_ids[0]).priority, "Critical")
+        self.assertEqual([task.id for task in manager.tasks], task_ids[:2])
+
+class TestDeferredPersistence(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the task file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_mutations_only_mark_dirty(self):
+        """Test mutations are not written until the debounce interval passes or flush() is called."""
+        manager = TaskManager(file_path=self.task_path, save_delay=60)
+        task_id = manager.add_task({"title": "Deferred"})
+        manager.update_task(task_id, {"status": "Done"})
+
+        self.assertEqual(manager.pending_changes, 1)
+        self.assertFalse(os.path.exists(self.task_path))
+
+        manager.close()
+
+        self.assertEqual(manager.pending_changes, 0)
+        loaded_tasks = load_tasks_from_json(self.task_path)
+        self.assertEqual(loaded_tasks[0].status, "Done")
+
+    def test_background_writer_flushes_after_delay(self):
+        """Test the writer thread saves on its own once changes have settled."""
+        manager = TaskManager(file_path=self.task_path, save_delay=0.05)
+        manager.add_task({"title": "Auto-saved"})
+
+        deadline = time.monotonic() + 5
+        while (manager.pending_changes or manager.is_flushing) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual([t.title for t in load_tasks_from_json(self.task_path)], ["Auto-saved"])
+        manager.close()
+
+    def test_deferred_journal_mode(self):
+        """Test deferred saves in journal mode append only the changed tasks."""
+        manager = TaskManager(file_path=self.task_path, journal=True, save_delay=60)
+        task_id = manager.add_task({"title": "One"})
+        for status in ("In Progress", "Done", "Blocked"):
+            manager.update_task(task_id, {"status": status})
+        manager.flush()
+
+        with open(self.task_path + ".journal") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 1) # Four changes to one task coalesced into one record
+        self.assertEqual(records[0]["task"]["status"], "Blocked")
+        manager.close()
+
 class TestTaskDataclass(unittest.TestCase):
     
     def test_task_creation_defaults(self):
@@ -474,8 +1057,8 @@ class TestJsonPersistence(unittest.TestCase):
         # A more robust solution might involve patching 'print' or using logging module.
         
         # Let's try capturing logs from the module where load_tasks_from_json resides
-        # Assuming the module name is AI_Pair_Programming_Task_Manager
-        with self.assertLogs('AI_Pair_Programming_Task_Manager', level='ERROR') as cm:
+        # (json_storage, which AI_Pair_Programming_Task_Manager re-exports it from)
+        with self.assertLogs('json_storage', level='ERROR') as cm:
             loaded_tasks = load_tasks_from_json(self.temp_path)
             
         self.assertEqual(loaded_tasks, [])
@@ -483,6 +1066,986 @@ class TestJsonPersistence(unittest.TestCase):
         self.assertIn(f"Error loading tasks from {self.temp_path}", cm.output[0])
         self.assertIn("Expecting value", cm.output[0]) # Check for part of the JSONDecodeError message
 
+class TestJournalPersistence(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory holding the snapshot and its journal."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+        self.journal_path = self.task_path + ".journal"
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_mutations_append_journal_records(self):
+        """Test journal mode appends one record per mutation and leaves the snapshot alone."""
+        manager = TaskManager(file_path=self.task_path, journal=True)
+        keep_id = manager.add_task({"title": "Keep"})
+        drop_id = manager.add_task({"title": "Drop"})
+        manager.update_task(keep_id, {"status": "Done"})
+        manager.delete_task(drop_id)
+
+        self.assertFalse(os.path.exists(self.task_path)) # No full rewrite happened
+        with open(self.journal_path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["op"] for r in records], ["put", "put", "put", "del"])
+        self.assertEqual(records[3]["id"], drop_id)
+
+    def test_load_replays_snapshot_and_journal(self):
+        """Test load_tasks_from_json applies journaled changes on top of the snapshot."""
+        task1 = Task(title="Snapshot 1")
+        task2 = Task(title="Snapshot 2")
+        save_tasks_to_json([task1, task2], self.task_path)
+        manager = TaskManager(file_path=self.task_path, journal=True)
+        manager.update_task(task1.id, {"title": "Renamed"})
+        manager.delete_task(task2.id)
+        new_id = manager.add_task({"title": "Journaled"})
+
+        loaded_tasks = load_tasks_from_json(self.task_path)
+
+        self.assertEqual([t.id for t in loaded_tasks], [task1.id, new_id])
+        self.assertEqual(loaded_tasks[0].title, "Renamed")
+        self.assertIsInstance(loaded_tasks[1].created_at, datetime)
+
+    def test_journal_compacts_into_snapshot(self):
+        """Test the journal is folded into the snapshot once it passes the threshold."""
+        manager = TaskManager(file_path=self.task_path, journal=True, journal_compact_bytes=1)
+        task_ids = [manager.add_task({"title": f"Task {i}"}) for i in range(5)]
+        manager.wait_for_compaction()
+        compact_journal(self.task_path) # Fold any records appended during the last compaction
+
+        self.assertFalse(os.path.exists(self.journal_path))
+        with open(self.task_path) as f:
+            snapshot_ids = [data["id"] for data in json.load(f)]
+        self.assertEqual(snapshot_ids, task_ids)
+
+    def test_full_save_discards_journal(self):
+        """Test a full save supersedes the journal so stale records are not replayed."""
+        manager = TaskManager(file_path=self.task_path, journal=True)
+        task_id = manager.add_task({"title": "Old"})
+        task = manager.get_task(task_id)
+        task.title = "New"
+        save_tasks_to_json(manager.tasks, self.task_path)
+
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(load_tasks_from_json(self.task_path)[0].title, "New")
+
+class TestExternalChanges(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory shared by two managers (two "processes")."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_journal_tail_is_merged_by_uuid(self):
+        """Test only the appended journal records are parsed and merged, and own writes are skipped."""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        epic = Task(title="Epic", display_id=1, task_type="Epic", created_at=base)
+        story = Task(title="Story", display_id=2, created_at=base.replace(hour=1))
+        gone = Task(title="Gone", display_id=3, created_at=base.replace(hour=2))
+        save_tasks_to_json([epic, story, gone], self.task_path)
+        ours = TaskManager(file_path=self.task_path, journal=True, columnar=True, search_index=True)
+        theirs = TaskManager(file_path=self.task_path, journal=True)
+        own_id = ours.add_task({"title": "Ours"})
+
+        self.assertEqual(ours.reload_external_changes().count, 0) # Our own record
+
+        theirs.reload_external_changes()
+        new_id = theirs.add_task({"title": "Theirs"})
+        theirs.update_task(story.id, {"parent_id": epic.id, "status": "Done"})
+        theirs.delete_task(gone.id)
+        with patch('json_storage.iter_tasks_from_json') as mock_reread:
+            merge = ours.reload_external_changes()
+        mock_reread.assert_not_called() # The snapshot was not re-read
+
+        self.assertEqual((merge.added_ids, merge.updated_ids, merge.deleted_ids),
+                         ({new_id}, {story.id}, {gone.id}))
+        self.assertEqual(merge.moved_ids, {story.id})
+        self.assertTrue(merge.rows_changed)
+        self.assertEqual([task.title for task, _ in ours.walk_tree()], ["Epic", "Story", "Ours", "Theirs"])
+        self.assertEqual(ours.get_task(new_id).display_id, theirs.get_task(new_id).display_id)
+        self.assertEqual(ours.count_by("status"), {"To Do": 3, "Done": 1})
+        self.assertEqual([task.id for task in ours.search("theirs")], [new_id])
+        self.assertEqual([task.id for task in ours.query(status="Done")], [story.id])
+        self.assertIsNone(ours.get_task(gone.id))
+        self.assertEqual(ours.reload_external_changes().count, 0) # Nothing new
+        self.assertIn(own_id, {task.id for task in load_tasks_from_json(self.task_path)})
+
+    def test_replaced_snapshot_is_reread_in_full(self):
+        """Test a snapshot rewritten by another process is diffed against the loaded tasks."""
+        keep, rename, drop = Task(title="Keep", display_id=1), Task(title="Rename", display_id=2), Task(title="Drop", display_id=3)
+        save_tasks_to_json([keep, rename, drop], self.task_path)
+        ours = TaskManager(file_path=self.task_path)
+        ours.update_task(keep.id, {"priority": "High"})
+
+        with patch('json_storage.iter_tasks_from_json') as mock_reread:
+            self.assertEqual(ours.reload_external_changes().count, 0) # Our own save
+        mock_reread.assert_not_called()
+
+        stored = {task.id: task for task in load_tasks_from_json(self.task_path)}
+        stored[rename.id].title = "Renamed"
+        added = Task(title="Added", display_id=7)
+        save_tasks_to_json([stored[keep.id], stored[rename.id], added], self.task_path)
+        merge = ours.reload_external_changes()
+
+        self.assertEqual((merge.added_ids, merge.updated_ids, merge.deleted_ids), ({added.id}, {rename.id}, {drop.id}))
+        self.assertFalse(merge.moved_ids)
+        self.assertEqual([task.title for task in ours.tasks], ["Keep", "Renamed", "Added"])
+        self.assertEqual(ours.get_task(keep.id).priority, "High")
+        self.assertEqual(ours.add_task({"title": "Next"}) and ours.tasks[-1].display_id, 8)
+        # Our next save keeps their changes instead of overwriting them
+        self.assertEqual([task.title for task in load_tasks_from_json(self.task_path)],
+                         ["Keep", "Renamed", "Added", "Next"])
+
+    def test_unsaved_local_changes_win(self):
+        """Test tasks with pending (deferred) local changes keep the local version."""
+        task = Task(title="Shared", display_id=1)
+        save_tasks_to_json([task], self.task_path)
+        ours = TaskManager(file_path=self.task_path, journal=True, save_delay=60)
+        theirs = TaskManager(file_path=self.task_path, journal=True)
+        ours.update_task(task.id, {"title": "Local"})
+        theirs.update_task(task.id, {"title": "Remote"})
+
+        self.assertEqual(ours.reload_external_changes().count, 0)
+        self.assertEqual(ours.get_task(task.id).title, "Local")
+        ours.close()
+        self.assertEqual(load_tasks_from_json(self.task_path)[0].title, "Local")
+
+    def test_external_cycle_is_shown_as_root(self):
+        """Test a parent change that closes a cycle keeps every task reachable."""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        parent = Task(title="Parent", display_id=1, created_at=base)
+        child = Task(title="Child", display_id=2, parent_id=parent.id, created_at=base.replace(hour=1))
+        save_tasks_to_json([parent, child], self.task_path)
+        ours = TaskManager(file_path=self.task_path, journal=True)
+        stored = replace(parent, parent_id=child.id, updated_at=base.replace(hour=2))
+        with open(self.task_path + ".journal", "a") as f:
+            f.write(json.dumps({"op": "put", "task": asdict(stored)}, default=_datetime_encoder) + "\n")
+            f.write('{"op": "put", "task": {"title": "half-writ') # Still being appended
+
+        self.assertEqual(ours.reload_external_changes().moved_ids, {parent.id})
+        self.assertEqual([(task.title, level) for task, level in ours.walk_tree()], [("Parent", 0), ("Child", 1)])
+        self.assertEqual(ours.get_task(parent.id).parent_id, child.id)
+        with open(self.task_path + ".journal", "a") as f:
+            f.write('ten"}}\n') # The partial record was not consumed
+        self.assertEqual(ours.reload_external_changes().count, 1)
+
+    def test_follows_journal_into_rotated_segment(self):
+        """Test records appended just before another process rotated the journal are not lost."""
+        ours = TaskManager(file_path=self.task_path, journal=True)
+        theirs = TaskManager(file_path=self.task_path, journal=True)
+        first_id = theirs.add_task({"title": "Before rotation"})
+        rotate_journal(self.task_path)
+        second_id = theirs.add_task({"title": "After rotation"})
+
+        with patch('json_storage.iter_tasks_from_json') as mock_reread:
+            merge = ours.reload_external_changes()
+        mock_reread.assert_not_called()
+        self.assertEqual(merge.added_ids, {first_id, second_id})
+
+    def test_file_watcher_reports_changes(self):
+        """Test both watcher modes notice a task file being replaced."""
+        for use_inotify in (False, True):
+            if use_inotify and not FileWatcher(["x"], lambda: None).uses_inotify:
+                continue # No inotify on this platform
+            with self.subTest(use_inotify=use_inotify):
+                changed = threading.Event()
+                watcher = FileWatcher([self.task_path], changed.set, poll_interval=0.02,
+                                      use_inotify=use_inotify)
+                watcher.start()
+                try:
+                    save_tasks_to_json([Task(title=str(use_inotify))], self.task_path)
+                    self.assertTrue(changed.wait(5))
+                finally:
+                    watcher.stop()
+
+# Field each stress test worker keeps changing on the shared task, and the value of its i-th change
+_HAMMERED_FIELDS = (
+    ("title", lambda worker, i: f"Title {worker}.{i}"),
+    ("description", lambda worker, i: f"Description {worker}.{i}"),
+    ("status", lambda worker, i: TASK_STATUSES[(i + 1) % len(TASK_STATUSES)]), # Never the initial "To Do" first
+    ("priority", lambda worker, i: TASK_PRIORITIES[(i + 2) % len(TASK_PRIORITIES)]), # Nor "Medium"
+)
+
+def _hammer_store(task_path: str, journal: bool, worker: int, shared_id: str, iterations: int) -> None:
+    """Stress test worker (module level so it can run in a child process)."""
+    manager = TaskManager(file_path=task_path, journal=journal)
+    field_name, value = _HAMMERED_FIELDS[worker]
+    for i in range(iterations):
+        manager.update_task(shared_id, {field_name: value(worker, i)})
+        manager.add_task({"title": f"Worker {worker} task {i}"})
+    manager.close()
+
+class TestConcurrentWriters(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the shared task store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_store_version_counts_writes(self):
+        """Test every write, compaction included, bumps the store version under a re-entrant lock."""
+        self.assertEqual(read_store_version(self.task_path), 0)
+        manager = TaskManager(file_path=self.task_path, journal=True)
+        task_id = manager.add_task({"title": "One"})
+        manager.update_task(task_id, {"status": "Done"})
+        self.assertEqual(read_store_version(self.task_path), 2)
+
+        with lock_task_store(self.task_path):
+            with lock_task_store(self.task_path): # Re-entrant
+                save_tasks_to_json(manager.tasks, self.task_path)
+        self.assertEqual(read_store_version(self.task_path), 3)
+        manager.add_task({"title": "Two"})
+        rotate_journal(self.task_path)
+        compact_rotated_journal(self.task_path)
+        self.assertEqual(read_store_version(self.task_path), 5)
+        self.assertEqual(manager.get_task(task_id).revision, 2)
+
+    def test_compaction_builds_without_the_store_lock(self):
+        """Test writers are not blocked while the compacted snapshot is built, and their writes survive it."""
+        manager = TaskManager(file_path=self.task_path, journal=True)
+        first_id = manager.add_task({"title": "First"})
+        rotate_journal(self.task_path)
+        appended = []
+
+        def write_while_building(tasks, f, compact=False):
+            if not appended:
+                writer = threading.Thread(target=lambda: appended.append(append_journal_record(
+                    self.task_path, {"op": "del", "id": first_id})))
+                writer.start()
+                writer.join(timeout=5)
+                self.assertFalse(writer.is_alive()) # The store lock is free
+            write_tasks_json(tasks, f, compact=compact)
+
+        with patch('json_storage.write_tasks_json',
+                   side_effect=write_while_building) as mock_write:
+            compact_rotated_journal(self.task_path)
+        self.assertEqual(mock_write.call_count, 2) # Rebuilt once the version moved
+        self.assertFalse(os.path.exists(self.task_path + ".journal.1"))
+        self.assertEqual([task.title for task in load_tasks_from_json(self.task_path)], [])
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".compact")])
+        manager.close()
+
+    def test_conflicting_change_is_rebased_fieldwise(self):
+        """Test a writer re-applies only its own changed fields to a task changed by another process."""
+        for journal in (True, False):
+            with self.subTest(journal=journal):
+                shared = Task(title="Shared", display_id=1)
+                other = Task(title="Other", display_id=2)
+                save_tasks_to_json([shared, other], self.task_path)
+                ours = TaskManager(file_path=self.task_path, journal=journal)
+                theirs = TaskManager(file_path=self.task_path, journal=journal)
+                theirs.update_task(shared.id, {"status": "Done"})
+                theirs.update_task(other.id, {"title": "Renamed"})
+                added_id = theirs.add_task({"title": "Theirs"})
+
+                with patch('json_storage.iter_tasks_from_json',
+                           wraps=iter_tasks_from_json) as mock_reread:
+                    ours.update_task(shared.id, {"priority": "High"})
+                self.assertEqual(mock_reread.called, not journal) # Only a replaced snapshot is re-read
+
+                stored = {task.id: task for task in load_tasks_from_json(self.task_path)}
+                self.assertEqual((stored[shared.id].status, stored[shared.id].priority), ("Done", "High"))
+                self.assertEqual(stored[shared.id].revision, 2)
+                self.assertEqual(stored[other.id].title, "Renamed")
+                self.assertIn(added_id, stored)
+                self.assertEqual(ours.get_task(shared.id).status, "Done")
+                # Changes merged while saving are reported by the next reload
+                merge = ours.reload_external_changes()
+                self.assertEqual((merge.added_ids, merge.updated_ids), ({added_id}, {shared.id, other.id}))
+                self.assertEqual(ours.reload_external_changes().count, 0)
+                os.remove(self.task_path)
+                if os.path.exists(self.task_path + ".journal"):
+                    os.remove(self.task_path + ".journal")
+
+    def test_deletion_elsewhere_wins(self):
+        """Test a pending change to a task another process deleted is dropped, not resurrected."""
+        task = Task(title="Doomed", display_id=1)
+        save_tasks_to_json([task], self.task_path)
+        ours = TaskManager(file_path=self.task_path, journal=True, save_delay=60)
+        theirs = TaskManager(file_path=self.task_path, journal=True)
+        ours.update_task(task.id, {"title": "Edited"})
+        theirs.delete_task(task.id)
+
+        ours.close()
+
+        self.assertIsNone(ours.get_task(task.id))
+        self.assertEqual(load_tasks_from_json(self.task_path), [])
+
+    def test_many_processes_hammering_one_store(self):
+        """Stress test: concurrent writer processes lose neither tasks nor field changes."""
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        iterations = 25
+        for journal in (True, False):
+            with self.subTest(journal=journal):
+                shared = Task(title="Shared", display_id=1)
+                save_tasks_to_json([shared], self.task_path)
+                start_version = read_store_version(self.task_path)
+                workers = [context.Process(target=_hammer_store,
+                                           args=(self.task_path, journal, worker, shared.id, iterations))
+                           for worker in range(len(_HAMMERED_FIELDS))]
+                for process in workers:
+                    process.start()
+                for process in workers:
+                    process.join(120)
+                self.assertEqual([process.exitcode for process in workers], [0] * len(workers))
+
+                stored = load_tasks_from_json(self.task_path)
+                titles = {task.title for task in stored}
+                for worker in range(len(workers)):
+                    self.assertTrue({f"Worker {worker} task {i}" for i in range(iterations)} <= titles)
+                self.assertEqual(len(stored), 1 + len(workers) * iterations)
+                stored_shared = next(task for task in stored if task.id == shared.id)
+                for worker, (field_name, value) in enumerate(_HAMMERED_FIELDS):
+                    self.assertEqual(getattr(stored_shared, field_name), value(worker, iterations - 1))
+                # Every change of the shared task was a separate revision and every save a separate version
+                self.assertEqual(stored_shared.revision, len(workers) * iterations)
+                self.assertEqual(read_store_version(self.task_path) - start_version, 2 * len(workers) * iterations)
+                os.remove(self.task_path)
+                if os.path.exists(self.task_path + ".journal"):
+                    os.remove(self.task_path + ".journal")
+
+class TestAsyncTaskManager(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the task file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_mutations_leave_saving_to_the_debounced_writer(self):
+        """Test mutations only mark tasks dirty, a burst of them is written by one debounced save, and save() writes at once."""
+        manager = TaskManager(file_path=self.task_path, save_delay=0.2)
+        facade = AsyncTaskManager(manager)
+        real_save_all = manager.storage.save_all
+        saved: list[int] = [] # Tasks written by each save
+
+        def counting_save_all(tasks):
+            saved.append(len(tasks))
+            real_save_all(tasks)
+        manager.storage.save_all = counting_save_all
+
+        async def run():
+            for i in range(5):
+                await facade.add_task({"title": f"Task {i}"})
+            self.assertEqual(manager.pending_changes, 5) # Nothing written per keypress
+            self.assertEqual(saved, [])
+            deadline = time.monotonic() + 10
+            while manager.pending_changes and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            self.assertEqual(saved, [5]) # One debounced save for the whole burst
+
+            await facade.add_task({"title": "Last"})
+            await facade.save() # No debounce wait
+            self.assertEqual(saved, [5, 6])
+            await facade.close()
+
+        asyncio.run(run())
+        self.assertEqual(len(load_tasks_from_json(self.task_path)), 6)
+
+    def test_saves_are_coalesced_off_the_loop(self):
+        """Test save() calls made during a slow save are written by one follow-up save while the loop keeps running."""
+        manager = TaskManager(file_path=self.task_path, save_delay=60)
+        facade = AsyncTaskManager(manager)
+        real_save_all = manager.storage.save_all
+        saved: list[int] = [] # Tasks written by each save
+
+        def slow_save_all(tasks):
+            saved.append(len(tasks))
+            time.sleep(0.2)
+            real_save_all(tasks)
+        manager.storage.save_all = slow_save_all
+
+        async def run():
+            gaps: list[float] = []
+            done = asyncio.Event()
+
+            async def tick():
+                last = time.monotonic()
+                while not done.is_set():
+                    await asyncio.sleep(0.01)
+                    now = time.monotonic()
+                    gaps.append(now - last)
+                    last = now
+
+            ticker = asyncio.ensure_future(tick())
+            await facade.add_task({"title": "First"})
+            first_save = asyncio.ensure_future(facade.save())
+            await asyncio.sleep(0.05) # Its save is being written now
+            task_ids = await asyncio.gather(*(facade.add_task({"title": f"Task {i}"}) for i in range(10)))
+            await asyncio.gather(first_save, *(facade.save() for _ in range(5)))
+            done.set()
+            await ticker
+            await facade.close()
+            return task_ids, max(gaps)
+
+        task_ids, longest_gap = asyncio.run(run())
+
+        self.assertEqual(saved, [1, 11]) # One save for the first task, one for the five save() calls
+        self.assertLess(longest_gap, 0.15) # The 0.2s saves never stalled the loop
+        self.assertEqual(len(load_tasks_from_json(self.task_path)), 11)
+        self.assertEqual(len(set(task_ids)), 10)
+
+    def test_mutations_apply_in_order(self):
+        """Test concurrent read-modify-write steps see each other's results."""
+        manager = TaskManager(file_path=self.task_path, save_delay=60)
+        facade = AsyncTaskManager(manager)
+        task_id = manager.add_task({"title": "Counter", "description": ""})
+
+        def append_digit(task_manager: TaskManager, digit: int) -> bool:
+            description = task_manager.get_task(task_id).description
+            return task_manager.update_task(task_id, {"description": description + str(digit)})
+
+        async def run():
+            await asyncio.gather(*(facade.apply(append_digit, digit) for digit in range(5)))
+            self.assertEqual([task.id for task in await facade.query(status="To Do")], [task_id])
+            await facade.close()
+
+        asyncio.run(run())
+        self.assertEqual(load_tasks_from_json(self.task_path)[0].description, "01234")
+
+class TestTaskCli(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the task and record files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, text: str) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def _run(self, *args: str) -> tuple[int, str]:
+        """Runs the CLI in-process on the temporary task file, returning (exit code, stdout)."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, patch("sys.stderr", new_callable=io.StringIO):
+            code = task_cli.main(["--file", self.task_path, "--journal", *args])
+        return code, stdout.getvalue()
+
+    def test_import_saves_once_per_batch_and_links_parents(self):
+        """Test an import writes one save per batch and resolves parents given later in the input."""
+        records = [{"id": "child", "title": "Child", "parent_id": "root", "status": "In Progress"},
+                   {"id": "root", "title": "Root", "task_type": "Epic"}]
+        records += [{"title": f"Task {i}", "priority": "High"} for i in range(3)]
+        input_path = self._write("in.jsonl", "".join(json.dumps(record) + "\n" for record in records))
+
+        with patch.object(TaskManager, "_persist_changes", autospec=True,
+                          side_effect=TaskManager._persist_changes) as persist:
+            code, output = self._run("import", input_path, "--batch-size", "2")
+
+        self.assertEqual(code, 0)
+        self.assertEqual(output, "Imported 5 tasks.\n")
+        self.assertEqual(persist.call_count, 3) # Batches of 2, 2 and 1 records
+        tasks = {task.title: task for task in load_tasks_from_json(self.task_path)}
+        self.assertEqual(tasks["Child"].parent_id, tasks["Root"].id)
+        self.assertEqual(tasks["Child"].status, "In Progress")
+        self.assertEqual(tasks["Root"].task_type, "Epic")
+
+    def test_csv_round_trip_streams_from_storage(self):
+        """Test tasks exported to CSV import back unchanged, without building a TaskManager to export."""
+        manager = TaskManager(file_path=self.task_path)
+        root_id = manager.add_task({"title": "Root", "description": "Line one\nline, two"})
+        manager.add_task({"title": "Child", "parent_id": root_id, "priority": "Critical"})
+        manager.close()
+        csv_path = os.path.join(self.temp_dir, "out.csv")
+
+        with patch("task_cli.TaskManager") as manager_class:
+            code, _ = self._run("export", csv_path)
+        self.assertEqual(code, 0)
+        manager_class.assert_not_called()
+
+        self.task_path = os.path.join(self.temp_dir, "copy.json")
+        self.assertEqual(self._run("import", csv_path), (0, "Imported 2 tasks.\n"))
+        tasks = {task.title: task for task in load_tasks_from_json(self.task_path)}
+        self.assertEqual(tasks["Root"].description, "Line one\nline, two")
+        self.assertIsNone(tasks["Root"].parent_id)
+        self.assertEqual(tasks["Child"].parent_id, tasks["Root"].id)
+        self.assertEqual(tasks["Child"].priority, "Critical")
+
+    def test_query_and_bulk_update(self):
+        """Test filtered queries print JSON Lines and bulk updates change only the selected tasks."""
+        manager = TaskManager(file_path=self.task_path)
+        bug_ids = manager.add_tasks([{"title": f"Bug {i}", "task_type": "Bug"} for i in range(3)])
+        manager.add_task({"title": "Story", "task_type": "Story", "priority": "Critical"})
+        manager.close()
+
+        code, output = self._run("query", "--order-by=-priority", "--limit", "1", "--fields", "title,priority")
+        self.assertEqual((code, output), (0, '{"title": "Story", "priority": "Critical"}\n'))
+
+        with patch.object(TaskManager, "_persist_changes", autospec=True,
+                          side_effect=TaskManager._persist_changes) as persist:
+            code, output = self._run("bulk-update", "--type", "Bug", "--set", "status=Done", "--batch-size", "2")
+        self.assertEqual((code, output), (0, "Updated 3 tasks.\n"))
+        self.assertEqual(persist.call_count, 2)
+
+        patch_path = self._write("patch.csv", f"id,priority\n{bug_ids[0]},High\nmissing,Low\n")
+        self.assertEqual(self._run("bulk-update", "--input", patch_path), (0, "Updated 1 tasks.\n"))
+        tasks = {task.title: task for task in load_tasks_from_json(self.task_path)}
+        self.assertEqual([tasks[f"Bug {i}"].status for i in range(3)], ["Done"] * 3)
+        self.assertEqual(tasks["Bug 0"].priority, "High")
+        self.assertEqual(tasks["Story"].status, "To Do")
+
+    def test_bulk_update_clears_parent(self):
+        """Test --set parent_id= stores null and counts only the tasks that had a parent."""
+        manager = TaskManager(file_path=self.task_path)
+        root_id = manager.add_task({"title": "Root"})
+        manager.add_task({"title": "Child", "parent_id": root_id})
+        manager.add_task({"title": "Loose"})
+        manager.close()
+
+        self.assertEqual(self._run("bulk-update", "--all", "--set", "parent_id="), (0, "Updated 1 tasks.\n"))
+        self.assertEqual([task.parent_id for task in load_tasks_from_json(self.task_path)], [None] * 3)
+
+    def test_sqlite_query_runs_in_the_database(self):
+        """Test queries on a SQLite store are answered by its query() without loading every task."""
+        from sqlite_storage import SqliteTaskStorage
+        db_path = os.path.join(self.temp_dir, "tasks.db")
+        manager = TaskManager(storage=SqliteTaskStorage(db_path))
+        manager.add_tasks([{"title": f"Bug {i}", "task_type": "Bug", "priority": priority}
+                           for i, priority in enumerate(("Low", "Critical", "High"))])
+        manager.add_task({"title": "Story", "task_type": "Story", "priority": "Critical"})
+        manager.close()
+
+        with patch("task_cli.TaskManager") as manager_class, \
+                patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            code = task_cli.main(["--db", db_path, "query", "--type", "Bug", "--order-by=-priority",
+                                  "--limit", "2", "--fields", "title"])
+        self.assertEqual((code, stdout.getvalue()), (0, '{"title": "Bug 1"}\n{"title": "Bug 2"}\n'))
+        manager_class.assert_not_called()
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(task_cli.main(["--db", db_path, "query", "--order-by", "colour"]), 1)
+        self.assertIn("Cannot order tasks by 'colour'", stderr.getvalue())
+
+    def test_invalid_input_is_rejected(self):
+        """Test unknown values and unfiltered bulk updates are refused."""
+        input_path = self._write("in.jsonl", '{"title": "Bad", "status": "Someday"}\n')
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(task_cli.main(["--file", self.task_path, "import", input_path]), 1)
+        self.assertIn("unknown status 'Someday'", stderr.getvalue())
+        self.assertFalse(os.path.exists(self.task_path))
+        with patch("sys.stderr", new_callable=io.StringIO), self.assertRaises(SystemExit):
+            task_cli.main(["--file", self.task_path, "bulk-update", "--set", "status=Done"])
+
+    def test_does_not_import_textual(self):
+        """Test the CLI starts without loading the TUI framework."""
+        code = "import sys, task_cli; print('textual' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(task_cli.__file__)))
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+class TestStreamingLoader(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary directory for the task file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.task_path = os.path.join(self.temp_dir, "tasks.json")
+
+    def tearDown(self):
+        """Remove the temporary directory and everything in it."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_parses_records_across_chunk_boundaries(self):
+        """Test the incremental parser handles elements split between reads."""
+        tasks = [Task(title=f"Task {i} \u00e9 [x], {{y}}", display_id=i) for i in range(20)]
+        save_tasks_to_json(tasks, self.task_path)
+        decoder = json.JSONDecoder(object_hook=_datetime_decoder)
+
+        with open(self.task_path) as f:
+            records = list(_iter_json_array(f, decoder, chunk_size=7))
+
+        self.assertEqual([r["id"] for r in records], [t.id for t in tasks])
+        self.assertEqual(records[3]["title"], tasks[3].title)
+        self.assertIsInstance(records[0]["created_at"], datetime)
+
+    def test_rejects_truncated_file(self):
+        """Test a truncated array raises instead of silently yielding a partial list."""
+        save_tasks_to_json([Task(title="One"), Task(title="Two")], self.task_path)
+        with open(self.task_path) as f:
+            content = f.read()
+        with open(self.task_path, "w") as f:
+            f.write(content[:-20])
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_tasks_from_json(self.task_path))
+        with self.assertLogs('json_storage', level='ERROR'):
+            self.assertEqual(load_tasks_from_json(self.task_path), [])
+
+    def test_lazy_load_streams_batches(self):
+        """Test a lazily loading TaskManager fills up batch by batch, journal included."""
+        tasks = [Task(title=f"Task {i}", display_id=i + 1) for i in range(5)]
+        save_tasks_to_json(tasks, self.task_path)
+        writer = TaskManager(file_path=self.task_path, journal=True)
+        writer.delete_task(tasks[1].id)
+        writer.update_task(tasks[2].id, {"title": "Renamed"})
+
+        manager = TaskManager(file_path=self.task_path, lazy_load=True)
+        self.assertTrue(manager.is_loading)
+        self.assertEqual(len(manager.tasks), 0)
+
+        batches = list(manager.load_incrementally(batch_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+        self.assertFalse(manager.is_loading)
+        self.assertEqual([t.display_id for t in manager.tasks], [1, 3, 4, 5])
+        self.assertEqual(manager.get_by_display_id(3).title, "Renamed")
+
+    def test_mutation_finishes_lazy_load(self):
+        """Test adding a task while loading loads everything first, so display IDs stay unique."""
+        save_tasks_to_json([Task(title=f"Task {i}", display_id=i + 1) for i in range(3)], self.task_path)
+        manager = TaskManager(file_path=self.task_path, lazy_load=True)
+
+        new_id = manager.add_task({"title": "New"})
+
+        self.assertFalse(manager.is_loading)
+        self.assertEqual(manager.get_task(new_id).display_id, 4)
+        self.assertEqual(list(manager.load_incrementally()), [])
+
+class TestTaskSerializer(unittest.TestCase):
+
+    def setUp(self):
+        """Build tasks covering every kind of field value."""
+        parent = Task(title="Parent \"quoted\" \u00fc", description="Line 1\nLine 2", display_id=1)
+        child = Task(title="Child", task_type="Bug", parent_id=parent.id, display_id=2)
+        self.tasks = [parent, child]
+
+    def test_indented_output_matches_json_dump(self):
+        """Test the serializer writes exactly what asdict + json.dump(indent=4) wrote."""
+        expected = json.dumps([asdict(task) for task in self.tasks], indent=4, default=_datetime_encoder)
+        for tasks, expected_text in ((self.tasks, expected), ([], "[]")):
+            f = io.StringIO()
+            write_tasks_json(tasks, f)
+            self.assertEqual(f.getvalue(), expected_text)
+
+    def test_compact_output_round_trips(self):
+        """Test compact snapshots have no indentation and load back unchanged."""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".json")
+        os.close(temp_fd)
+        try:
+            save_tasks_to_json(self.tasks, temp_path, compact=True)
+            with open(temp_path) as f:
+                content = f.read()
+            loaded_tasks = load_tasks_from_json(temp_path)
+        finally:
+            os.remove(temp_path)
+
+        self.assertNotIn("\n", content)
+        self.assertEqual(loaded_tasks, self.tasks)
+
+class TestCompactTask(unittest.TestCase):
+
+    def setUp(self):
+        """Build a parent/child pair of regular tasks."""
+        self.parent = Task(title="Parent", display_id=1, task_type="Epic")
+        self.child = Task(title="Child", display_id=2, status="Blocked", parent_id=self.parent.id)
+
+    def test_attributes_match_task(self):
+        """Test a CompactTask exposes and updates the same attributes as Task."""
+        for compact_uuids in (False, True):
+            compact = CompactTask.from_task(self.child, compact_uuids=compact_uuids)
+            self.assertEqual(compact, self.child)
+            self.assertEqual(compact.to_task(), self.child)
+            self.assertEqual(compact.id, self.child.id)
+            self.assertEqual(compact.parent_id, self.parent.id)
+            self.assertEqual(compact.status, "Blocked")
+            self.assertFalse(hasattr(compact, "__dict__"))
+
+            compact.status = "Done"
+            compact.priority = "Someday" # Values outside the known set are registered
+            compact.parent_id = None
+            self.assertEqual((compact.status, compact.priority, compact.parent_id), ("Done", "Someday", None))
+
+    def test_compact_uuids_store_bytes(self):
+        """Test compact_uuids packs canonical ids but keeps non-UUID ids as strings."""
+        compact = CompactTask.from_task(self.child, compact_uuids=True)
+        self.assertEqual(compact._id, uuid.UUID(self.child.id).bytes)
+        self.assertEqual(compact._parent_id, uuid.UUID(self.parent.id).bytes)
+        self.assertEqual(CompactTask(id="legacy-id", compact_uuids=True)._id, "legacy-id")
+
+    def test_manager_with_slotted_tasks(self):
+        """Test TaskManager keeps CompactTask objects and saves them like regular tasks."""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".json")
+        os.close(temp_fd)
+        try:
+            save_tasks_to_json([self.parent, self.child], temp_path)
+            manager = TaskManager(file_path=temp_path, slotted_tasks=True)
+            self.assertTrue(all(isinstance(task, CompactTask) for task in manager.tasks))
+            new_id = manager.add_task({"title": "New", "parent_id": self.parent.id})
+            self.assertIsInstance(manager.get_task(new_id), CompactTask)
+            manager.update_task(self.child.id, {"status": "Done"})
+
+            loaded_tasks = load_tasks_from_json(temp_path)
+        finally:
+            os.remove(temp_path)
+
+        self.assertEqual([task.title for task in loaded_tasks], ["Parent", "Child", "New"])
+        self.assertEqual(loaded_tasks[1].status, "Done")
+        self.assertEqual(loaded_tasks[2].parent_id, self.parent.id)
+
+class TestTaskColumns(unittest.TestCase):
+
+    def setUp(self):
+        """Build a small hierarchy with a mix of statuses and types."""
+        self.epic = Task(title="Epic", task_type="Epic", status="In Progress")
+        self.story = Task(title="Story", task_type="Story", parent_id=self.epic.id)
+        self.bug = Task(title="Bug", task_type="Bug", status="Blocked", parent_id=self.epic.id,
+                        updated_at=datetime(2030, 1, 1, tzinfo=timezone.utc))
+        self.tasks = [self.epic, self.story, self.bug]
+        # Exercise the pure-Python path, and the NumPy path when it is installed
+        self.numpy_modes = [False] + ([True] if TaskColumns().use_numpy else [])
+
+    def test_filters_and_counts(self):
+        """Test filters and counts match a plain scan in every mode."""
+        for use_numpy in self.numpy_modes:
+            columns = TaskColumns(self.tasks, use_numpy=use_numpy)
+            self.assertEqual(columns.count_by("status"), {"In Progress": 1, "To Do": 1, "Blocked": 1})
+            self.assertEqual(columns.match_ids(task_type="Bug"), [self.bug.id])
+            self.assertEqual(columns.match_ids(parent_id=self.epic.id), [self.story.id, self.bug.id])
+            self.assertEqual(columns.match_ids(parent_id=self.epic.id, status="To Do"), [self.story.id])
+            self.assertEqual(columns.match_ids(updated_since=datetime(2029, 1, 1, tzinfo=timezone.utc)), [self.bug.id])
+            self.assertEqual(columns.match_ids(status="Unknown"), [])
+            self.assertEqual(columns.match_ids(status=("Blocked", "In Progress", "Unknown")), [self.epic.id, self.bug.id])
+            self.assertEqual(columns.match_ids(task_type=("Story", "Bug"), status=["To Do"]), [self.story.id])
+            self.assertEqual(columns.match_ids(), [task.id for task in self.tasks])
+
+    def test_children_before_parent_and_compaction(self):
+        """Test parents streamed after their children are linked, and deleted rows are reclaimed."""
+        for use_numpy in self.numpy_modes:
+            columns = TaskColumns([self.bug, self.story], use_numpy=use_numpy)
+            self.assertEqual(columns.match_ids(parent_id=self.bug.id), [])
+            columns.append(self.epic)
+            self.assertEqual(columns.match_ids(parent_id=self.epic.id), [self.bug.id, self.story.id])
+
+            columns.remove(self.bug.id)
+            columns.remove(self.story.id) # Triggers compaction
+            self.assertEqual(len(columns.ids), 1)
+            self.assertEqual(columns.count_by("task_type"), {"Epic": 1})
+            self.assertEqual(columns.match_ids(), [self.epic.id])
+
+    def test_manager_keeps_columns_in_sync(self):
+        """Test count_by/filter_tasks follow add, update, delete and rollback."""
+        with patch('json_storage.load_tasks_from_json', return_value=list(self.tasks)), \
+             patch('json_storage.save_tasks_to_json'):
+            columnar = TaskManager(file_path="dummy.json", columnar=True)
+            plain = TaskManager(file_path="dummy.json")
+            for manager in (columnar, plain):
+                manager.add_task({"title": "Another bug", "task_type": "Bug", "parent_id": self.epic.id})
+                manager.update_task(self.story.id, {"status": "Done"})
+                manager.delete_task(self.bug.id)
+                with self.assertRaises(RuntimeError), manager.batch():
+                    manager.update_task(self.epic.id, {"status": "Done"})
+                    raise RuntimeError("rolled back")
+
+            for manager in (columnar, plain):
+                self.assertEqual(manager.count_by("status"), {"In Progress": 1, "Done": 1, "To Do": 1})
+                self.assertEqual([task.title for task in manager.filter_tasks(task_type="Bug")], ["Another bug"])
+                self.assertEqual([task.title for task in manager.filter_tasks(parent_id=self.epic.id, status="Done")],
+                                 ["Story"])
+            with self.assertRaises(ValueError):
+                columnar.count_by("title")
+
+class TestTaskSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Build tasks whose titles and descriptions share a few words."""
+        self.login_bug = Task(title="Fix login bug", description="Users are logged out")
+        self.login_page = Task(title="Login page", description="Fix the login redirect")
+        self.parser = Task(title="Refactor parser", description="Split the tokenizer")
+        self.tasks = [self.login_bug, self.login_page, self.parser]
+
+    def test_ranked_prefix_search(self):
+        """Test title and whole-word matches rank first, prefixes narrow, and all terms must match."""
+        index = TaskSearchIndex(self.tasks)
+        # Login page: title (3) + description (1), doubled as whole words
+        self.assertEqual(index.search("login"), [(self.login_page.id, 8), (self.login_bug.id, 6)])
+        self.assertEqual([task_id for task_id, _ in index.search("LOG")], [self.login_page.id, self.login_bug.id])
+        self.assertEqual([task_id for task_id, _ in index.search("fix log")], [self.login_bug.id, self.login_page.id])
+        self.assertEqual(index.search("pars tok"), [(self.parser.id, 4)])
+        self.assertEqual(index.search("l"), []) # Single letters only match whole words
+        self.assertEqual(index.search("login parser"), [])
+        self.assertEqual(index.search("  "), [])
+        self.assertEqual(index.search("login", limit=1), [(self.login_page.id, 8)])
+
+    def test_limited_search_matches_full_ranking(self):
+        """Test the early-stopping top-k search returns the head of the full ranking."""
+        words = ["alpha", "alpine", "beta", "bet", "gamma", "game", "delta", "deli"]
+        tasks = [Task(title=" ".join(words[(i * 7 + j * 3) % 8] for j in range(i % 4 + 1)),
+                      description=" ".join(words[(i * 5 + j) % 8] for j in range(i % 6)))
+                 for i in range(300)]
+        index = TaskSearchIndex(tasks)
+        for query in ("al", "alpha", "bet ga", "de al ga", "game", "b"):
+            ranking = index.search(query)
+            expected = {task.id for task in tasks if index._score(task.id, [
+                (term, index._expand(term), set(index._expand(term))) for term in query.split()])}
+            self.assertEqual({task_id for task_id, _ in ranking}, expected)
+            for limit in (1, 5, 40):
+                self.assertEqual(index.search(query, limit=limit), ranking[:limit])
+
+    def test_candidates_are_filtered_before_the_limit(self):
+        """Test a candidate filter keeps low-ranked matches that a post-filtered top-k would drop."""
+        strong = [Task(title="login login", description="login") for _ in range(5)]
+        weak = [Task(title="Other", description="login") for _ in range(3)]
+        index = TaskSearchIndex(strong + weak)
+        weak_ids = {task.id for task in weak}
+        self.assertEqual({task_id for task_id, _ in index.search("login", limit=3)} & weak_ids, set())
+        self.assertEqual({task_id for task_id, _ in index.search("login", limit=3, candidates=weak_ids)}, weak_ids)
+        self.assertEqual(index.search("log", limit=2, candidates=weak_ids), index.search("log", candidates=weak_ids)[:2])
+        self.assertEqual(index.search("login", candidates=set()), [])
+
+    def test_manager_keeps_index_in_sync(self):
+        """Test search() follows add, update, delete and rollback, with or without the index."""
+        with patch('json_storage.load_tasks_from_json', return_value=list(self.tasks)), \
+             patch('json_storage.save_tasks_to_json'):
+            indexed = TaskManager(file_path="dummy.json", search_index=True)
+            plain = TaskManager(file_path="dummy.json")
+            for manager in (indexed, plain):
+                manager.add_task({"title": "Login timeout", "description": "Session expires"})
+                manager.update_task(self.parser.id, {"description": "Split the tokenizer before login"})
+                manager.delete_task(self.login_bug.id)
+                with self.assertRaises(RuntimeError), manager.batch():
+                    manager.update_task(self.login_page.id, {"title": "Signup page"})
+                    raise RuntimeError("rolled back")
+
+            for manager in (indexed, plain):
+                self.assertEqual([task.title for task in manager.search("login")],
+                                 ["Login page", "Login timeout", "Refactor parser"])
+                bugs = {task.id for task in manager.query(status="To Do") if task.title != "Login page"}
+                self.assertEqual([task.title for task in manager.search("login", limit=1, candidates=bugs)],
+                                 ["Login timeout"])
+                self.assertEqual(manager.search("signup"), [])
+                self.assertEqual([task.title for task in manager.search("sess")], ["Login timeout"])
+
+    def test_highlight_pattern(self):
+        """Test the highlight pattern marks whole words matched by the query's terms."""
+        pattern = TaskSearchIndex.highlight_pattern("log a")
+        self.assertEqual(pattern.findall("Logged a LOGIN bug as admin"), ["Logged", "a", "LOGIN"])
+        self.assertIsNone(TaskSearchIndex.highlight_pattern(" "))
+
+class TestTaskList(unittest.TestCase):
+
+    def setUp(self):
+        """Build a manager with 500 root tasks, the first one with two children."""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.tasks = [Task(title=f"Task {i}", display_id=i + 1, created_at=base.replace(second=i % 60, minute=i // 60))
+                      for i in range(500)]
+        self.tasks[1].parent_id = self.tasks[0].id
+        self.tasks[2].parent_id = self.tasks[0].id
+        self.tasks[2].task_type = "Bug"
+        with patch('json_storage.load_tasks_from_json', return_value=self.tasks):
+            self.manager = TaskManager(file_path="dummy.json")
+
+    def run_with_list(self, check):
+        """Runs check(task_list, pilot) inside a headless app holding a TaskList."""
+        from textual.app import App
+        from screens.task_list import TaskList
+        manager = self.manager
+
+        class ListApp(App):
+            def compose(self):
+                yield TaskList(manager)
+
+            def on_task_list_task_selected(self, event):
+                self.selected = event.task_id
+
+        async def run():
+            app = ListApp()
+            async with app.run_test(size=(80, 24)) as pilot:
+                task_list = app.query_one(TaskList)
+                task_list.refresh_rows()
+                task_list.focus()
+                await pilot.pause()
+                await check(app, task_list, pilot)
+        asyncio.run(run())
+
+    def test_renders_only_rows_near_viewport(self):
+        """Test a long list only renders the visible rows plus the overscan."""
+        async def check(app, task_list, pilot):
+            self.assertEqual(task_list.row_count, 500)
+            self.assertEqual(task_list.task_ids[:3], [self.tasks[0].id, self.tasks[1].id, self.tasks[2].id])
+            self.assertLessEqual(len(task_list._line_cache), 24)
+            for task in self.tasks[100::100]: # Jump through the list
+                task_list.select_task(task.id)
+                await pilot.pause()
+                self.assertIn(task_list.cursor_row, task_list._line_cache)
+                self.assertLessEqual(len(task_list._line_cache), 24 + 2 * task_list.OVERSCAN)
+        self.run_with_list(check)
+
+    def test_keyboard_navigation_and_selection(self):
+        """Test arrow keys move the cursor and Enter selects the task by UUID."""
+        async def check(app, task_list, pilot):
+            await pilot.press("down", "down", "up", "enter")
+            await pilot.pause()
+            self.assertEqual(task_list.cursor_task_id, self.tasks[1].id)
+            self.assertEqual(app.selected, self.tasks[1].id)
+            await pilot.press("end")
+            self.assertEqual(task_list.cursor_task_id, self.tasks[-1].id)
+
+            # Rebuilding the rows keeps the cursor on its task
+            task_list.select_task(self.tasks[2].id)
+            task_list.refresh_rows(filter_type="Bug")
+            self.assertEqual(task_list.task_ids, [self.tasks[0].id, self.tasks[2].id])
+            # The parent is kept, dimmed, for context; the match is indented under it
+            self.assertEqual(task_list._rows, [(self.tasks[0].id, 0, True), (self.tasks[2].id, 1, False)])
+            self.assertEqual(task_list.cursor_task_id, self.tasks[2].id)
+        self.run_with_list(check)
+
+    def test_show_tasks_highlights_matches(self):
+        """Test search results are listed flat, in order, with the matched words highlighted."""
+        async def check(app, task_list, pilot):
+            results = [self.tasks[42], self.tasks[2], self.tasks[7]]
+            task_list.select_task(self.tasks[2].id)
+            task_list.show_tasks(results, highlight=TaskSearchIndex.highlight_pattern("task"))
+            await pilot.pause()
+            self.assertEqual(task_list.task_ids, [task.id for task in results])
+            self.assertEqual(task_list.cursor_task_id, self.tasks[2].id)
+            match_style = task_list.get_component_rich_style("task-list--match", partial=True)
+            line = task_list.render_line(1)
+            self.assertIn("Task", [segment.text.strip() for segment in line if match_style.color == segment.style.color])
+
+            task_list.refresh_rows() # Back to the tree, without highlights
+            self.assertIsNone(task_list._highlight)
+            self.assertEqual(task_list.row_count, 500)
+        self.run_with_list(check)
+
+class TestTaskDetailsCache(unittest.TestCase):
+
+    def test_render_is_cached_until_updated(self):
+        """Test details render once per (id, updated_at), literally, within the LRU bound."""
+        from screens.helpers import TaskDetailsCache, render_task_details
+        cache = TaskDetailsCache(maxsize=2)
+        task = Task(title="Fix [bold]parser[/bold]", description="Costs $5")
+        with patch('screens.helpers.render_task_details', wraps=render_task_details) as mock_render:
+            first = cache.render(task)
+            self.assertIs(cache.render(task), first)
+            self.assertEqual(mock_render.call_count, 1)
+            self.assertIn("Title: Fix [bold]parser[/bold]", first.plain)
+            self.assertIn("Costs $5", first.plain)
+
+            task.status = "Done"
+            task.updated_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+            self.assertIn("Status: Done", cache.render(task).plain)
+            self.assertEqual(mock_render.call_count, 2)
+
+            cache.render(Task(title="Other"))
+            self.assertEqual(len(cache), 2) # The oldest render was evicted
+
 class TestTuiAppImport(unittest.TestCase):
     
     def test_tui_app_importable(self):
@@ -559,5 +2122,374 @@ class TestTuiAppFeatures(unittest.TestCase):
         # Therefore, no new assertions here for now.
         pass # Placeholder until better TUI testing is set up.
 
+    def test_combined_filters(self):
+        """Test the filter screen combines status, priority and type filters through query()."""
+        from textual.widgets import Select, SelectionList
+        from tui_app import TaskManagerApp
+        from screens.filter_screen import FilterScreen
+        from screens.task_list import TaskList
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        epic = Task(title="Epic", task_type="Epic")
+        save_tasks_to_json([
+            epic,
+            Task(title="Hot bug", task_type="Bug", priority="Critical", status="In Progress", parent_id=epic.id),
+            Task(title="Urgent bug", task_type="Bug", priority="High", status="In Progress"),
+            Task(title="Minor bug", task_type="Bug", priority="Low", status="In Progress"),
+            Task(title="Done bug", task_type="Bug", priority="High", status="Done"),
+            Task(title="Hot story", task_type="Story", priority="Critical", status="In Progress"),
+        ], file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test(size=(100, 40)) as pilot:
+                while app.task_manager.is_loading:
+                    await pilot.pause()
+                task_list = app.query_one(TaskList)
+                await pilot.press("f")
+                await pilot.pause()
+                screen = app.screen
+                self.assertIsInstance(screen, FilterScreen)
+                screen.query_one("#filter-status", SelectionList).select("In Progress")
+                for priority in ("High", "Critical"):
+                    screen.query_one("#filter-priority", SelectionList).select(priority)
+                screen.query_one("#filter-type", Select).value = "Bug"
+                await pilot.click("#filter-apply")
+                await pilot.pause()
+                self.assertEqual((app.status_filter, app.priority_filter, app.current_filter),
+                                 (("In Progress",), ("High", "Critical"), "Bug"))
+                rows = [(app.task_manager.get_task(task_id).title, dimmed) for task_id, _, dimmed in task_list._rows]
+                self.assertEqual(rows, [("Epic", True), ("Hot bug", False), ("Urgent bug", False)])
+                self.assertIn("Filter: High+Critical Bug In Progress", app._status_summary)
+
+                await pilot.press("0") # Clears every filter
+                await pilot.pause()
+                self.assertEqual(task_list.row_count, 6)
+        asyncio.run(run())
+
+    def test_search_narrows_task_list(self):
+        """Test '/' opens the search box, typing narrows the list and Escape restores it."""
+        from tui_app import TaskManagerApp
+        from screens.task_list import TaskList
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        save_tasks_to_json([Task(title="Fix login bug"), Task(title="Refactor parser", description="parser cleanup"),
+                            Task(title="Parse config", description="Quick fix")], file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test() as pilot:
+                while app.task_manager.is_loading:
+                    await pilot.pause()
+                task_list = app.query_one(TaskList)
+                await pilot.press("slash", "p", "a", "r", "s")
+                self.assertEqual(app.search_query, "pars")
+                self.assertEqual([app.task_manager.get_task(task_id).title for task_id in task_list.task_ids],
+                                 ["Refactor parser", "Parse config"])
+                # A filter is applied before the result limit, so lower-ranked matches still show
+                with patch.object(app, "SEARCH_LIMIT", 1):
+                    app.current_filter = "Task"
+                    app.task_manager.update_task(app.task_manager.search("pars")[0].id, {"task_type": "Bug"})
+                    app._refresh_task_table(filter_type="Task")
+                    self.assertEqual([app.task_manager.get_task(task_id).title for task_id in task_list.task_ids],
+                                     ["Parse config"])
+                    app.current_filter = None
+                await pilot.press("escape")
+                await pilot.pause()
+                self.assertEqual(app.search_query, "")
+                self.assertEqual(task_list.row_count, 3)
+                self.assertIs(app.focused, task_list)
+        asyncio.run(run())
+
+    def test_details_follow_cursor_coalesced(self):
+        """Test the details view shows the row the cursor rests on, rendering it only once."""
+        from textual.widgets import Static
+        from tui_app import TaskManagerApp
+        from screens.helpers import render_task_details
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        tasks = [Task(title=f"Task {i}") for i in range(10)]
+        save_tasks_to_json(tasks, file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            app.DETAILS_DELAY = 0.5 # Longer than the key presses below take
+            async with app.run_test() as pilot:
+                while app.task_manager.is_loading:
+                    await pilot.pause()
+                await pilot.pause(app.DETAILS_DELAY + 0.1) # Let the first row render
+                with patch('screens.helpers.render_task_details', wraps=render_task_details) as mock_render:
+                    await pilot.press(*["down"] * 6)
+                    self.assertEqual(app.selected_task_id, tasks[6].id)
+                    self.assertEqual(mock_render.call_count, 0)
+                    await pilot.pause(app.DETAILS_DELAY + 0.1)
+                    self.assertEqual(mock_render.call_count, 1)
+                details = app.query_one("#task-details-view", Static).render()
+                self.assertIn("Title: Task 6", str(details))
+        asyncio.run(run())
+
+    def test_status_cycles_through_the_async_manager(self):
+        """Test 's' pressed twice in a row advances the status twice and quitting saves it."""
+        from tui_app import TaskManagerApp
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        task = Task(title="Cycled")
+        save_tasks_to_json([task], file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test() as pilot:
+                while app.task_manager.is_loading or app.selected_task_id is None:
+                    await pilot.pause()
+                await pilot.press("s", "s")
+                deadline = time.monotonic() + 10
+                while app.task_manager.get_task(task.id).status != "Done" and time.monotonic() < deadline:
+                    await pilot.pause(0.05)
+                self.assertEqual(app.task_manager.get_task(task.id).status, "Done")
+                # Left to the debounced writer, so the header shows the change as unsaved
+                app._update_save_indicator()
+                self.assertIn("unsaved change", app.sub_title)
+                await pilot.press("q")
+        asyncio.run(run())
+        self.assertEqual(load_tasks_from_json(file_path)[0].status, "Done")
+
+    def test_delete_reports_without_printing(self):
+        """Test deleting a task gives feedback through notify/logging, never print (which corrupts the screen)."""
+        from tui_app import TaskManagerApp
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        tasks = [Task(title="Kept", display_id=1), Task(title="Gone", display_id=2)]
+        save_tasks_to_json(tasks, file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test() as pilot:
+                while app.task_manager.is_loading or app.selected_task_id is None:
+                    await pilot.pause()
+                with patch("builtins.print") as mock_print:
+                    await app._delete_task(tasks[1].id)
+                    await app._delete_task(tasks[1].id) # Already gone
+                    mock_print.assert_not_called()
+                self.assertEqual([task.title for task in app.task_manager.tasks], ["Kept"])
+                await pilot.press("q")
+        asyncio.run(run())
+
+    def test_marking_ranges_and_toggles(self):
+        """Test space toggles marks, shift+arrows mark (and shrink) a range, and escape clears them."""
+        from tui_app import TaskManagerApp
+        from screens.task_list import TaskList
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        tasks = [Task(title=f"Task {i}", display_id=i + 1) for i in range(6)]
+        save_tasks_to_json(tasks, file_path)
+        ids = [task.id for task in tasks]
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test() as pilot:
+                while app.task_manager.is_loading or app.selected_task_id is None:
+                    await pilot.pause()
+                task_list = app.query_one(TaskList)
+                await pilot.press("space") # Marks row 0, cursor to row 1
+                await pilot.press("down", "shift+down", "shift+down", "shift+down", "shift+up")
+                self.assertEqual(task_list.marked_task_ids, [ids[0], ids[2], ids[3], ids[4]])
+                await pilot.press("up", "space") # Unmarks row 3
+                self.assertEqual(task_list.marked_task_ids, [ids[0], ids[2], ids[4]])
+                app._refresh_task_table(filter_type="Bug") # Marked tasks filtered out lose their marks
+                self.assertEqual(task_list.marked_task_ids, [])
+                app._refresh_task_table()
+                await pilot.press("home", "shift+down", "escape")
+                self.assertEqual(task_list.marked_count, 0)
+                await pilot.press("q")
+        asyncio.run(run())
+
+    def test_bulk_edit_applies_as_one_transaction(self):
+        """Test a bulk edit of the marked tasks saves once and re-renders only their rows."""
+        from textual.widgets import Select
+        from tui_app import TaskManagerApp
+        from screens.task_list import TaskList
+        from screens.bulk_edit_screen import BulkEditScreen
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        tasks = [Task(title=f"Task {i}", display_id=i + 1) for i in range(5)]
+        save_tasks_to_json(tasks, file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test(size=(100, 60)) as pilot:
+                while app.task_manager.is_loading or app.selected_task_id is None:
+                    await pilot.pause()
+                task_list = app.query_one(TaskList)
+                await pilot.press("shift+down", "shift+down", "shift+down") # Marks tasks 0-3
+                with patch.object(app.task_manager, "_persist_changes",
+                                  wraps=app.task_manager._persist_changes) as persist, \
+                     patch.object(task_list, "refresh_rows", wraps=task_list.refresh_rows) as refresh_rows, \
+                     patch.object(task_list, "refresh_tasks", wraps=task_list.refresh_tasks) as refresh_tasks:
+                    await pilot.press("b")
+                    await pilot.pause()
+                    self.assertIsInstance(app.screen, BulkEditScreen)
+                    app.screen.query_one("#bulk-edit-select-status", Select).value = "Done"
+                    app.screen.query_one("#bulk-edit-select-priority", Select).value = "High"
+                    await pilot.click("#bulk-edit-apply")
+                    deadline = time.monotonic() + 10
+                    while not refresh_tasks.called and time.monotonic() < deadline:
+                        await pilot.pause(0.05)
+                    self.assertEqual(persist.call_count, 1)
+                    refresh_rows.assert_not_called()
+                    refresh_tasks.assert_called_once()
+                self.assertEqual([task.status for task in app.task_manager.tasks], ["Done"] * 4 + ["To Do"])
+                self.assertEqual([task.priority for task in app.task_manager.tasks], ["High"] * 4 + ["Medium"])
+
+                # 's' moves every marked task to its own next status in one transaction
+                await pilot.press("s")
+                deadline = time.monotonic() + 10
+                while app.task_manager.get_task(tasks[0].id).status != "Blocked" and time.monotonic() < deadline:
+                    await pilot.pause(0.05)
+                self.assertEqual([task.status for task in app.task_manager.tasks], ["Blocked"] * 4 + ["To Do"])
+                await pilot.press("q")
+        asyncio.run(run())
+        self.assertEqual([task.status for task in load_tasks_from_json(file_path)], ["Blocked"] * 4 + ["To Do"])
+
+    def test_bulk_reparent_and_delete(self):
+        """Test an invalid bulk reparent changes nothing and a bulk delete removes every marked task at once."""
+        from tui_app import TaskManagerApp
+        from screens.task_list import TaskList
+        from screens.confirm_delete_screen import ConfirmDeleteScreen
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        epic = Task(title="Epic", task_type="Epic", display_id=1)
+        tasks = [epic] + [Task(title=f"Task {i}", display_id=i + 2) for i in range(3)]
+        save_tasks_to_json(tasks, file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test(size=(100, 40)) as pilot:
+                while app.task_manager.is_loading or app.selected_task_id is None:
+                    await pilot.pause()
+                task_list = app.query_one(TaskList)
+                await pilot.press("shift+down", "shift+down") # Epic, Task 0 and Task 1
+                marked_ids = task_list.marked_task_ids
+                await app._bulk_update(marked_ids, {"parent_id": epic.id}) # The epic cannot be its own parent
+                self.assertTrue(all(app.task_manager.get_task(task_id).parent_id is None for task_id in marked_ids))
+
+                await app._bulk_update(marked_ids[1:], {"parent_id": epic.id})
+                self.assertEqual([task.title for task, _ in app.task_manager.walk_tree()],
+                                 ["Epic", "Task 0", "Task 1", "Task 2"])
+                self.assertEqual(app.task_manager.get_task(marked_ids[1]).parent_id, epic.id)
+
+                with patch.object(app.task_manager, "_persist_changes",
+                                  wraps=app.task_manager._persist_changes) as persist:
+                    await pilot.press("d")
+                    await pilot.pause()
+                    self.assertIsInstance(app.screen, ConfirmDeleteScreen)
+                    await pilot.click("#delete-confirm")
+                    deadline = time.monotonic() + 10
+                    while len(app.task_manager.tasks) > 1 and time.monotonic() < deadline:
+                        await pilot.pause(0.05)
+                    self.assertEqual(persist.call_count, 1)
+                await pilot.pause()
+                self.assertEqual(task_list.task_ids, [tasks[3].id])
+                self.assertEqual(task_list.marked_count, 0)
+                await pilot.press("q")
+        asyncio.run(run())
+        self.assertEqual([task.title for task in load_tasks_from_json(file_path)], ["Task 2"])
+
+    def test_external_changes_update_table(self):
+        """Test writes by another process show up live, re-rendering only the touched rows."""
+        from textual.widgets import Static
+        from tui_app import TaskManagerApp
+        from screens.task_list import TaskList
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        tasks = [Task(title=f"Task {i}", display_id=i + 1) for i in range(3)]
+        save_tasks_to_json(tasks, file_path)
+        other_process = TaskManager(file_path=file_path)
+
+        async def wait_for(pilot, condition):
+            deadline = time.monotonic() + 10
+            while not condition() and time.monotonic() < deadline:
+                await pilot.pause(0.05)
+            self.assertTrue(condition())
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test() as pilot:
+                await wait_for(pilot, lambda: app._file_watcher is not None)
+                task_list = app.query_one(TaskList)
+                await pilot.pause(app.DETAILS_DELAY + 0.1)
+                with patch.object(task_list, "refresh_rows", wraps=task_list.refresh_rows) as mock_rows, \
+                     patch.object(task_list, "refresh_tasks", wraps=task_list.refresh_tasks) as mock_tasks:
+                    other_process.update_task(tasks[0].id, {"title": "Renamed elsewhere"})
+                    await wait_for(pilot, lambda: app.task_manager.get_task(tasks[0].id).title == "Renamed elsewhere")
+                    mock_rows.assert_not_called()
+                    mock_tasks.assert_called_once_with({tasks[0].id})
+                details = app.query_one("#task-details-view", Static).render()
+                self.assertIn("Title: Renamed elsewhere", str(details))
+
+                new_id = other_process.add_task({"title": "Added elsewhere"})
+                await wait_for(pilot, lambda: new_id in task_list.task_ids)
+                self.assertEqual(task_list.row_count, 4)
+        asyncio.run(run())
+
+    def test_parent_picker_pages_and_searches(self):
+        """Test the add screen's parent picker fetches pages lazily and narrows as text is typed."""
+        from textual.widgets import Button, Input, OptionList
+        from tui_app import TaskManagerApp
+        from screens.add_task_screen import AddTaskScreen
+        from screens.parent_picker import ParentPicker
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, "tasks.json")
+        save_tasks_to_json([Task(title=f"Task {i}") for i in range(100)]
+                           + [Task(title="Checkout epic", task_type="Epic")], file_path)
+
+        async def run():
+            app = TaskManagerApp(task_file_path=file_path)
+            async with app.run_test(size=(100, 50)) as pilot:
+                while app.task_manager.is_loading:
+                    await pilot.pause()
+                await pilot.press("a")
+                await pilot.pause()
+                screen = app.screen
+                self.assertIsInstance(screen, AddTaskScreen)
+                picker = screen.query_one(ParentPicker)
+                options = picker.query_one(OptionList)
+                self.assertEqual(options.option_count, 1 + picker.PAGE_SIZE) # (No Parent) + one page
+                self.assertTrue(str(options.get_option_at_index(1).prompt).endswith("Epic: Checkout epic"))
+                options.highlighted = options.option_count - 1
+                await pilot.pause()
+                self.assertEqual(options.option_count, 1 + 2 * picker.PAGE_SIZE) # Next page fetched
+
+                picker.query_one(Input).value = "checkout"
+                await pilot.pause()
+                self.assertEqual(options.option_count, 2)
+                options.highlighted = 1
+                options.action_select()
+                await pilot.pause()
+                screen.query_one("#add-task-input-title", Input).value = "Child"
+                screen.query_one("#add-task-save", Button).press()
+                deadline = time.monotonic() + 10
+                while not any(task.title == "Child" for task in app.task_manager.tasks) and time.monotonic() < deadline:
+                    await pilot.pause(0.05) # Added off the event loop
+                child = next(task for task in app.task_manager.tasks if task.title == "Child")
+                self.assertEqual(app.task_manager.get_task(child.parent_id).title, "Checkout epic")
+                self.assertEqual(app.search_query, "") # The picker's typing is not a task search
+        asyncio.run(run())
+
+def tearDownModule():
+    """Remove the store lock files left by tests that mock the JSON functions."""
+    for name in ("dummy.json.lock", "test_tasks.json.lock"):
+        if os.path.exists(name):
+            os.remove(name)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -4,7 +4,7 @@ Main Textual application file for the AI Pair Programming Task Manager.
 
 # Imports will go here (Textual, TaskManager, etc.)
 from textual.app import App, ComposeResult
-from textual.widgets import Header, Footer, DataTable, Button, Label, Static # Import DataTable explicitly if not already
+from textual.widgets import Header, Footer, Button, Label, Static
 from textual.containers import Container # For layout
 from textual.screen import Screen, ModalScreen # Import Screen types
 from textual.widgets import Input # Widgets for the modal
@@ -12,15 +12,22 @@ from textual.message import Message # Import Message base class
 from textual.renderables.styled import Styled # For styling table cells
 from textual.color import Color # For styling
 from textual.reactive import reactive # Import reactive for dynamic updates
+from textual.timer import Timer
 # Import our task manager logic
-from AI_Pair_Programming_Task_Manager import TaskManager, Task 
-from typing import Optional, Dict, List # Ensure List is imported
+from AI_Pair_Programming_Task_Manager import TaskManager, Task, TaskStorage, TaskSearchIndex, JsonFileStorage
+from file_watcher import FileWatcher # Notices writes to the task file by other processes
+from async_task_manager import AsyncTaskManager # Runs edits and saves off the event loop
+from typing import Optional, Dict, Iterable, List, Tuple # Ensure List is imported
 import logging # Import logging
+import asyncio
 # --- Import Screens ---
 from screens.add_task_screen import AddTaskScreen
 from screens.confirm_delete_screen import ConfirmDeleteScreen
-from screens.helpers import style_status, refresh_task_table, cycle_task_status, cycle_task_priority # Import new helpers
+from screens.helpers import cycle_task_status, cycle_task_priority, TaskDetailsCache # Import new helpers
+from screens.task_list import TaskList # Virtualized task list
 from screens.edit_task_screen import EditTaskScreen # Import EditTaskScreen
+from screens.filter_screen import FilterScreen # Combined status/priority/type filters
+from screens.bulk_edit_screen import BulkEditScreen # Same change for every marked task
 
 # Setup logger for this module
 logger = logging.getLogger(__name__) 
@@ -38,10 +45,14 @@ class TaskManagerApp(App):
         ("a", "add_task", "Add Task"),
         ("e", "edit_task", "Edit Selected Task"), 
         ("d", "delete_task", "Delete Selected Task"),
+        ("b", "bulk_edit", "Bulk Edit Marked"),
         ("s", "cycle_status", "Cycle Status Forward"),
         ("p", "toggle_pause", "Pause/Resume"),
         ("+", "cycle_priority", "Cycle Priority Up"),
+        ("/", "search", "Search"),
+        ("escape", "clear_search", "Clear Search"),
         # Filtering Bindings
+        ("f", "edit_filters", "Filters"),
         ("0", "filter_all", "Filter: All"),
         ("1", "filter_epics", "Filter: Epics"),
         ("2", "filter_stories", "Filter: Stories"),
@@ -53,79 +64,221 @@ class TaskManagerApp(App):
     STATUS_CYCLE = ["To Do", "In Progress", "Done", "Blocked"]
     PRIORITY_CYCLE = ["Low", "Medium", "High", "Critical"]
     
+    class TaskFileChanged(Message):
+        """Posted by the file watcher when the task file changed on disk."""
+
     selected_task_id: Optional[str] = None # Add instance variable to store selected ID
     is_paused: reactive[bool] = reactive(False) # Add reactive paused state
     current_filter: reactive[Optional[str]] = reactive(None) # Add reactive filter state
+    status_filter: reactive[Tuple[str, ...]] = reactive(()) # Statuses shown (empty = all)
+    priority_filter: reactive[Tuple[str, ...]] = reactive(()) # Priorities shown (empty = all)
+    search_query: reactive[str] = reactive("") # Full-text search typed into the search box
     
-    def __init__(self, task_file_path="tasks.json"):
+    # Seconds without changes before the background writer saves (None = save synchronously)
+    SAVE_DELAY: Optional[float] = 0.5
+    # Tasks streamed into the table per event loop iteration while loading
+    LOAD_BATCH_SIZE = 500
+    # Maximum number of search results listed
+    SEARCH_LIMIT = 200
+    # Seconds the cursor must rest on a row before its details are rendered,
+    # so holding an arrow key renders only the row it stops on
+    DETAILS_DELAY = 0.05
+    # Seconds between checks of the task file for other processes' writes where
+    # inotify is unavailable
+    WATCH_INTERVAL = 1.0
+
+    def __init__(self, task_file_path="tasks.json", journal: bool = False,
+                 storage: Optional[TaskStorage] = None):
         super().__init__()
-        self.task_manager = TaskManager(file_path=task_file_path)
+        # journal=True appends one record per change instead of rewriting the file;
+        # storage (e.g. sqlite_storage.SqliteTaskStorage) replaces the JSON file entirely
+        self.task_manager = TaskManager(file_path=task_file_path, journal=journal,
+                                        save_delay=self.SAVE_DELAY, storage=storage,
+                                        lazy_load=True, # Streamed in by on_mount
+                                        columnar=True, # Array-backed filters and counts
+                                        search_index=True) # Inverted index for search
+        # Actions edit through this facade, so waiting for the lock a save holds never
+        # blocks input or redraws; the debounced writer (SAVE_DELAY) does the saving
+        self.async_task_manager = AsyncTaskManager(self.task_manager)
+        self._status_summary = "" # Per-status task counts, shown when nothing is being saved
+        self._details_cache = TaskDetailsCache() # Rendered details of recently shown tasks
+        self._details_key: Optional[tuple] = None # (id, updated_at) currently in the details view
+        self._details_timer: Optional[Timer] = None # Pending coalesced details update
+        self._file_watcher: Optional[FileWatcher] = None # Started once the tasks are loaded
         # print(f"TUI App initialized with task manager for {task_file_path}") # Debug
         
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
+        yield Input(placeholder="Search titles and descriptions...", id="search-input")
         # Main content area will go here later
-        yield DataTable(id="task-list", cursor_type="row") # Ensure row cursor
+        yield TaskList(self.task_manager, id="task-list") # Renders only the visible rows
         yield Static(id="task-details-view", expand=True) # Add static view for details
         yield Footer()
         
     def on_mount(self) -> None:
         """Called when the app is mounted. Load initial data."""
-        table = self.query_one(DataTable)
-        # Add columns (adjust types and labels as needed)
-        table.add_columns("ID", "Title", "Status", "Priority", "Type")
-        # Load initial tasks
-        tasks = self.task_manager.tasks
-        for task in tasks:
-            # Add task data as a row
-            # Ensure data matches column order and type
-            table.add_row(
-                task.display_id, # Display the sequential ID
-                task.title, 
-                style_status(task.status), # Use imported function
-                task.priority, 
-                task.task_type,
-                key=task.id # Use task UUID ID as the row key
-            )
-        # print(f"Mounted and loaded {len(tasks)} tasks into table.") # Debug
-
-    def _refresh_task_table(self, filter_type: Optional[str] = None) -> None:
-        """Wrapper method to refresh the task table using the helper function."""
-        table = self.query_one(DataTable)
-        tasks = self.task_manager.tasks
-        # Call the helper function with the necessary arguments
-        refresh_task_table(table=table, tasks=tasks, filter_type=filter_type)
+        self.query_one("#search-input", Input).display = False # Shown by the search action
+        self.query_one(TaskList).focus()
+        # Load initial tasks progressively so the table fills while the file is parsed
+        self.run_worker(self._load_tasks_progressively(), exclusive=True, group="load")
+        self.set_interval(0.25, self._update_save_indicator)
+
+    def on_unmount(self) -> None:
+        """Stops the file watcher when the app shuts down."""
+        self._stop_file_watcher()
+
+    async def _load_tasks_progressively(self) -> None:
+        """Streams tasks from storage into the table one batch at a time."""
+        task_list = self.query_one(TaskList)
+        for batch in self.task_manager.load_incrementally(self.LOAD_BATCH_SIZE):
+            # Add the batch as flat rows; the final refresh indents them
+            if not self.search_query:
+                task_list.append_tasks(task for task in batch if self._passes_filters(task))
+            await asyncio.sleep(0) # Let the UI render this batch and handle input
+        # Rebuild once with the hierarchy now that every task is known
+        self._refresh_task_table(filter_type=self.current_filter)
+        self._start_file_watcher()
+
+    def _start_file_watcher(self) -> None:
+        """Watches the task file so changes written by other processes show up live."""
+        storage = self.task_manager.storage
+        if not isinstance(storage, JsonFileStorage) or self._file_watcher is not None:
+            return
+        self._file_watcher = FileWatcher(storage.watch_paths, self._on_task_file_changed,
+                                         poll_interval=self.WATCH_INTERVAL)
+        self._file_watcher.start()
+        self.run_worker(self._reload_external_changes, group="reload") # Written while the tasks were loading
+
+    def _stop_file_watcher(self) -> None:
+        """Stops watching the task file."""
+        if self._file_watcher is not None:
+            self._file_watcher.stop()
+            self._file_watcher = None
+
+    def _on_task_file_changed(self) -> None:
+        """Called on the watcher thread when the task file changed on disk."""
+        # Posting does not wait for the event loop, so stopping the watcher cannot deadlock
+        self.post_message(self.TaskFileChanged())
+
+    def on_task_manager_app_task_file_changed(self, event: "TaskManagerApp.TaskFileChanged") -> None:
+        """Picks up the changes, reading the file off the event loop."""
+        self.run_worker(self._reload_external_changes, group="reload")
+
+    async def _reload_external_changes(self) -> None:
+        """Merges changes other processes wrote to the task file, updating only
+        what they touched (our own writes are recognised and skipped)."""
+        merge = await self.async_task_manager.reload_external_changes()
+        if not merge.count:
+            return
+        # A field change can move a task in or out of the filtered/searched rows
+        filtered = bool(self.current_filter or self.status_filter or self.priority_filter or self.search_query)
+        self._refresh_task_table(filter_type=self.current_filter, rows_changed=merge.rows_changed or filtered,
+                                 changed_ids=merge.updated_ids)
+        self._update_details_view()
+
+    def _refresh_task_table(self, filter_type: Optional[str] = None, rows_changed: bool = True,
+                            changed_ids: Optional[Iterable[str]] = None) -> None:
+        """Refreshes the task list and the status counts.
+
+        Args:
+            filter_type: Optional task type to filter by.
+            rows_changed: False if only fields of listed tasks changed (same rows,
+                          same order), so the visible rows just need re-rendering.
+            changed_ids: With rows_changed=False, the tasks whose fields changed;
+                         only their rows are re-rendered (default: every row).
+        """
+        task_list = self.query_one(TaskList)
+        matching_ids = None
+        if rows_changed and (filter_type or self.status_filter or self.priority_filter):
+            # One indexed query for all active filters
+            matching_ids = {task.id for task in self.task_manager.query(
+                status=self.status_filter or None, priority=self.priority_filter or None,
+                task_type=filter_type)}
+        if rows_changed and self.search_query:
+            # Ranked search results replace the hierarchy while searching
+            # The filter is applied inside the ranked walk, so the top results are filtered matches
+            results = self.task_manager.search(self.search_query, limit=self.SEARCH_LIMIT, candidates=matching_ids)
+            task_list.show_tasks(results, highlight=TaskSearchIndex.highlight_pattern(self.search_query))
+        elif rows_changed:
+            task_list.refresh_rows(matching_ids=matching_ids)
+        elif changed_ids is not None:
+            task_list.refresh_tasks(changed_ids)
+        else:
+            task_list.invalidate()
+        counts = self.task_manager.count_by("status")
+        self._status_summary = "  ".join(f"{status}: {counts[status]}" for status in self.STATUS_CYCLE if status in counts)
+        filter_summary = self._filter_summary(filter_type)
+        if filter_summary:
+            self._status_summary = f"Filter: {filter_summary} | {self._status_summary}"
+
+    def _passes_filters(self, task: Task) -> bool:
+        """Whether a task matches the active type/status/priority filters."""
+        return ((not self.current_filter or task.task_type == self.current_filter)
+                and (not self.status_filter or task.status in self.status_filter)
+                and (not self.priority_filter or task.priority in self.priority_filter))
+
+    def _filter_summary(self, filter_type: Optional[str]) -> str:
+        """Describes the active filters, e.g. 'High+Critical Bug In Progress'."""
+        parts = ["+".join(self.priority_filter), filter_type or "", "+".join(self.status_filter)]
+        return " ".join(part for part in parts if part)
         # Original print statement can be removed or kept for app-level logging
         # print(f"Refreshed table. Displaying {table.row_count} tasks (Filter: {filter_type or 'All'})")
 
     # --- Message Handlers ---
-    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
-        """Handle task selection in the table."""
-        # event.row_key is the task.id we set when adding rows
-        self.selected_task_id = event.row_key
-        print(f"Selected Task ID: {self.selected_task_id}") # Debug
-        # TODO: Update status bar or details view later based on selection
-        # --- Update the details view --- 
-        details_view = self.query_one("#task-details-view", Static)
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Narrows the task list as the search query is typed."""
+        if event.input.id == "search-input":
+            self.search_query = event.value.strip()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Moves focus to the (searched) task list on Enter."""
+        if event.input.id == "search-input":
+            self.query_one(TaskList).focus()
+
+    def on_task_list_task_selected(self, event: TaskList.TaskSelected) -> None:
+        """Handle task selection in the task list."""
+        # event.task_id is the task's UUID
+        self.selected_task_id = event.task_id
+        self._update_details_view()
+
+    def on_task_list_task_highlighted(self, event: TaskList.TaskHighlighted) -> None:
+        """Selects the task under the cursor, rendering its details once the cursor rests."""
+        self.selected_task_id = event.task_id
+        if self._details_timer is not None:
+            self._details_timer.stop() # Superseded by this row
+        self._details_timer = self.set_timer(self.DETAILS_DELAY, self._update_details_view)
+
+    def _update_details_view(self) -> None:
+        """Shows the selected task's details (or clears the view if it is gone)."""
+        if self._details_timer is not None:
+            self._details_timer.stop() # Rendered now, no need to render again
+            self._details_timer = None
         selected_task = self.task_manager.get_task(self.selected_task_id)
+        details_key = (selected_task.id, selected_task.updated_at) if selected_task else None
+        if details_key == self._details_key:
+            return # Already showing this version of the task
+        self._details_key = details_key
+        details_view = self.query_one("#task-details-view", Static)
         if selected_task:
-            # Format the task details nicely
-            details_text = (
-                f"[b]ID:[/b] {selected_task.id}\n"
-                f"[b]Title:[/b] {selected_task.title}\n"
-                f"[b]Status:[/b] {selected_task.status}\n"
-                f"[b]Priority:[/b] {selected_task.priority}\n"
-                f"[b]Type:[/b] {selected_task.task_type}\n"
-                f"[b]Created:[/b] {selected_task.created_at.strftime('%Y-%m-%d %H:%M')}\n"
-                f"[b]Updated:[/b] {selected_task.updated_at.strftime('%Y-%m-%d %H:%M')}\n\n"
-                f"[b]Description:[/b]\n{selected_task.description}"
-            )
-            details_view.update(details_text)
+            details_view.update(self._details_cache.render(selected_task))
         else:
             # Clear details view if task not found (e.g., after deletion)
             details_view.update("")
 
+    def _update_save_indicator(self) -> None:
+        """Shows the background writer's backlog in the header sub-title."""
+        if self.task_manager.is_loading:
+            self.sub_title = f"Loading... {len(self.task_manager.tasks)} tasks"
+        elif self.task_manager.is_flushing:
+            self.sub_title = "Saving..."
+        elif self.task_manager.pending_changes:
+            self.sub_title = f"{self.task_manager.pending_changes} unsaved change(s)"
+        elif self.query_one(TaskList).marked_count:
+            self.sub_title = f"{self.query_one(TaskList).marked_count} marked | {self._status_summary}"
+        else:
+            self.sub_title = self._status_summary
+
     # --- Watchers --- 
     def watch_is_paused(self, paused: bool) -> None:
         """Called when the is_paused reactive variable changes."""
@@ -135,6 +288,17 @@ class TaskManagerApp(App):
         self.title = f"Task Manager {status_text}".strip()
         # We might disable certain actions when paused later
 
+    def _watch_filters(self) -> None:
+        """Called when the status or priority filter changes. Refresh the table."""
+        self._refresh_task_table(filter_type=self.current_filter)
+
+    watch_status_filter = _watch_filters
+    watch_priority_filter = _watch_filters
+
+    def watch_search_query(self, query: str) -> None:
+        """Called when the search query changes. Refresh the table."""
+        self._refresh_task_table(filter_type=self.current_filter)
+
     def watch_current_filter(self, new_filter: Optional[str]) -> None:
         """Called when the current_filter changes. Refresh the table."""
         # This now calls the wrapper method, which calls the helper
@@ -142,8 +306,10 @@ class TaskManagerApp(App):
         # self.notify(f"Filter set to: {new_filter or 'All'}") # Optional notification
 
     # --- Action Handlers --- 
-    def action_quit(self) -> None:
+    async def action_quit(self) -> None:
         """An action to quit the application."""
+        self._stop_file_watcher()
+        await self.async_task_manager.close() # Write changes still queued for saving
         self.exit()
         
     def action_add_task(self) -> None:
@@ -151,27 +317,26 @@ class TaskManagerApp(App):
         def add_task_callback(task_details: Optional[Dict]):
             """Callback function after AddTaskScreen is dismissed."""
             if task_details:
-                try:
-                    new_id = self.task_manager.add_task(task_details)
-                    # Use notify for better feedback
-                    self.notify(f"Added task '{task_details.get('title', new_id)}'.")
-                    self._refresh_task_table(filter_type=self.current_filter) # Refresh with current filter
-                    # Optional: Select the newly added row?
-                    # try:
-                    #    new_index = self.query_one(DataTable).get_row_index(new_id)
-                    #    self.query_one(DataTable).cursor_coordinate = (new_index, 0)
-                    # except KeyError:
-                    #    pass # Row might not be visible due to filtering
-                except Exception as e:
-                    logger.error(f"Error adding task: {e}") 
-                    self.bell() 
-                    self.notify(f"An error occurred while adding the task.", severity="error")
+                self.run_worker(self._add_task(task_details), group="edits")
             else:
                 self.notify("Add cancelled.") # User cancelled
                     
-        # Pass the list of all tasks to the AddTaskScreen constructor
-        all_tasks = self.task_manager.tasks
-        self.push_screen(AddTaskScreen(all_tasks), add_task_callback)
+        # The screen's parent picker queries the TaskManager a page at a time
+        self.push_screen(AddTaskScreen(self.task_manager), add_task_callback)
+
+    async def _add_task(self, task_details: Dict) -> None:
+        """Adds a task off the event loop, then shows it."""
+        try:
+            new_id = await self.async_task_manager.add_task(task_details)
+            # Use notify for better feedback
+            self.notify(f"Added task '{task_details.get('title', new_id)}'.")
+            self._refresh_task_table(filter_type=self.current_filter) # Refresh with current filter
+            # Optional: Select the newly added row?
+            # self.query_one(TaskList).select_task(new_id) # False if filtered out
+        except Exception as e:
+            logger.error(f"Error adding task: {e}") 
+            self.bell() 
+            self.notify(f"An error occurred while adding the task.", severity="error")
 
     def action_edit_task(self) -> None:
         """Action to push the Edit Task screen for the selected task.
@@ -196,32 +361,46 @@ class TaskManagerApp(App):
         def edit_task_callback(updated_details: Optional[Dict]):
             """Callback function after EditTaskScreen is dismissed."""
             if updated_details:
-                try:
-                    success = self.task_manager.update_task(self.selected_task_id, updated_details)
-                    if success:
-                        self.notify(f"Task '{updated_details.get('title', self.selected_task_id)}' updated.")
-                        self._refresh_task_table(filter_type=self.current_filter) # Refresh table
-                        # Update details view by simulating re-selection
-                        self.on_data_table_row_selected(DataTable.RowSelected(self.query_one(DataTable)))
-                    else:
-                        # This case might happen if the task was deleted *while* the edit screen was open
-                        self.bell()
-                        self.notify(f"Failed to update task (ID: {self.selected_task_id}). It might have been deleted.", severity="error")
-                        self.selected_task_id = None # Clear selection
-                        self._refresh_task_table(filter_type=self.current_filter) # Refresh anyway
-                except Exception as e:
-                    logger.error(f"Error updating task {self.selected_task_id}: {e}")
-                    self.bell()
-                    self.notify(f"An error occurred while updating the task.", severity="error")
+                self.run_worker(self._update_task(task_to_edit.id, updated_details), group="edits")
             else:
                 self.notify("Edit cancelled.") # User cancelled
                     
-        # Pass the list of all tasks to the EditTaskScreen constructor
-        all_tasks = self.task_manager.tasks
-        self.push_screen(EditTaskScreen(task_to_edit, all_tasks), edit_task_callback)
+        # The screen's parent picker queries the TaskManager a page at a time
+        self.push_screen(EditTaskScreen(task_to_edit, self.task_manager), edit_task_callback)
+
+    async def _update_task(self, task_id: str, updated_details: Dict) -> None:
+        """Applies an edit off the event loop, then shows it."""
+        try:
+            success = await self.async_task_manager.update_task(task_id, updated_details)
+            if success:
+                self.notify(f"Task '{updated_details.get('title', task_id)}' updated.")
+                self._refresh_task_table(filter_type=self.current_filter) # Refresh table
+                self._update_details_view() # Show the edited fields
+            else:
+                # This case might happen if the task was deleted *while* the edit screen was open
+                self.bell()
+                self.notify(f"Failed to update task (ID: {task_id}). It might have been deleted.", severity="error")
+                if self.selected_task_id == task_id:
+                    self.selected_task_id = None # Clear selection
+                self._refresh_task_table(filter_type=self.current_filter) # Refresh anyway
+        except ValueError as e:
+            # E.g. the new parent is one of the task's own descendants
+            self.bell()
+            self.notify(str(e), severity="error", title="Invalid Parent")
+        except Exception as e:
+            logger.error(f"Error updating task {task_id}: {e}")
+            self.bell()
+            self.notify(f"An error occurred while updating the task.", severity="error")
 
     def action_delete_task(self) -> None:
-        """Action to delete the currently selected task."""
+        """Action to delete the marked tasks, or else the currently selected task."""
+        marked_ids = self._marked_task_ids()
+        if marked_ids:
+            def confirm_bulk_delete_callback(confirm: bool):
+                if confirm:
+                    self.run_worker(self._delete_tasks(marked_ids), group="edits")
+            self.push_screen(ConfirmDeleteScreen("", task_count=len(marked_ids)), confirm_bulk_delete_callback)
+            return
         if self.selected_task_id is None:
             self.bell() # No task selected
             return
@@ -235,28 +414,97 @@ class TaskManagerApp(App):
 
         def confirm_delete_callback(confirm: bool):
             if confirm:
-                try:
-                    success = self.task_manager.delete_task(self.selected_task_id)
-                    if success:
-                        print(f"Deleted task {self.selected_task_id}") 
-                        self.selected_task_id = None 
-                        self._refresh_task_table(filter_type=self.current_filter) # Refresh with current filter
-                        self.query_one("#task-details-view", Static).update("Task deleted.") 
-                    else:
-                        print(f"Error: Failed to find task {self.selected_task_id} during delete confirmation.")
-                        self.bell()
-                except Exception as e:
-                    print(f"Error deleting task: {e}") # Log error
-                    self.bell() # Error feedback
+                self.run_worker(self._delete_task(task_to_delete.id), group="edits")
             else:
-                print("Deletion cancelled.") # Debug
+                self.notify("Delete cancelled.")
         
         self.push_screen(ConfirmDeleteScreen(task_to_delete.title), confirm_delete_callback) # Pass title only
 
+    async def _delete_task(self, task_id: str) -> None:
+        """Deletes a task off the event loop, then removes its row."""
+        try:
+            success = await self.async_task_manager.delete_task(task_id)
+            if success:
+                logger.info(f"Deleted task {task_id}")
+                if self.selected_task_id == task_id:
+                    self.selected_task_id = None 
+                    self.query_one("#task-details-view", Static).update("Task deleted.")
+                    self._details_key = None # The view no longer shows a task
+                self._refresh_task_table(filter_type=self.current_filter) # Refresh with current filter
+            else:
+                # Deleted elsewhere (e.g. by another process) while the dialog was open
+                logger.error(f"Failed to find task {task_id} during delete confirmation.")
+                self.bell()
+                self.notify("The task no longer exists.", severity="error")
+                self._refresh_task_table(filter_type=self.current_filter)
+        except Exception as e:
+            logger.error(f"Error deleting task {task_id}: {e}")
+            self.bell() # Error feedback
+            self.notify("An error occurred while deleting the task.", severity="error")
+
+    # --- Bulk Actions ---
+    def _marked_task_ids(self) -> List[str]:
+        """The UUIDs of the tasks marked in the task list, in display order."""
+        return self.query_one(TaskList).marked_task_ids
+
+    def action_bulk_edit(self) -> None:
+        """Action to push the Bulk Edit screen for the marked tasks."""
+        marked_ids = self._marked_task_ids()
+        if not marked_ids:
+            self.bell()
+            self.notify("Mark tasks with space or shift+arrows first.", severity="warning")
+            return
+
+        def bulk_edit_callback(updates: Optional[Dict]):
+            """Callback function after BulkEditScreen is dismissed."""
+            if updates:
+                self.run_worker(self._bulk_update(marked_ids, updates), group="edits")
+            else:
+                self.notify("Bulk edit cancelled.")
+
+        self.push_screen(BulkEditScreen(len(marked_ids), self.task_manager), bulk_edit_callback)
+
+    async def _bulk_update(self, task_ids: List[str], updates: Dict) -> None:
+        """Applies the same updates to every marked task in one transaction (one save),
+        then updates the table once."""
+        try:
+            changed = await self.async_task_manager.update_tasks({task_id: updates for task_id in task_ids})
+        except ValueError as e:
+            # E.g. the new parent is one of the marked tasks or their descendants; nothing was changed
+            self.bell()
+            self.notify(str(e), severity="error", title="Invalid Parent")
+            return
+        except Exception as e:
+            logger.error(f"Error updating {len(task_ids)} tasks: {e}")
+            self.bell()
+            self.notify("An error occurred while updating the marked tasks.", severity="error")
+            return
+        self.notify(f"Updated {changed} marked task(s).")
+        # A new parent moves rows; other fields only move them out of a filter on that field
+        rows_changed = ("parent_id" in updates
+                        or ("status" in updates and bool(self.status_filter))
+                        or ("priority" in updates and bool(self.priority_filter))
+                        or ("task_type" in updates and bool(self.current_filter)))
+        self._refresh_task_table(filter_type=self.current_filter, rows_changed=rows_changed, changed_ids=task_ids)
+        self._update_details_view()
+
+    async def _delete_tasks(self, task_ids: List[str]) -> None:
+        """Deletes the marked tasks in one transaction (one save), then removes their rows."""
+        try:
+            deleted = await self.async_task_manager.delete_tasks(task_ids)
+        except Exception as e:
+            logger.error(f"Error deleting {len(task_ids)} tasks: {e}")
+            self.bell()
+            self.notify("An error occurred while deleting the marked tasks.", severity="error")
+            return
+        self.notify(f"Deleted {deleted} task(s).")
+        self._refresh_task_table(filter_type=self.current_filter) # Drops the rows and their marks
+        self._update_details_view() # Cleared if the selected task was deleted
+
     def _cycle_selected_task_status(self, reverse: bool = False) -> None:
         """Wrapper method to cycle status using the helper function."""
-        # Call the helper function, passing the app instance (self)
-        cycle_task_status(self, reverse=reverse)
+        # Run the helper as a worker, passing the app instance (self)
+        self.run_worker(cycle_task_status(self, reverse=reverse), group="edits")
 
     def action_cycle_status(self) -> None:
         """Cycle the selected task's status forward."""
@@ -269,16 +517,51 @@ class TaskManagerApp(App):
 
     def _cycle_selected_task_priority(self) -> None:
         """Wrapper method to cycle priority using the helper function."""
-        # Call the helper function, passing the app instance (self)
-        cycle_task_priority(self)
+        # Run the helper as a worker, passing the app instance (self)
+        self.run_worker(cycle_task_priority(self), group="edits")
 
     def action_cycle_priority(self) -> None:
         """Cycle the selected task's priority up."""
         # This now calls the wrapper, which calls the helper
         self._cycle_selected_task_priority()
 
+    def action_search(self) -> None:
+        """Shows and focuses the search box."""
+        search_input = self.query_one("#search-input", Input)
+        search_input.display = True
+        search_input.focus()
+
+    def action_clear_search(self) -> None:
+        """Clears and hides the search box, returning to the full task tree
+        (or, without a search, unmarks the marked tasks)."""
+        search_input = self.query_one("#search-input", Input)
+        if not search_input.display:
+            self.query_one(TaskList).clear_marks()
+            return
+        search_input.value = "" # Resets search_query through on_input_changed
+        search_input.display = False
+        self.search_query = ""
+        self.query_one(TaskList).focus()
+
     # --- Filter Actions ---
-    def action_filter_all(self) -> None: self.current_filter = None
+    def action_edit_filters(self) -> None:
+        """Action to push the Filter screen for combined status/priority/type filters."""
+        def filter_callback(filters: Optional[Dict]):
+            """Callback function after FilterScreen is dismissed."""
+            if filters is not None:
+                self._set_filters(filters["status"], filters["priority"], filters["task_type"])
+
+        self.push_screen(FilterScreen(self.status_filter, self.priority_filter, self.current_filter), filter_callback)
+
+    def _set_filters(self, statuses: Tuple[str, ...], priorities: Tuple[str, ...],
+                     task_type: Optional[str]) -> None:
+        """Applies all filters at once, refreshing the task list a single time."""
+        self.set_reactive(TaskManagerApp.status_filter, tuple(statuses))
+        self.set_reactive(TaskManagerApp.priority_filter, tuple(priorities))
+        self.set_reactive(TaskManagerApp.current_filter, task_type)
+        self._refresh_task_table(filter_type=task_type)
+
+    def action_filter_all(self) -> None: self._set_filters((), (), None)
     def action_filter_epics(self) -> None: self.current_filter = "Epic"
     def action_filter_stories(self) -> None: self.current_filter = "Story"
     def action_filter_tasks(self) -> None: self.current_filter = "Task"